@@ -1,11 +1,50 @@
+import os
+import numpy as np
 import pandas as pd
 from SicossProcessor import SicossProcessor
-from typing import Dict, List, Optional, Any
+from config.sicoss_config import SicossConfig
+from typing import Dict, List, Mapping, Optional, Any
 import logging
+import warnings
 from datetime import datetime
+from functools import lru_cache
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    from SicossDataExtractor import DatabaseConnection, SicossDataExtractor
+    _HAS_EXTRACTOR = True
+except ImportError:
+    # Sin sqlalchemy sólo queda disponible el procesamiento con datos manuales
+    _HAS_EXTRACTOR = False
 
 logger = logging.getLogger(__name__)
 
+# Columnas de códigos chicos (caben en int8/int16) y de texto con pocos valores
+ENTEROS_LEGAJOS = ('codigosituacion', 'codigocondicion', 'codigozona', 'codigocontratacion',
+                   'TipoDeActividad', 'conyugue', 'hijos', 'adherentes', 'licencia')
+CATEGORIAS_LEGAJOS = ('regimen', 'provincialocalidad')
+ENTEROS_CONCEPTOS = ('nro_orimp',)
+CATEGORIAS_CONCEPTOS = ('tipo_conce',)
+
+# DataFrame vacío compartido para llamadas sin otra actividad (el procesador sólo lo lee)
+_OTRA_ACTIVIDAD_VACIA = pd.DataFrame({
+    'nro_legaj': pd.Series(dtype='int64'),
+    'importebrutootraactividad': pd.Series(dtype='float64'),
+    'importesacotraactividad': pd.Series(dtype='float64'),
+})
+
+# Topes sin valor por defecto que procesar_sicoss_desde_bd necesita en datos_config
+CLAVES_REQUERIDAS_BD = ('TopeJubilatorioPatronal', 'TopeJubilatorioPersonal', 'TopeOtrosAportesPersonal')
+
+# Por encima del umbral se procesa por bloques de legajos para acotar la memoria
+UMBRAL_PROCESO_POR_BLOQUES = 20000
+LEGAJOS_POR_BLOQUE = 5000
+# Procesos para los bloques de legajos (1 = en el mismo proceso, en secuencia)
+PROCESOS_POR_DEFECTO = 1
+# Bloques enviados al pool sin consumir, por proceso (acota la memoria del pool)
+BLOQUES_EN_VUELO_POR_PROCESO = 2
+
 # 🎯 **FUNCIÓN PRINCIPAL PARA USO EXTERNO**
 def procesar_sicoss_completo(datos_config: Dict, legajos_data: List[Dict],
                              conceptos_data: List[Dict], otra_actividad_data: List[Dict] = None,
@@ -16,33 +55,92 @@ def procesar_sicoss_completo(datos_config: Dict, legajos_data: List[Dict],
     """
     logger.info("🚀 === INICIANDO PROCESAMIENTO SICOSS COMPLETO ===")
 
-    # Convertir datos a DataFrames
-    df_legajos = pd.DataFrame(legajos_data)
-    df_conceptos = pd.DataFrame(conceptos_data)
-    df_otra_actividad = pd.DataFrame(otra_actividad_data or [])
+    if not legajos_data:
+        logger.warning("⚠️ No hay legajos para procesar")
+        return SicossProcessor._inicializar_totales()
 
-    # Crear procesador
-    processor = SicossProcessor()
+    # Convertir datos a DataFrames (from_records, sin inferencia fila a fila).
+    # Se arman en secuencia: la conversión de objetos Python a columnas y la inferencia
+    # de tipos retienen el GIL, así que un ThreadPoolExecutor no acorta el tiempo.
+    df_legajos = _records_to_frame(legajos_data)
+    df_conceptos = _records_to_frame(conceptos_data)
+    df_otra_actividad = (_records_to_frame(otra_actividad_data) if otra_actividad_data
+                         else _OTRA_ACTIVIDAD_VACIA)
 
-    # Configurar parámetros del procesador
-    processor.porc_aporte_adicional_jubilacion = datos_config.get('PorcAporteAdicionalJubilacion', 100.0)
-    processor.categoria_diferencial = datos_config.get('CategoriaDiferencial', '')
-    processor.trabajador_convencionado = datos_config.get('TrabajadorConvencionado', 'S')
-    processor.asignacion_familiar = datos_config.get('AsignacionFamiliar', False)
+    resultado = _procesar_sicoss_dfs(
+        datos_config, df_legajos, df_conceptos, df_otra_actividad, **kwargs
+    )
+
+    logger.info("✅ === PROCESAMIENTO SICOSS COMPLETO FINALIZADO ===")
+    return resultado
+
+
+def _records_to_frame(records: List[Dict], schema: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    🔧 HELPER: Construye un DataFrame desde una lista de dicts con from_records
+
+    Sin schema las columnas salen de la unión de claves en orden de aparición y
+    las claves ausentes quedan en NaN (igual que pd.DataFrame(records)). pandas
+    arma la matriz de objetos en C, sin listas intermedias por columna, y las
+    columnas de listas (tipos_grupos) quedan como object sin volver a envolverse.
+    """
+    return pd.DataFrame.from_records(records, columns=schema)
+
+
+def _procesar_sicoss_dfs(datos_config: Dict, df_legajos: pd.DataFrame,
+                         df_conceptos: pd.DataFrame, df_otra_actividad: pd.DataFrame,
+                         **kwargs) -> Dict:
+    """
+    🔧 HELPER: Ejecuta el procesamiento SICOSS sobre DataFrames ya construidos
+
+    Compartido por procesar_sicoss_completo y procesar_sicoss_desde_bd para que
+    los DataFrames del extractor lleguen al procesador sin pasar por dicts.
+    Acepta DataFrames con columnas Arrow (pd.ArrowDtype).
+    """
+    # El procesador rellena y escribe in-place sobre columnas numpy
+    df_legajos = _arrow_a_numpy(df_legajos)
+    df_conceptos = _arrow_a_numpy(df_conceptos)
+    df_otra_actividad = _arrow_a_numpy(df_otra_actividad)
+
+    # Reducir dtypes una sola vez antes de entrar al pipeline
+    df_legajos = _shrink_legajos(df_legajos)
+    df_conceptos = _shrink_conceptos(df_conceptos)
+
+    # Procesador configurado (reutilizado entre llamadas con la misma configuración)
+    processor = _get_processor(
+        datos_config.get('PorcAporteAdicionalJubilacion', 100.0),
+        datos_config.get('CategoriaDiferencial', ''),
+        datos_config.get('TrabajadorConvencionado', 'S'),
+        datos_config.get('AsignacionFamiliar', False)
+    )
+
+    # Parámetros por defecto (la fecha actual se consulta una sola vez y solo si falta algún dato)
+    ahora = None
+    if not {'per_anoct', 'per_mesct', 'nombre_arch'} <= kwargs.keys():
+        ahora = datetime.now()
 
-    # Parámetros por defecto
     parametros = {
-        'per_anoct': kwargs.get('per_anoct', datetime.now().year),
-        'per_mesct': kwargs.get('per_mesct', datetime.now().month),
-        'nombre_arch': kwargs.get('nombre_arch', f'sicoss_{datetime.now().strftime("%Y_%m")}'),
+        'per_anoct': kwargs['per_anoct'] if 'per_anoct' in kwargs else ahora.year,
+        'per_mesct': kwargs['per_mesct'] if 'per_mesct' in kwargs else ahora.month,
+        'nombre_arch': kwargs['nombre_arch'] if 'nombre_arch' in kwargs else f'sicoss_{ahora:%Y_%m}',
         'licencias': kwargs.get('licencias'),
         'retro': kwargs.get('retro', False),
         'check_sin_activo': kwargs.get('check_sin_activo', False),
         'retornar_datos': kwargs.get('retornar_datos', False)
     }
 
+    # Períodos grandes: procesar por bloques de legajos para acotar la memoria.
+    # Con varios procesos se parte en bloques aunque no se llegue al umbral
+    legajos_por_bloque = kwargs.get('legajos_por_bloque', LEGAJOS_POR_BLOQUE)
+    procesos = kwargs.get('procesos', PROCESOS_POR_DEFECTO)
+    umbral_bloques = legajos_por_bloque if procesos > 1 else max(legajos_por_bloque, UMBRAL_PROCESO_POR_BLOQUES)
+    if len(df_legajos) > umbral_bloques:
+        return _procesar_por_bloques(processor, datos_config, df_legajos, df_conceptos,
+                                     df_otra_actividad, legajos_por_bloque, parametros,
+                                     procesos)
+
     # 🚀 EJECUTAR PROCESAMIENTO CON PANDAS (CAMBIO PRINCIPAL)
-    resultado = processor.procesa_sicoss_dataframes(
+    return processor.procesa_sicoss_dataframes(
         datos=datos_config,
         df_legajos=df_legajos,
         df_conceptos=df_conceptos,
@@ -50,13 +148,236 @@ def procesar_sicoss_completo(datos_config: Dict, legajos_data: List[Dict],
         **parametros
     )
 
-    logger.info("✅ === PROCESAMIENTO SICOSS COMPLETO FINALIZADO ===")
-    return resultado
+
+def _bloques_de_legajos(df_legajos: pd.DataFrame, df_conceptos: pd.DataFrame,
+                        df_otra_actividad: pd.DataFrame, legajos_por_bloque: int):
+    """
+    🔧 HELPER: Genera de a uno los bloques de legajos_por_bloque legajos
+
+    Cada fila se asigna a su bloque en una sola pasada (posición del legajo // tamaño).
+    Sólo se guardan las posiciones de cada bloque: las filas se copian al pedir el
+    bloque, así que además de los DataFrames de entrada hay un bloque a la vez.
+    """
+    legajos = pd.Index(df_legajos['nro_legaj'].unique())
+
+    def posiciones(df):
+        if df.empty or 'nro_legaj' not in df.columns:
+            return {}
+        numero_bloque = legajos.get_indexer(df['nro_legaj']) // legajos_por_bloque
+        return df.groupby(numero_bloque, sort=False).indices
+
+    def tomar(df, posiciones_df, numero):
+        if numero not in posiciones_df:
+            return df.iloc[:0]
+        return df.take(posiciones_df[numero])
+
+    posiciones_legajos = posiciones(df_legajos)
+    posiciones_conceptos = posiciones(df_conceptos)
+    posiciones_otra_actividad = posiciones(df_otra_actividad)
+
+    for numero in sorted(posiciones_legajos):
+        yield (df_legajos.take(posiciones_legajos[numero]),
+               tomar(df_conceptos, posiciones_conceptos, numero),
+               tomar(df_otra_actividad, posiciones_otra_actividad, numero))
+
+
+def _procesar_bloque(processor: SicossProcessor, datos_config: Dict, bloque: tuple,
+                     parametros: Dict) -> Optional[tuple]:
+    """
+    🔧 HELPER: Procesa un bloque de legajos y devuelve (totales, salida)
+
+    La salida son los registros de los legajos válidos con retornar_datos, o sus
+    líneas del TXT ya codificadas; el DataFrame del bloque no sale de la función.
+    Función de módulo para que ProcessPoolExecutor la pueda enviar a otro proceso.
+    Devuelve None si el bloque no tiene legajos válidos.
+    """
+    bloque_legajos, bloque_conceptos, bloque_otra_actividad = bloque
+    legajos_validos = processor._procesar_legajos_validos_pandas(
+        datos_config,
+        processor._inicializar_configuracion(datos_config),
+        bloque_legajos,
+        bloque_conceptos,
+        bloque_otra_actividad,
+        parametros['licencias'],
+        parametros['retro']
+    )
+    if legajos_validos.empty:
+        return None
+
+    totales = processor._calcular_totales_pandas(legajos_validos)
+    if parametros['retornar_datos']:
+        return totales, processor._dataframe_a_registros(legajos_validos)
+    return totales, b''.join(processor._codificar_lineas_sicoss(legajos_validos))
+
+
+def _procesar_por_bloques(processor: SicossProcessor, datos_config: Dict,
+                          df_legajos: pd.DataFrame, df_conceptos: pd.DataFrame,
+                          df_otra_actividad: pd.DataFrame, legajos_por_bloque: int,
+                          parametros: Dict, procesos: int = PROCESOS_POR_DEFECTO) -> Any:
+    """
+    🔧 HELPER: Procesa por bloques de legajos y une los resultados
+
+    Cada legajo se calcula sólo con sus propios conceptos y otra actividad, así que
+    el resultado es el mismo que procesando todo junto. Cada bloque agrega sus líneas
+    al TXT y sus totales a los acumulados apenas termina: nunca se juntan los
+    legajos válidos de todos los bloques en un DataFrame.
+
+    Con procesos > 1 los bloques se reparten en un ProcessPoolExecutor (el cálculo
+    por legajo retiene el GIL, así que threads no acortarían el tiempo). Cada proceso
+    devuelve sólo los totales y las líneas (o registros) de su bloque, y los
+    resultados se consumen en el orden de los bloques.
+    """
+    logger.info("🧱 Procesando %s legajos en bloques de %s (%s procesos)",
+                len(df_legajos), legajos_por_bloque, procesos)
+
+    bloques = _bloques_de_legajos(df_legajos, df_conceptos, df_otra_actividad, legajos_por_bloque)
+    if procesos > 1:
+        with ProcessPoolExecutor(max_workers=procesos) as executor:
+            resultados = _resultados_en_procesos(executor, processor, datos_config, bloques,
+                                                 parametros, procesos * BLOQUES_EN_VUELO_POR_PROCESO)
+            return _reunir_bloques(processor, resultados, parametros)
+
+    resultados = (_procesar_bloque(processor, datos_config, bloque, parametros)
+                  for bloque in bloques)
+    return _reunir_bloques(processor, resultados, parametros)
+
+
+def _resultados_en_procesos(executor: ProcessPoolExecutor, processor: SicossProcessor,
+                            datos_config: Dict, bloques, parametros: Dict, en_vuelo: int):
+    """
+    🔧 HELPER: Reparte los bloques en el pool y devuelve sus resultados en orden
+
+    A diferencia de executor.map, no envía todos los bloques de entrada: hay a lo sumo
+    en_vuelo bloques enviados sin consumir, así que los bloques se arman (y se pasan
+    a los procesos) a medida que se libera lugar.
+    """
+    pendientes = deque()
+    for bloque in bloques:
+        pendientes.append(executor.submit(_procesar_bloque, processor, datos_config, bloque, parametros))
+        if len(pendientes) >= en_vuelo:
+            yield pendientes.popleft().result()
+    while pendientes:
+        yield pendientes.popleft().result()
+
+
+def _reunir_bloques(processor: SicossProcessor, resultados, parametros: Dict) -> Any:
+    """
+    🔧 HELPER: Acumula los (totales, salida) de cada bloque a medida que llegan
+
+    Las líneas se agregan al TXT en el orden de los bloques; el archivo se abre con
+    el primer bloque con legajos válidos (sin ninguno no se graba, igual que sin bloques).
+    Los totales se suman por bloque y se redondean al final.
+    """
+    totales = processor._inicializar_totales()
+    registros = []
+    archivo = None
+    try:
+        for resultado in resultados:
+            if resultado is None:
+                continue
+            totales_bloque, salida = resultado
+            for clave, valor in totales_bloque.items():
+                totales[clave] += valor
+            if parametros['retornar_datos']:
+                registros.extend(salida)
+            else:
+                if archivo is None:
+                    archivo = processor._abrir_archivo_salida(
+                        processor._ruta_archivo_salida(parametros['nombre_arch'])
+                    )
+                archivo.write(salida)
+    finally:
+        if archivo is not None:
+            archivo.close()
+            logger.info("✅ Archivo grabado por bloques: %s", archivo.name)
+
+    if registros:
+        return registros
+    return {clave: round(valor, 2) for clave, valor in totales.items()}
+
+
+@lru_cache(maxsize=8)
+def _get_processor(porc_aporte_adicional_jubilacion: float, categoria_diferencial: str,
+                   trabajador_convencionado: str, asignacion_familiar: bool) -> SicossProcessor:
+    """
+    🔧 HELPER: Devuelve un SicossProcessor configurado, cacheado por configuración
+
+    El procesador no guarda estado entre llamadas a procesa_sicoss_dataframes,
+    así que la misma instancia se puede compartir (también entre threads).
+    """
+    processor = SicossProcessor()
+    processor.porc_aporte_adicional_jubilacion = porc_aporte_adicional_jubilacion
+    processor.categoria_diferencial = categoria_diferencial
+    processor.trabajador_convencionado = trabajador_convencionado
+    processor.asignacion_familiar = asignacion_familiar
+    return processor
+
+
+def _arrow_a_numpy(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    🔧 HELPER: Pasa las columnas pd.ArrowDtype a dtypes numpy
+
+    Los enteros con nulos quedan float64 con NaN. Los textos toman el dtype de
+    texto por defecto de pandas al asignar el array object: str
+    (StringDtype(na_value=nan)) en pandas 3 y object en pandas 2, el mismo que
+    da read_sql_query sin dtype_backend. Sin columnas Arrow no copia nada.
+    """
+    columnas_arrow = [campo for campo, dtype in df.dtypes.items() if isinstance(dtype, pd.ArrowDtype)]
+    if not columnas_arrow:
+        return df
+
+    df = df.copy(deep=False)
+    for campo in columnas_arrow:
+        valores = df[campo].to_numpy()
+        if valores.dtype == object:
+            valores = df[campo].to_numpy(dtype=object, na_value=None)
+        df[campo] = valores
+    return df
+
+
+def _shrink_legajos(df_legajos: pd.DataFrame) -> pd.DataFrame:
+    """
+    🔧 HELPER: Reduce los dtypes de legajos (códigos a int8/int16, textos a category)
+    """
+    return _shrink(df_legajos, ENTEROS_LEGAJOS, CATEGORIAS_LEGAJOS)
+
+
+def _shrink_conceptos(df_conceptos: pd.DataFrame) -> pd.DataFrame:
+    """
+    🔧 HELPER: Reduce los dtypes de conceptos (códigos a int8, tipo_conce a category)
+
+    impp_conce queda en float64: downcast='float' acepta float32 con una tolerancia
+    relativa y los importes pierden centavos al sumarse en la pivot.
+    """
+    return _shrink(df_conceptos, ENTEROS_CONCEPTOS, CATEGORIAS_CONCEPTOS)
+
+
+def _shrink(df: pd.DataFrame, enteros: tuple, categorias: tuple) -> pd.DataFrame:
+    """
+    🔧 HELPER: Downcast de enteros y conversión a category
+
+    Las columnas con nulos se dejan como están: los enteros con NaN no se pueden
+    achicar y una category con NaN no acepta los defaults de texto del procesador.
+    Devuelve un DataFrame nuevo (assign): el del llamador conserva sus dtypes.
+    """
+    cambios = {}
+    for campo in enteros:
+        if campo in df.columns and pd.api.types.is_integer_dtype(df[campo]):
+            cambios[campo] = pd.to_numeric(df[campo], downcast='integer')
+
+    for campo in categorias:
+        if campo in df.columns and not df[campo].isna().any():
+            cambios[campo] = df[campo].astype('category')
+
+    return df.assign(**cambios)
 
 
 def procesar_sicoss_desde_bd(config_bd: Dict, datos_config: Dict,
                              per_anoct: int, per_mesct: int,
-                             nro_legajo: Optional[int] = None, **kwargs) -> Dict:
+                             nro_legajo: Optional[int] = None,
+                             dtype_backend: Optional[str] = None,
+                             cache_dir: Optional[str] = None, refresh: bool = False,
+                             **kwargs) -> Dict:
     """
     🗄️ NUEVA FUNCIÓN - Procesa SICOSS extrayendo datos directamente de BD
 
@@ -68,6 +389,10 @@ def procesar_sicoss_desde_bd(config_bd: Dict, datos_config: Dict,
         per_anoct: Año del período
         per_mesct: Mes del período
         nro_legajo: Legajo específico (opcional)
+        dtype_backend: 'pyarrow' para leer las consultas en columnas Arrow
+            (opcional; por defecto dtypes numpy)
+        cache_dir: Directorio para cachear la extracción en Parquet (opcional)
+        refresh: Ignorar la caché y volver a extraer de la BD
         **kwargs: Parámetros adicionales
 
     Returns:
@@ -75,42 +400,50 @@ def procesar_sicoss_desde_bd(config_bd: Dict, datos_config: Dict,
     """
     logger.info("🗄️ === PROCESAMIENTO SICOSS DESDE BD ===")
 
+    # Validar antes de conectar a la BD: sin topes no se puede armar SicossConfig
+    faltantes = [clave for clave in CLAVES_REQUERIDAS_BD if clave not in datos_config]
+    if faltantes:
+        raise KeyError(f"Faltan claves requeridas en datos_config: {', '.join(faltantes)}")
+
+    if not _HAS_EXTRACTOR:
+        raise RuntimeError("SicossDataExtractor no disponible: instalar sqlalchemy")
+
     try:
-        # 1. Inicializar extractor de datos
-        from SicossDataExtractor import DatabaseConnection, SicossDataExtractor, SicossConfig
-
-        # Crear configuración
-        config = SicossConfig(
-            tope_jubilatorio_patronal=datos_config['TopeJubilatorioPatronal'],
-            tope_jubilatorio_personal=datos_config['TopeJubilatorioPersonal'],
-            tope_otros_aportes_personales=datos_config['TopeOtrosAportesPersonal'],
-            trunca_tope=bool(datos_config.get('truncaTope', 1)),
-            check_lic=datos_config.get('check_lic', False),
-            check_retro=datos_config.get('check_retro', False),
-            check_sin_activo=datos_config.get('check_sin_activo', False),
-            asignacion_familiar=datos_config.get('AsignacionFamiliar', False),
-            trabajador_convencionado=datos_config.get('TrabajadorConvencionado', 'S')
-        )
+        # 1. Crear configuración
+        config = _to_sicoss_config(datos_config)
 
         # 2. Extraer datos de la BD
         logger.info("📊 Extrayendo datos de la base de datos...")
-        db = DatabaseConnection(config_bd.get('config_file', 'database.ini'))
-        extractor = SicossDataExtractor(db)
+        datos_extraidos = None
+        if cache_dir and not refresh:
+            datos_extraidos = _leer_cache_extraccion(cache_dir, per_anoct, per_mesct, nro_legajo)
 
-        datos_extraidos = extractor.extraer_datos_completos(
-            config=config,
-            per_anoct=per_anoct,
-            per_mesct=per_mesct,
-            nro_legajo=nro_legajo
-        )
+        if datos_extraidos is None:
+            db = DatabaseConnection(config_bd.get('config_file', 'database.ini'), dtype_backend=dtype_backend,
+                                    usar_copy=config_bd.get('usar_copy', True))
+            extractor = SicossDataExtractor(db)
+
+            datos_extraidos = extractor.extraer_datos_completos(
+                config=config,
+                per_anoct=per_anoct,
+                per_mesct=per_mesct,
+                nro_legajo=nro_legajo
+            )
+
+            if cache_dir:
+                _guardar_cache_extraccion(cache_dir, per_anoct, per_mesct, nro_legajo, datos_extraidos)
+
+        if datos_extraidos['legajos'].empty:
+            logger.warning("⚠️ No hay legajos para procesar")
+            return SicossProcessor._inicializar_totales()
 
         # 3. Procesar con pandas
         logger.info("⚙️ Procesando datos con pandas...")
-        resultado = procesar_sicoss_completo(
-            datos_config=datos_config,
-            legajos_data=datos_extraidos['legajos'].to_dict('records'),
-            conceptos_data=datos_extraidos['conceptos'].to_dict('records'),
-            otra_actividad_data=datos_extraidos['otra_actividad'].to_dict('records'),
+        resultado = _procesar_sicoss_dfs(
+            datos_config,
+            datos_extraidos['legajos'],
+            datos_extraidos['conceptos'],
+            datos_extraidos['otra_actividad'],
             per_anoct=per_anoct,
             per_mesct=per_mesct,
             **kwargs
@@ -120,15 +453,148 @@ def procesar_sicoss_desde_bd(config_bd: Dict, datos_config: Dict,
         return resultado
 
     except Exception as e:
-        logger.error(f"❌ Error en procesamiento desde BD: {e}")
+        logger.error("❌ Error en procesamiento desde BD: %s", e)
         raise
 
 
+TABLAS_EXTRACCION = ('legajos', 'conceptos', 'otra_actividad', 'obra_social')
+
+
+def _rutas_cache_extraccion(cache_dir: str, per_anoct: int, per_mesct: int,
+                            nro_legajo: Optional[int]) -> Dict[str, str]:
+    """
+    🔧 HELPER: Rutas Parquet de la caché para un período (y legajo)
+    """
+    clave = f"{per_anoct}_{per_mesct}_{nro_legajo or 'ALL'}"
+    return {tabla: os.path.join(cache_dir, f"{clave}_{tabla}.parquet") for tabla in TABLAS_EXTRACCION}
+
+
+def _leer_cache_extraccion(cache_dir: str, per_anoct: int, per_mesct: int,
+                           nro_legajo: Optional[int]) -> Optional[Dict[str, pd.DataFrame]]:
+    """
+    🔧 HELPER: Carga una extracción cacheada; None si falta alguna tabla o no se puede leer
+    """
+    rutas = _rutas_cache_extraccion(cache_dir, per_anoct, per_mesct, nro_legajo)
+    if not all(os.path.exists(ruta) for ruta in rutas.values()):
+        return None
+
+    try:
+        datos = {tabla: _leer_parquet_extraccion(ruta) for tabla, ruta in rutas.items()}
+    except Exception as e:
+        logger.warning("⚠️ No se pudo leer la caché Parquet, se extrae de la BD: %s", e)
+        return None
+
+    logger.info("📦 Datos cargados desde caché: %s", cache_dir)
+    return datos
+
+
+def _leer_parquet_extraccion(ruta: str) -> pd.DataFrame:
+    """
+    🔧 HELPER: Lee una tabla de la caché con los mismos valores que entrega la BD
+
+    Parquet devuelve los arrays (tipos_grupos) como ndarray; la BD los entrega como list.
+    """
+    df = pd.read_parquet(ruta)
+    for campo in df.columns[df.dtypes == object]:
+        df[campo] = df[campo].map(lambda v: v.tolist() if isinstance(v, np.ndarray) else v)
+    return df
+
+
+def _guardar_cache_extraccion(cache_dir: str, per_anoct: int, per_mesct: int,
+                              nro_legajo: Optional[int], datos: Dict[str, pd.DataFrame]):
+    """
+    🔧 HELPER: Guarda la extracción en Parquet (zstd); un error solo deja la caché sin escribir
+    """
+    rutas = _rutas_cache_extraccion(cache_dir, per_anoct, per_mesct, nro_legajo)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        for tabla, ruta in rutas.items():
+            datos[tabla].to_parquet(ruta, engine='pyarrow', compression='zstd', index=False)
+    except Exception as e:
+        logger.warning("⚠️ No se pudo guardar la caché Parquet: %s", e)
+        for ruta in rutas.values():
+            if os.path.exists(ruta):
+                os.remove(ruta)
+
+
+def _to_sicoss_config(datos_config: Mapping) -> SicossConfig:
+    """
+    🔧 HELPER: Arma el SicossConfig del extractor a partir de datos_config
+
+    Si todos los valores son hasheables la instancia se cachea por contenido,
+    por eso no debe modificarse después de creada.
+    """
+    try:
+        claves = frozenset(datos_config.items())
+    except TypeError:
+        return _crear_sicoss_config(datos_config)
+    return _sicoss_config_cacheada(claves)
+
+
+@lru_cache(maxsize=32)
+def _sicoss_config_cacheada(claves: frozenset) -> SicossConfig:
+    return _crear_sicoss_config(dict(claves))
+
+
+def _crear_sicoss_config(datos_config: Mapping) -> SicossConfig:
+    return SicossConfig(
+        tope_jubilatorio_patronal=datos_config['TopeJubilatorioPatronal'],
+        tope_jubilatorio_personal=datos_config['TopeJubilatorioPersonal'],
+        tope_otros_aportes_personales=datos_config['TopeOtrosAportesPersonal'],
+        trunca_tope=bool(datos_config.get('truncaTope', 1)),
+        check_lic=datos_config.get('check_lic', False),
+        check_retro=datos_config.get('check_retro', False),
+        check_sin_activo=datos_config.get('check_sin_activo', False),
+        asignacion_familiar=datos_config.get('AsignacionFamiliar', False),
+        trabajador_convencionado=datos_config.get('TrabajadorConvencionado', 'S')
+    )
+
+
+def procesar_sicoss_bd(datos_config: Dict, per_anoct: int, per_mesct: int,
+                       config_bd: Optional[Dict] = None, **kwargs) -> Dict:
+    """
+    🗄️ ENTRADA BD - Procesa SICOSS extrayendo los datos de la base
+
+    Equivale a procesar_sicoss_modo_hibrido(usar_extractor=True) sin el despacho.
+    **kwargs se pasan a procesar_sicoss_desde_bd (nro_legajo, cache_dir, nombre_arch, ...).
+    """
+    return procesar_sicoss_desde_bd(
+        config_bd=config_bd or {},
+        datos_config=datos_config,
+        per_anoct=per_anoct,
+        per_mesct=per_mesct,
+        **kwargs
+    )
+
+
+def procesar_sicoss_manual(datos_config: Dict, per_anoct: int, per_mesct: int,
+                           legajos_data: Optional[List[Dict]] = None,
+                           conceptos_data: Optional[List[Dict]] = None,
+                           otra_actividad_data: Optional[List[Dict]] = None,
+                           **kwargs) -> Dict:
+    """
+    ✍️ ENTRADA MANUAL - Procesa SICOSS con datos ya cargados en memoria
+
+    Equivale a procesar_sicoss_modo_hibrido(usar_extractor=False) sin el despacho.
+    """
+    return procesar_sicoss_completo(
+        datos_config=datos_config,
+        legajos_data=legajos_data or [],
+        conceptos_data=conceptos_data or [],
+        otra_actividad_data=otra_actividad_data,
+        per_anoct=per_anoct,
+        per_mesct=per_mesct,
+        **kwargs
+    )
+
+
 def procesar_sicoss_modo_hibrido(datos_config: Dict, per_anoct: int, per_mesct: int,
                                  usar_extractor: bool = True, **kwargs) -> Dict:
     """
     🔄 FUNCIÓN HÍBRIDA - Permite elegir entre extractor BD o datos manuales
 
+    ⚠️ DEPRECADA: usar procesar_sicoss_bd o procesar_sicoss_manual directamente.
+
     Args:
         datos_config: Configuración SICOSS
         per_anoct: Año
@@ -139,176 +605,13 @@ def procesar_sicoss_modo_hibrido(datos_config: Dict, per_anoct: int, per_mesct:
     Returns:
         Dict con resultados
     """
-    logger.info(f"🔄 === MODO HÍBRIDO - Extractor: {usar_extractor} ===")
+    warnings.warn(
+        "procesar_sicoss_modo_hibrido está deprecada: usar procesar_sicoss_bd o procesar_sicoss_manual",
+        DeprecationWarning,
+        stacklevel=2
+    )
+    logger.info("🔄 === MODO HÍBRIDO - Extractor: %s ===", usar_extractor)
 
     if usar_extractor:
-        # Usar extractor de BD
-        config_bd = kwargs.get('config_bd', {})
-        return procesar_sicoss_desde_bd(
-            config_bd=config_bd,
-            datos_config=datos_config,
-            per_anoct=per_anoct,
-            per_mesct=per_mesct,
-            **kwargs
-        )
-    else:
-        # Usar datos manuales (modo actual)
-        legajos_data = kwargs.get('legajos_data', [])
-        conceptos_data = kwargs.get('conceptos_data', [])
-        otra_actividad_data = kwargs.get('otra_actividad_data', [])
-
-        return procesar_sicoss_completo(
-            datos_config=datos_config,
-            legajos_data=legajos_data,
-            conceptos_data=conceptos_data,
-            otra_actividad_data=otra_actividad_data,
-            per_anoct=per_anoct,
-            per_mesct=per_mesct,
-            **kwargs
-        )
-
-
-# 🧪 **EJEMPLO DE USO COMPLETO**
-
-def ejemplo_uso_completo():
-    """
-    🧪 EJEMPLO COMPLETO - Demuestra cómo usar toda la implementación
-    """
-    logger.info("🧪 === EJECUTANDO EJEMPLO COMPLETO ===")
-
-    # 📊 DATOS DE CONFIGURACIÓN
-    datos_config = {
-        'TopeJubilatorioPatronal': 800000.0,
-        'TopeJubilatorioPersonal': 600000.0,
-        'TopeOtrosAportesPersonal': 700000.0,
-        'truncaTope': 1,
-        'check_lic': False,
-        'check_retro': False,
-        'seguro_vida_patronal': 0,
-        'ARTconTope': '1',
-        'ConceptosNoRemuEnART': '0',
-        'PorcAporteAdicionalJubilacion': 100.0,
-        'TrabajadorConvencionado': 'S',
-        'AsignacionFamiliar': False
-    }
-
-    # 📊 DATOS DE LEGAJOS (simulados)
-    legajos_data = [
-        {
-            'nro_legaj': 12345,
-            'cuit': '20123456789',
-            'apyno': 'PEREZ JUAN CARLOS',
-            'codigosituacion': 1,
-            'codigocondicion': 1,
-            'codigozona': 0,
-            'TipoDeActividad': 0,
-            'codigocontratacion': 0,
-            'regimen': '1',
-            'conyugue': 1,
-            'hijos': 2,
-            'adherentes': 0,
-            'licencia': 0,
-            'provincialocalidad': 'BUENOS AIRES'
-        },
-        {
-            'nro_legaj': 67890,
-            'cuit': '27987654321',
-            'apyno': 'GARCIA MARIA ELENA',
-            'codigosituacion': 5,  # Maternidad
-            'codigocondicion': 1,
-            'codigozona': 0,
-            'TipoDeActividad': 0,
-            'codigocontratacion': 0,
-            'regimen': '1',
-            'conyugue': 0,
-            'hijos': 1,
-            'adherentes': 0,
-            'licencia': 0,
-            'provincialocalidad': 'CORDOBA'
-        },
-        {
-            'nro_legaj': 11111,
-            'cuit': '23111111119',
-            'apyno': 'RODRIGUEZ CARLOS ALBERTO',
-            'codigosituacion': 1,
-            'codigocondicion': 1,
-            'codigozona': 0,
-            'TipoDeActividad': 0,
-            'codigocontratacion': 0,
-            'regimen': '1',
-            'conyugue': 1,
-            'hijos': 0,
-            'adherentes': 0,
-            'licencia': 0,
-            'provincialocalidad': 'MENDOZA'
-        }
-    ]
-
-    # 📊 DATOS DE CONCEPTOS LIQUIDADOS (simulados)
-    conceptos_data = [
-        # Legajo 12345
-        {'nro_legaj': 12345, 'codn_conce': 100, 'impp_conce': 150000.0, 'tipos_grupos': [1], 'tipo_conce': 'C',
-         'nro_orimp': 1},
-        {'nro_legaj': 12345, 'codn_conce': 200, 'impp_conce': 25000.0, 'tipos_grupos': [2], 'tipo_conce': 'C',
-         'nro_orimp': 1},
-        {'nro_legaj': 12345, 'codn_conce': 300, 'impp_conce': 8000.0, 'tipos_grupos': [3], 'tipo_conce': 'F',
-         'nro_orimp': 0},
-
-        # Legajo 67890 (maternidad)
-        {'nro_legaj': 67890, 'codn_conce': 100, 'impp_conce': 120000.0, 'tipos_grupos': [1], 'tipo_conce': 'C',
-         'nro_orimp': 1},
-        {'nro_legaj': 67890, 'codn_conce': 500, 'impp_conce': 15000.0, 'tipos_grupos': [5], 'tipo_conce': 'C',
-         'nro_orimp': 1},
-
-        # Legajo 11111
-        {'nro_legaj': 11111, 'codn_conce': 100, 'impp_conce': 200000.0, 'tipos_grupos': [1], 'tipo_conce': 'C',
-         'nro_orimp': 1},
-        {'nro_legaj': 11111, 'codn_conce': 400, 'impp_conce': 30000.0, 'tipos_grupos': [4], 'tipo_conce': 'C',
-         'nro_orimp': 1},
-        {'nro_legaj': 11111, 'codn_conce': 600, 'impp_conce': 12000.0, 'tipos_grupos': [6], 'tipo_conce': 'C',
-         'nro_orimp': 1}
-    ]
-
-    # 📊 DATOS DE OTRA ACTIVIDAD (simulados)
-    otra_actividad_data = [
-        {'nro_legaj': 11111, 'importebrutootraactividad': 50000.0, 'importesacotraactividad': 8000.0}
-        # Solo el legajo 11111 tiene otra actividad
-    ]
-
-    try:
-        # 🚀 EJECUTAR PROCESAMIENTO COMPLETO
-        resultado = procesar_sicoss_completo(
-            datos_config=datos_config,
-            legajos_data=legajos_data,
-            conceptos_data=conceptos_data,
-            otra_actividad_data=otra_actividad_data,
-            per_anoct=2024,
-            per_mesct=12,
-            nombre_arch="ejemplo_sicoss_2024_12",
-            retornar_datos=True
-        )
-
-        # 📊 MOSTRAR RESULTADOS
-        if isinstance(resultado, list):
-            logger.info("🎉 === RESULTADOS DEL PROCESAMIENTO ===")
-            logger.info(f"📊 Legajos procesados: {len(resultado)}")
-
-            for i, legajo in enumerate(resultado):
-                logger.info(f"👤 Legajo {i + 1}: {legajo['nro_legaj']}")
-                logger.info(f"   - Nombre: {legajo['apyno']}")
-                logger.info(f"   - Situación: {legajo['codigosituacion']}")
-                logger.info(f"   - Bruto: ${legajo['IMPORTE_BRUTO']:,.2f}")
-                logger.info(f"   - Imponible: ${legajo['IMPORTE_IMPON']:,.2f}")
-                logger.info(f"   - SAC: ${legajo['ImporteSAC']:,.2f}")
-                logger.info(f"   - ART: ${legajo['importeimponible_9']:,.2f}")
-        else:
-            logger.info("📊 === TOTALES DEL PROCESAMIENTO ===")
-            for concepto, valor in resultado.items():
-                logger.info(f"   {concepto}: ${valor:,.2f}")
-
-        logger.info("✅ === EJEMPLO COMPLETADO EXITOSAMENTE ===")
-        return resultado
-
-    except Exception as e:
-        logger.error(f"❌ Error en ejemplo: {e}")
-        raise
+        return procesar_sicoss_bd(datos_config, per_anoct, per_mesct, **kwargs)
+    return procesar_sicoss_manual(datos_config, per_anoct, per_mesct, **kwargs)
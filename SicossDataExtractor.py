@@ -7,27 +7,80 @@ Simula el comportamiento de la clase SicossOptimizado.php
 Autor: Asistente IA
 """
 
+import io
+from contextlib import contextmanager
+import numpy as np
 import pandas as pd
 from sqlalchemy import create_engine, text
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 import logging
 from dataclasses import dataclass
 from configparser import ConfigParser
 from config.sicoss_config import SicossConfig
 
-# Configurar logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Tipos fijos al leer con COPY: textos que read_csv convertiría a número ('1'/'0' de
+# regimen, arrays '{1,2}' de tipos_grupos) y cuit, que es float8.
+# Los enteros que la consulta nunca devuelve nulos se leen ya compactos (nro_legaj
+# int32, contadores int8); los importes quedan en float64 porque float32 pierde centavos.
+TIPOS_LEGAJOS = {'nro_legaj': 'int32', 'cuit': 'float64', 'apyno': str, 'estado': str,
+                 'provincialocalidad': str, 'trabajadorconvencionado': str, 'regimen': str,
+                 'conyugue': 'int8', 'hijos': 'int8', 'licencia': 'int8'}
+TIPOS_CONCEPTOS = {'nro_legaj': 'int32', 'tipo_conce': str, 'codigoescalafon': str, 'tipos_grupos': str}
+TIPOS_CONCEPTOS_SUMARIZADOS = {'nro_legaj': 'int32', 'impp_conce': 'float64'}
+TIPOS_OTRA_ACTIVIDAD = {'nro_legaj': 'int32'}
+
+# Marca de NULL en el CSV de COPY: distinta de '' para que un texto vacío no se lea
+# como nulo. 'NaN' es como Postgres escribe el NaN de float8/numeric
+NULO_COPY = r'\N'
+NULOS_CSV = (NULO_COPY, 'NaN')
+
+# codigo_os (codigo_os() del PHP) hoy es constante: se asigna en el procesador sin ir a la BD
+CODIGO_OS_DEFAULT = '000000'
+
+# Filas por lote al leer con read_sql_query (cursor del lado del servidor)
+FILAS_POR_LOTE_SQL = 50_000
+
+# Legajos por lote en la extracción por chunks (acota la memoria en períodos grandes)
+LEGAJOS_POR_CHUNK = 5000
+
+# Totales del informe de control -> columna que suma cada uno
+COLUMNAS_TOTALES = {
+    'bruto': 'IMPORTE_BRUTO',
+    'imponible_1': 'IMPORTE_IMPON',
+    'imponible_2': 'ImporteImponiblePatronal',
+    'imponible_4': 'ImporteImponible_4',
+    'imponible_5': 'ImporteImponible_5',
+    'imponible_6': 'ImporteImponible_6',
+    'imponible_8': 'Remuner78805',
+    'imponible_9': 'importeimponible_9'
+}
+
+# Importes por tipo de concepto que SicossDataProcessor todavía no sumariza (van en cero)
+CAMPOS_IMPORTES_CONCEPTOS = (
+    'ImporteNoRemun', 'ImporteHorasExtras', 'ImporteZonaDesfavorable',
+    'ImporteVacaciones', 'ImportePremios', 'ImporteAdicionales',
+    'IncrementoSolidario', 'ImporteImponibleBecario', 'ImporteImponible_6',
+    'SACInvestigador', 'NoRemun4y8', 'ImporteTipo91', 'ImporteNoRemun96'
+)
+
 
 
 
 class DatabaseConnection:
     """Maneja la conexión a la base de datos PostgreSQL"""
     
-    def __init__(self, config_file: str = 'database.ini'):
+    def __init__(self, config_file: str = 'database.ini', dtype_backend: Optional[str] = None,
+                 usar_copy: bool = True):
         self.config = self._load_config(config_file)
         self.engine = self._create_engine()
+        # None = dtypes numpy de siempre; 'pyarrow' deja cada columna en un buffer Arrow
+        self.dtype_backend = dtype_backend
+        # True = las extracciones grandes se leen con COPY ... TO STDOUT en lugar de fila a fila
+        self.usar_copy = usar_copy
+        # Conexión compartida mientras hay una session() abierta
+        self._conexion_sesion = None
     
     def _load_config(self, filename: str) -> Dict[str, str]:
         """Carga configuración de la base de datos"""
@@ -51,17 +104,129 @@ class DatabaseConnection:
                  f"{self.config['password']}@{self.config['host']}:"
                  f"{self.config.get('port', 5432)}/{db_name}")
         
-        return create_engine(db_url, client_encoding='latin1')
+        return create_engine(db_url, client_encoding='latin1',
+                             pool_size=4, max_overflow=8,
+                             pool_pre_ping=True, pool_recycle=3600)
+
+    @contextmanager
+    def session(self):
+        """
+        Mantiene una sola conexión para todas las consultas ejecutadas dentro del bloque
+
+        Evita pedir y devolver una conexión al pool por cada consulta de una extracción.
+        Es reentrante: una session() anidada reutiliza la conexión abierta.
+        """
+        if self._conexion_sesion is not None:
+            yield self._conexion_sesion
+            return
+
+        with self.engine.connect() as conexion:
+            self._conexion_sesion = conexion
+            try:
+                yield conexion
+            finally:
+                self._conexion_sesion = None
     
     def execute_query(self, query: str, params: Optional[Dict[str, Any]] = None) -> pd.DataFrame:
-        """Ejecuta una consulta SQL y retorna un DataFrame"""
+        """
+        Ejecuta una consulta SQL y retorna un DataFrame
+
+        La consulta usa un cursor del lado del servidor (stream_results, sólo para esta
+        sentencia: la conexión de session() sigue con cursores normales) y se lee de a
+        FILAS_POR_LOTE_SQL filas, así el driver no guarda todas las tuplas en el cliente.
+        Los lotes ya convertidos a DataFrame se acumulan y se concatenan al final: el pico
+        de memoria sigue siendo el resultado completo más la copia del concat.
+        """
         try:
             logger.info(f"Ejecutando consulta: {query[:100]}...")
-            return pd.read_sql_query(text(query), self.engine, params=params)
+            opciones = {'dtype_backend': self.dtype_backend} if self.dtype_backend else {}
+            consulta = text(query).execution_options(stream_results=True)
+            with self.session() as conexion:
+                lotes = list(pd.read_sql_query(consulta, conexion, params=params,
+                                               chunksize=FILAS_POR_LOTE_SQL, **opciones))
+            df = lotes[0] if len(lotes) == 1 else self._unir_lotes(lotes)
         except Exception as e:
             logger.error(f"Error ejecutando consulta: {e}")
             raise
 
+        return df
+
+    def _unir_lotes(self, lotes: List[pd.DataFrame]) -> pd.DataFrame:
+        """
+        Concatena los lotes de read_sql_query
+
+        Un lote donde una columna viene toda nula se infiere con otro tipo (object / null);
+        esas columnas se vuelven a inferir sobre el resultado completo.
+        """
+        df = pd.concat(lotes, ignore_index=True)
+        for campo in df.columns:
+            if len({str(lote[campo].dtype) for lote in lotes}) > 1:
+                if self.dtype_backend:
+                    df[campo] = df[campo].convert_dtypes(dtype_backend=self.dtype_backend)
+                else:
+                    df[campo] = df[campo].infer_objects()
+        return df
+
+    def copy_query_to_df(self, query: str, params: Optional[Dict[str, Any]] = None,
+                         dtype: Optional[Dict[str, Any]] = None,
+                         columnas_array: Tuple[str, ...] = ()) -> pd.DataFrame:
+        """
+        Ejecuta una consulta con COPY (...) TO STDOUT en CSV y la lee con read_csv
+
+        El resultado viaja en un solo stream en lugar de fila por fila por el cursor.
+        dtype fija los tipos que CSV no conserva (el resto se infiere como en read_sql_query) y
+        columnas_array se convierten de '{1,2}' a list[int]. Con usar_copy=False
+        delega en execute_query.
+        """
+        if not self.usar_copy:
+            return self.execute_query(query, params)
+
+        try:
+            logger.info(f"Ejecutando COPY: {query[:100]}...")
+            with self.session() as conexion:
+                with conexion.connection.cursor() as cursor:
+                    if params:
+                        # text() pasa los :parametros a %(parametros)s y psycopg2 los inlinea
+                        sql = str(text(query).compile(dialect=self.engine.dialect))
+                        query = cursor.mogrify(sql, params).decode('latin1')
+                    buffer = io.BytesIO()
+                    cursor.copy_expert(
+                        f"COPY ({query}) TO STDOUT WITH (FORMAT csv, HEADER, NULL '{NULO_COPY}')",
+                        buffer
+                    )
+
+            buffer.seek(0)
+            df = _leer_csv_copy(buffer, dtype, columnas_array, self.dtype_backend)
+        except Exception as e:
+            logger.error(f"Error ejecutando COPY: {e}")
+            raise
+
+        return df
+
+
+def _leer_csv_copy(buffer, dtype: Optional[Dict[str, Any]] = None,
+                   columnas_array: Tuple[str, ...] = (),
+                   dtype_backend: Optional[str] = None) -> pd.DataFrame:
+    """
+    Lee el CSV de COPY (NULL escrito como NULO_COPY) con los mismos valores que read_sql_query
+
+    Sin los NA por defecto de read_csv: '' queda como texto vacío y 'NA', 'NULL' o
+    'None' como texto; sólo NULOS_CSV se leen como nulo.
+    """
+    opciones = {'dtype_backend': dtype_backend} if dtype_backend else {}
+    df = pd.read_csv(buffer, dtype=dtype, encoding='latin1', keep_default_na=False,
+                     na_values=list(NULOS_CSV), **opciones)
+    for campo in columnas_array:
+        df[campo] = [_parsear_array_pg(valor) for valor in df[campo]]
+    return df
+
+
+def _parsear_array_pg(valor) -> List[int]:
+    """Convierte un array entero de Postgres en formato texto ('{1,2}') a lista"""
+    if not isinstance(valor, str) or len(valor) <= 2:
+        return []
+    return [int(elemento) for elemento in valor[1:-1].split(',')]
+
 
 class SicossSQLQueries:
     """Contiene las consultas SQL optimizadas extraídas de SicossOptimizado.php"""
@@ -75,7 +240,7 @@ class SicossSQLQueries:
         """
         return f"""
         SELECT
-            DISTINCT(dh01.nro_legaj),
+            dh01.nro_legaj,
             (dh01.nro_cuil1::char(2)||LPAD(dh01.nro_cuil::char(8),8,'0')||dh01.nro_cuil2::char(1))::float8 AS cuit,
             dh01.desc_appat||' '||dh01.desc_nombr AS apyno,
             dh01.tipo_estad AS estado,
@@ -114,28 +279,79 @@ class SicossSQLQueries:
         ) familiares ON familiares.nro_legaj = mapuche.dh01.nro_legaj
 
         LEFT OUTER JOIN mapuche.dha8 ON dha8.nro_legajo = mapuche.dh01.nro_legaj
-        LEFT OUTER JOIN mapuche.dh09 ON dh09.nro_legaj = mapuche.dh01.nro_legaj
-        LEFT OUTER JOIN mapuche.dhe9 ON dhe9.nro_legaj = mapuche.dh01.nro_legaj
+
+        -- Una sola fila de dh09 por legajo: el JOIN no multiplica filas y no hace
+        -- falta un DISTINCT sobre el resultado completo. dhe9 (otra actividad) no
+        -- aporta columnas aquí: se consulta aparte en get_otra_actividad_query.
+        -- LATERAL busca sólo las filas de cada legajo seleccionado (sin ordenar
+        -- toda dh09). Si un legajo tiene varias, gana la que lo informa en reparto
+        -- (regimen 1), después la de más cargos (adherentes); codc_bprev desempata
+        -- el resto, así que la fila elegida no cambia entre ejecuciones
+        LEFT JOIN LATERAL (
+            SELECT
+                codc_bprev,
+                fuerza_reparto,
+                cant_cargo
+            FROM mapuche.dh09
+            WHERE dh09.nro_legaj = mapuche.dh01.nro_legaj
+            ORDER BY
+                ((codc_bprev = {codc_reparto}) OR fuerza_reparto OR (({codc_reparto} = '') AND (codc_bprev IS NULL))) DESC NULLS LAST,
+                cant_cargo DESC NULLS LAST,
+                codc_bprev NULLS LAST,
+                fuerza_reparto NULLS LAST
+            LIMIT 1
+        ) dh09 ON true
         
         WHERE {where_legajo}
         ORDER BY dh01.nro_legaj
         """
     
+    @staticmethod
+    def get_nros_legajo_query(where_legajo: str = "true") -> str:
+        """
+        Números de legajo a procesar, ordenados (para recorrerlos por lotes)
+        """
+        return f"""
+        SELECT dh01.nro_legaj
+        FROM mapuche.dh01
+        WHERE {where_legajo}
+        ORDER BY dh01.nro_legaj
+        """
+    
+    @staticmethod
+    def get_tipos_grupos_conceptos_query() -> str:
+        """
+        Tipos de grupo de cada concepto (datos de referencia, no dependen del período)
+        """
+        return """
+        SELECT
+            dh16.codn_conce,
+            array_agg(DISTINCT dh15.codn_tipogrupo) AS tipos_grupos
+        FROM mapuche.dh16
+        INNER JOIN mapuche.dh15 ON dh15.codn_grupo = dh16.codn_grupo
+        GROUP BY dh16.codn_conce
+        """
+    
     @staticmethod
     def get_conceptos_liquidados_query(per_anoct: int, per_mesct: int,
-                                     where_legajo: str = "true") -> str:
+                                     where_legajo: str = "true",
+                                     incluir_tipos_grupos: bool = True) -> str:
         """
         Consulta optimizada para conceptos liquidados (basada en getConsultaConceptosOptimizada())
+        
+        Con incluir_tipos_grupos=False no se arma el CTE de tipos de grupo ni la columna
+        tipos_grupos (el extractor la completa desde su cache de conceptos).
         """
+        cte_tipos_grupos = ""
+        columna_tipos_grupos = ""
+        join_tipos_grupos = ""
+        if incluir_tipos_grupos:
+            cte_tipos_grupos = f"WITH tipos_grupos_conceptos AS ({SicossSQLQueries.get_tipos_grupos_conceptos_query()})"
+            columna_tipos_grupos = "COALESCE(tgc.tipos_grupos, ARRAY[]::integer[]) AS tipos_grupos,"
+            join_tipos_grupos = "LEFT JOIN tipos_grupos_conceptos tgc ON tgc.codn_conce = dh21.codn_conce"
+        
         return f"""
-        WITH tipos_grupos_conceptos AS (
-            SELECT
-                dh16.codn_conce,
-                array_agg(DISTINCT dh15.codn_tipogrupo) AS tipos_grupos
-            FROM mapuche.dh16
-            INNER JOIN mapuche.dh15 ON dh15.codn_grupo = dh16.codn_grupo
-            GROUP BY dh16.codn_conce
-        )
+        {cte_tipos_grupos}
         SELECT DISTINCT
             dh21.id_liquidacion,
             dh21.impp_conce,
@@ -147,13 +363,13 @@ class SicossSQLQueries:
             dh21.nro_cargo,
             dh21.nov1_conce,
             dh12.nro_orimp,
-            COALESCE(tgc.tipos_grupos, ARRAY[]::integer[]) AS tipos_grupos,
+            {columna_tipos_grupos}
             dh21.codigoescalafon
         FROM mapuche.dh21
         INNER JOIN mapuche.dh22 ON dh22.nro_liqui = dh21.nro_liqui
         LEFT JOIN mapuche.dh01 ON dh01.nro_legaj = dh21.nro_legaj
         LEFT JOIN mapuche.dh12 ON dh12.codn_conce = dh21.codn_conce
-        LEFT JOIN tipos_grupos_conceptos tgc ON tgc.codn_conce = dh21.codn_conce
+        {join_tipos_grupos}
         WHERE dh22.per_liano = {per_anoct}
         AND dh22.per_limes = {per_mesct}
         AND dh22.sino_genimp = true
@@ -162,36 +378,40 @@ class SicossSQLQueries:
         """
     
     @staticmethod
-    def get_otra_actividad_query(legajos: List[int]) -> str:
+    def get_conceptos_sumarizados_query(per_anoct: int, per_mesct: int,
+                                        where_legajo: str = "true") -> str:
         """
-        Consulta para otra actividad (basada en otra_actividad())
+        Conceptos liquidados ya sumados por legajo: una fila por legajo en lugar de una por concepto
         """
-        legajos_str = ','.join(map(str, legajos))
+        conceptos_query = SicossSQLQueries.get_conceptos_liquidados_query(
+            per_anoct, per_mesct, where_legajo, incluir_tipos_grupos=False
+        )
         return f"""
         SELECT
-			importe AS ImporteBrutoOtraActividad,
-			importe_sac AS ImporteSACOtraActividad
-		FROM
-			mapuche.dhe9
-		WHERE
-			nro_legaj IN ({legajos_str})
-		ORDER BY
-			vig_ano, vig_mes DESC
-		LIMIT 1
+            conceptos.nro_legaj,
+            SUM(conceptos.impp_conce) AS impp_conce
+        FROM ({conceptos_query}) AS conceptos
+        GROUP BY conceptos.nro_legaj
         """
     
     @staticmethod
-    def get_codigos_obra_social_query(legajos: List[int]) -> str:
+    def get_otra_actividad_query() -> str:
         """
-        Consulta para códigos de obra social (basada en codigo_os())
-        Siempre retorna '000000' para todos los legajos
+        Consulta para otra actividad (basada en otra_actividad())
+        Una fila por legajo: la declaración más reciente (vig_ano, vig_mes)
+        Los legajos viajan como array en el parámetro :legajos
         """
-        legajos_str = ','.join(map(str, legajos))
-        return f"""
-        SELECT 
+        return """
+        SELECT DISTINCT ON (nro_legaj)
             nro_legaj,
-            '000000' AS codigo_os
-        FROM UNNEST(ARRAY[{legajos_str}]) AS nro_legaj
+            importe AS ImporteBrutoOtraActividad,
+            importe_sac AS ImporteSACOtraActividad
+        FROM
+            mapuche.dhe9
+        WHERE
+            nro_legaj = ANY(CAST(:legajos AS integer[]))
+        ORDER BY
+            nro_legaj, vig_ano DESC, vig_mes DESC
         """
 
 
@@ -203,15 +423,22 @@ class SicossDataExtractor:
     def __init__(self, db_connection: DatabaseConnection):
         self.db = db_connection
         self.sql_queries = SicossSQLQueries()
+        self._tipos_grupos_cache: Optional[Dict[int, List[int]]] = None
         
     def extraer_datos_completos(self, config: SicossConfig, 
                               per_anoct: int, per_mesct: int,
-                              nro_legajo: Optional[int] = None) -> Dict[str, pd.DataFrame]:
+                              nro_legajo: Optional[int] = None,
+                              sumarizar_en_bd: bool = False) -> Dict[str, pd.DataFrame]:
         """
         Extrae todos los datos necesarios para procesar SICOSS
         
+        Con sumarizar_en_bd=True los conceptos se suman por legajo en Postgres y se
+        devuelven en 'conceptos_sumarizados' ('conceptos' queda vacío). Sirve para
+        SicossDataProcessor; SicossProcessor necesita el detalle por concepto.
+        
         Returns:
             Dict con DataFrames: legajos, conceptos, otra_actividad, obra_social
+            (y conceptos_sumarizados si sumarizar_en_bd)
         """
         logger.info(f"Iniciando extracción de datos para período {per_anoct}/{per_mesct}")
         
@@ -220,26 +447,69 @@ class SicossDataExtractor:
         if nro_legajo:
             where_legajo = f"dh01.nro_legaj = {nro_legajo}"
         
-        # 1. Extraer legajos
-        logger.info("Extrayendo datos de legajos...")
-        df_legajos = self.extraer_legajos(per_anoct, per_mesct, where_legajo)
+        # Todas las consultas de la extracción comparten una conexión
+        with self.db.session():
+            # 1. Extraer legajos
+            logger.info("Extrayendo datos de legajos...")
+            df_legajos = self.extraer_legajos(per_anoct, per_mesct, where_legajo)
+            
+            if df_legajos.empty:
+                logger.warning("No se encontraron legajos para procesar")
+                return self.crear_dataframes_vacios()
+            
+            return self._extraer_datos_de_legajos(df_legajos, per_anoct, per_mesct, sumarizar_en_bd)
+    
+    def extraer_datos_completos_chunked(self, config: SicossConfig,
+                                        per_anoct: int, per_mesct: int,
+                                        chunk_size: int = LEGAJOS_POR_CHUNK,
+                                        sumarizar_en_bd: bool = False) -> Iterator[Dict[str, pd.DataFrame]]:
+        """
+        Igual que extraer_datos_completos pero por lotes de chunk_size legajos
         
-        if df_legajos.empty:
-            logger.warning("No se encontraron legajos para procesar")
-            return self.crear_dataframes_vacios()
+        Primero trae sólo los números de legajo y después, por cada lote, los datos de
+        esos legajos (mismos DataFrames que extraer_datos_completos). En memoria hay un
+        lote a la vez; los resultados se acumulan con SicossDataProcessor.procesar_por_chunks.
+        """
+        logger.info(f"Iniciando extracción por lotes de {chunk_size} legajos para período {per_anoct}/{per_mesct}")
         
+        # Una conexión para todos los lotes (se libera al agotar o cerrar el generador)
+        with self.db.session():
+            query = self.sql_queries.get_nros_legajo_query()
+            legajos = self.db.copy_query_to_df(query, dtype={'nro_legaj': 'int32'})['nro_legaj'].tolist()
+            
+            for inicio in range(0, len(legajos), chunk_size):
+                lote = legajos[inicio:inicio + chunk_size]
+                df_legajos = self.extraer_legajos(
+                    per_anoct, per_mesct, "dh01.nro_legaj = ANY(CAST(:legajos AS integer[]))",
+                    params={'legajos': lote}
+                )
+                if df_legajos.empty:
+                    continue
+                yield self._extraer_datos_de_legajos(df_legajos, per_anoct, per_mesct, sumarizar_en_bd)
+    
+    def _extraer_datos_de_legajos(self, df_legajos: pd.DataFrame, per_anoct: int, per_mesct: int,
+                                  sumarizar_en_bd: bool) -> Dict[str, pd.DataFrame]:
+        """Extrae conceptos, otra actividad y obra social de los legajos ya extraídos"""
         # 2. Extraer conceptos liquidados
         logger.info("Extrayendo conceptos liquidados...")
-        where_legajo_conceptos = self.construir_where_conceptos(df_legajos['nro_legaj'].tolist())
-        df_conceptos = self.extraer_conceptos_liquidados(per_anoct, per_mesct, where_legajo_conceptos)
+        where_legajo_conceptos, params_conceptos = self.construir_where_conceptos(df_legajos['nro_legaj'].tolist())
+        df_conceptos_sumarizados = None
+        if sumarizar_en_bd:
+            df_conceptos_sumarizados = self.extraer_conceptos_sumarizados(
+                per_anoct, per_mesct, where_legajo_conceptos, params_conceptos
+            )
+            df_conceptos = self.crear_dataframes_vacios()['conceptos']
+        else:
+            df_conceptos = self.extraer_conceptos_liquidados(
+                per_anoct, per_mesct, where_legajo_conceptos, params_conceptos
+            )
         
         # 3. Extraer otra actividad
         logger.info("Extrayendo datos de otra actividad...")
         df_otra_actividad = self.extraer_otra_actividad(df_legajos['nro_legaj'].tolist())
         
-        # 4. Extraer códigos de obra social
-        logger.info("Extrayendo códigos de obra social...")
-        df_obra_social = self.extraer_codigos_obra_social(df_legajos['nro_legaj'].tolist())
+        # 4. Códigos de obra social: siempre CODIGO_OS_DEFAULT, el procesador lo asigna sin consulta
+        df_obra_social = pd.DataFrame(columns=['nro_legaj', 'codigo_os'])
         
         # 5. Estadísticas de extracción
         self.mostrar_estadisticas_extraccion({
@@ -249,47 +519,78 @@ class SicossDataExtractor:
             'obra_social': df_obra_social
         })
         
-        return {
+        datos = {
             'legajos': df_legajos,
             'conceptos': df_conceptos,
             'otra_actividad': df_otra_actividad,
             'obra_social': df_obra_social
         }
+        if df_conceptos_sumarizados is not None:
+            datos['conceptos_sumarizados'] = df_conceptos_sumarizados
+        return datos
     
-    def extraer_legajos(self, per_anoct: int, per_mesct: int, where_legajo: str) -> pd.DataFrame:
+    def extraer_legajos(self, per_anoct: int, per_mesct: int, where_legajo: str,
+                        params: Optional[Dict[str, Any]] = None) -> pd.DataFrame:
         """Extrae datos básicos de legajos"""
         query = self.sql_queries.get_legajos_query(per_anoct, per_mesct, "'REPA'", where_legajo)
-        return self.db.execute_query(query)
+        return self.db.copy_query_to_df(query, params=params, dtype=TIPOS_LEGAJOS)
     
-    def extraer_conceptos_liquidados(self, per_anoct: int, per_mesct: int, where_legajo: str) -> pd.DataFrame:
-        """Extrae conceptos liquidados con tipos de grupos"""
-        query = self.sql_queries.get_conceptos_liquidados_query(per_anoct, per_mesct, where_legajo)
-        return self.db.execute_query(query)
+    def extraer_conceptos_liquidados(self, per_anoct: int, per_mesct: int, where_legajo: str,
+                                     params: Optional[Dict[str, Any]] = None) -> pd.DataFrame:
+        """Extrae conceptos liquidados con tipos de grupos (tomados del cache por concepto)"""
+        query = self.sql_queries.get_conceptos_liquidados_query(
+            per_anoct, per_mesct, where_legajo, incluir_tipos_grupos=False
+        )
+        df_conceptos = self.db.copy_query_to_df(query, params=params, dtype=TIPOS_CONCEPTOS)
+        
+        tipos_grupos = self.obtener_tipos_grupos()
+        df_conceptos.insert(
+            df_conceptos.columns.get_loc('codigoescalafon'), 'tipos_grupos',
+            [tipos_grupos.get(codn_conce) or [] for codn_conce in df_conceptos['codn_conce'].tolist()]
+        )
+        return df_conceptos
+    
+    def obtener_tipos_grupos(self) -> Dict[int, List[int]]:
+        """
+        Tipos de grupo por concepto (codn_conce -> lista de codn_tipogrupo)
+        
+        Se consulta una sola vez por extractor; refrescar_tipos_grupos() descarta el cache.
+        """
+        if self._tipos_grupos_cache is None:
+            query = self.sql_queries.get_tipos_grupos_conceptos_query()
+            df = self.db.copy_query_to_df(query, dtype={'tipos_grupos': str}, columnas_array=('tipos_grupos',))
+            self._tipos_grupos_cache = dict(zip(df['codn_conce'].tolist(), df['tipos_grupos']))
+            logger.info(f"Tipos de grupo cacheados para {len(self._tipos_grupos_cache)} conceptos")
+        return self._tipos_grupos_cache
+    
+    def refrescar_tipos_grupos(self):
+        """Descarta el cache de tipos de grupo (se vuelve a consultar en el próximo uso)"""
+        self._tipos_grupos_cache = None
+    
+    def extraer_conceptos_sumarizados(self, per_anoct: int, per_mesct: int, where_legajo: str,
+                                      params: Optional[Dict[str, Any]] = None) -> pd.DataFrame:
+        """Extrae la suma de conceptos liquidados por legajo (agregada en la BD)"""
+        query = self.sql_queries.get_conceptos_sumarizados_query(per_anoct, per_mesct, where_legajo)
+        return self.db.copy_query_to_df(query, params=params, dtype=TIPOS_CONCEPTOS_SUMARIZADOS)
     
     def extraer_otra_actividad(self, legajos: List[int]) -> pd.DataFrame:
         """Extrae datos de otra actividad"""
         if not legajos:
             return pd.DataFrame(columns=['nro_legaj', 'importebrutootraactividad', 'importesacotraactividad']) #type: ignore
         
-        query = self.sql_queries.get_otra_actividad_query(legajos)
-        return self.db.execute_query(query)
+        query = self.sql_queries.get_otra_actividad_query()
+        return self.db.copy_query_to_df(query, params={'legajos': legajos}, dtype=TIPOS_OTRA_ACTIVIDAD)
     
-    def extraer_codigos_obra_social(self, legajos: List[int]) -> pd.DataFrame:
-        """Extrae códigos de obra social"""
-        if not legajos:
-            return pd.DataFrame(columns=['nro_legaj', 'codigo_os'])
-        
-        query = self.sql_queries.get_codigos_obra_social_query(legajos)
-        return self.db.execute_query(query)
-
-    def construir_where_conceptos(self, legajos: List[int]) -> str:
+    def construir_where_conceptos(self, legajos: List[int]) -> Tuple[str, Dict[str, Any]]:
         """Construye cláusula WHERE para filtrar conceptos por legajos
+
+        Retorna la cláusula y sus parámetros: los legajos van como un único array
+        ligado en lugar de pegarse en el texto del SQL.
         """
         if not legajos:
-            return "false"
+            return "false", {}
 
-        legajos_str = ','.join(map(str, legajos))
-        return f"dh21.nro_legaj IN ({legajos_str})"
+        return "dh21.nro_legaj = ANY(CAST(:legajos AS integer[]))", {'legajos': legajos}
 
     def crear_dataframes_vacios(self) -> Dict[str, pd.DataFrame]:
         """Crea DataFrames vacíos con las columnas correctas"""
@@ -313,18 +614,101 @@ class SicossDataExtractor:
         }
     
     def mostrar_estadisticas_extraccion(self, dataframes: Dict[str, pd.DataFrame]):
-        """Muestra estadísticas de la extracción de datos"""
+        """Muestra estadísticas de la extracción de datos (sólo si el log INFO está activo)"""
+        if not logger.isEnabledFor(logging.INFO):
+            return
+        
         logger.info("=== ESTADÍSTICAS DE EXTRACCIÓN ===")
         for nombre, df in dataframes.items():
             logger.info(f"{nombre.upper()}: {len(df)} registros")
             
         # Estadísticas adicionales
         if not dataframes['conceptos'].empty:
-            conceptos_por_legajo = dataframes['conceptos'].groupby('nro_legaj').size()
+            # Conteo por legajo distinto (np.unique): no depende del mayor nro_legaj
+            _, conceptos_por_legajo = np.unique(dataframes['conceptos']['nro_legaj'].to_numpy(),
+                                                return_counts=True)
             logger.info(f"Promedio conceptos por legajo: {conceptos_por_legajo.mean():.1f}")
             logger.info(f"Máximo conceptos por legajo: {conceptos_por_legajo.max()}")
 
 
+def _columnas_en_cero(n: int, campos: Tuple[str, ...]) -> Dict[str, np.ndarray]:
+    """Columnas float64 en cero para agregar con un único DataFrame.assign"""
+    return {campo: np.zeros(n, dtype=np.float64) for campo in campos}
+
+
+def _mapear_por_legajo(df_legajos: pd.DataFrame, df_origen: pd.DataFrame,
+                       campo: str, default: Any) -> pd.Series:
+    """
+    Trae df_origen[campo] a cada fila de df_legajos por nro_legaj (lookup 1:1, sin merge)
+    
+    df_origen debe tener un único registro por legajo; los que faltan quedan en default.
+    """
+    valores = df_origen.set_index('nro_legaj')[campo]
+    return df_legajos['nro_legaj'].map(valores).fillna(default)
+
+
+def _calcular_importes_sicoss(importe_sac: np.ndarray, importe_no_remun: np.ndarray,
+                              codigosituacion: np.ndarray, licencia: np.ndarray,
+                              tope_sac_patronal: float, tope_jubilatorio_patronal: float,
+                              trunca_tope: bool, check_lic: bool) -> Tuple[Dict[str, np.ndarray], np.ndarray]:
+    """
+    Cálculos de SICOSS (simplificados), topes patronales y validación sobre arrays
+    
+    Una expresión numpy por columna de salida, sin pasar por Series intermedias.
+    
+    Returns:
+        Tuple: (columnas calculadas en el orden del DataFrame, máscara de legajos válidos)
+    """
+    n = len(importe_sac)
+    ceros = np.zeros(n, dtype=np.float64)
+    
+    # Cálculos base: remuneración tipo C (simplificado)
+    importe_sac_patronal = importe_sac
+    importe_imponible_sin_sac = importe_sac - importe_sac_patronal
+    diferencia_sac = ceros
+    diferencia_imponible = ceros
+    importe_imponible_patronal = importe_sac
+    
+    # Topes jubilatorios patronales
+    if trunca_tope:
+        excede_sac = importe_sac > tope_sac_patronal
+        diferencia_sac = np.where(excede_sac, importe_sac - tope_sac_patronal, 0.0)
+        importe_sac_patronal = np.where(excede_sac, tope_sac_patronal, importe_sac_patronal)
+        
+        excede_imponible = importe_imponible_sin_sac > tope_jubilatorio_patronal
+        diferencia_imponible = np.where(
+            excede_imponible, importe_imponible_sin_sac - tope_jubilatorio_patronal, 0.0
+        )
+        importe_imponible_patronal = importe_imponible_patronal - diferencia_sac - diferencia_imponible
+    
+    importe_bruto = importe_imponible_patronal + importe_no_remun
+    
+    importes = {
+        'Remuner78805': importe_sac,
+        'AsignacionesFliaresPagadas': ceros,
+        'ImporteImponiblePatronal': importe_imponible_patronal,
+        'ImporteSACPatronal': importe_sac_patronal,
+        'ImporteImponibleSinSAC': importe_imponible_sin_sac,
+        'IMPORTE_BRUTO': importe_bruto,
+        'IMPORTE_IMPON': importe_sac,
+        'DiferenciaSACImponibleConTope': diferencia_sac,
+        'DiferenciaImponibleConTope': diferencia_imponible,
+        'ImporteSACNoDocente': importe_sac,
+        'ImporteImponible_4': importe_sac,
+        'ImporteImponible_5': importe_sac,
+        'TipoDeOperacion': np.ones(n, dtype=np.int64),
+        'ImporteSueldoMasAdicionales': ceros
+    }
+    
+    # Válido si tiene importes, situación especial (5, 11, 14) o licencia con check_lic
+    mask_validos = (importe_bruto + importe_sac + importe_imponible_patronal) > 0
+    mask_validos |= (codigosituacion == 5) | (codigosituacion == 11) | (codigosituacion == 14)
+    if check_lic:
+        mask_validos |= licencia == 1
+    
+    return importes, mask_validos
+
+
 class SicossDataProcessor:
     """
     Procesador de datos extraídos usando pandas
@@ -347,8 +731,10 @@ class SicossDataProcessor:
         if df_legajos.empty:
             return self._crear_resultado_vacio()
         
-        # 1. Sumarizar conceptos por legajo
-        df_legajos = self._sumarizar_conceptos_por_legajo(df_legajos, df_conceptos)
+        # 1. Sumarizar conceptos por legajo (o usar la suma ya hecha en la BD)
+        df_legajos = self._sumarizar_conceptos_por_legajo(
+            df_legajos, df_conceptos, datos.get('conceptos_sumarizados')
+        )
         
         # 2. Agregar datos de otra actividad
         df_legajos = self._agregar_otra_actividad(df_legajos, df_otra_actividad)
@@ -356,14 +742,8 @@ class SicossDataProcessor:
         # 3. Agregar códigos de obra social
         df_legajos = self._agregar_codigos_obra_social(df_legajos, df_obra_social)
         
-        # 4. Aplicar cálculos de SICOSS
-        df_legajos = self._aplicar_calculos_sicoss(df_legajos)
-        
-        # 5. Aplicar topes
-        df_legajos = self._aplicar_topes(df_legajos)
-        
-        # 6. Validar legajos
-        df_legajos_validos = self._validar_legajos(df_legajos)
+        # 4-6. Cálculos de SICOSS, topes y validación en una sola pasada sobre arrays
+        df_legajos, df_legajos_validos = self._aplicar_calculos_sicoss(df_legajos)
         
         # 7. Calcular totales
         totales = self._calcular_totales(df_legajos_validos)
@@ -378,51 +758,54 @@ class SicossDataProcessor:
             }
         }
     
+    def procesar_por_chunks(self, chunks: Iterable[Dict[str, pd.DataFrame]]) -> Dict[str, Any]:
+        """
+        Procesa lote por lote (ver extraer_datos_completos_chunked) acumulando totales
+        
+        No se conservan los legajos procesados: el resultado trae sólo totales y estadísticas.
+        """
+        totales = self._crear_totales_vacios()
+        estadisticas = self._crear_resultado_vacio()['estadisticas']
+        
+        for datos in chunks:
+            resultado = self.procesar_datos_extraidos(datos)
+            for clave, valor in resultado['totales'].items():
+                totales[clave] += valor
+            for clave, valor in resultado['estadisticas'].items():
+                estadisticas[clave] += valor
+        
+        return {'totales': totales, 'estadisticas': estadisticas}
+    
     def _sumarizar_conceptos_por_legajo(self, df_legajos: pd.DataFrame, 
-                                      df_conceptos: pd.DataFrame) -> pd.DataFrame:
-        """Sumariza conceptos por legajo usando pandas groupby"""
-        if df_conceptos.empty:
+                                      df_conceptos: pd.DataFrame,
+                                      conceptos_agrupados: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+        """
+        Sumariza conceptos por legajo usando pandas groupby
+        
+        Si conceptos_agrupados ya viene sumado por legajo (nro_legaj, impp_conce) se usa
+        directamente y no se agrupa nada en pandas.
+        """
+        if conceptos_agrupados is None and df_conceptos.empty:
             # Inicializar columnas con ceros
-            columnas_importes = [
-                'ImporteSAC', 'ImporteNoRemun', 'ImporteHorasExtras',
-                'ImporteZonaDesfavorable', 'ImporteVacaciones', 'ImportePremios',
-                'ImporteAdicionales', 'IncrementoSolidario', 'ImporteImponibleBecario',
-                'ImporteImponible_6', 'SACInvestigador', 'NoRemun4y8', 'ImporteTipo91',
-                'ImporteNoRemun96'
-            ]
-            for col in columnas_importes:
-                df_legajos[col] = 0.0
-            return df_legajos
+            return df_legajos.assign(
+                **_columnas_en_cero(len(df_legajos), ('ImporteSAC',) + CAMPOS_IMPORTES_CONCEPTOS)
+            )
         
         # Agregar conceptos sumarizados por legajo
-        conceptos_agrupados = df_conceptos.groupby('nro_legaj').agg({
-            'impp_conce': 'sum'
-        }).reset_index()
+        if conceptos_agrupados is None:
+            conceptos_agrupados = df_conceptos.groupby('nro_legaj').agg({
+                'impp_conce': 'sum'
+            }).reset_index()
         
         # Simular la lógica de sumarización por tipos de grupos
         # (Esta es una versión simplificada - en la implementación real necesitarías
         # las reglas específicas de agrupación por tipos de conceptos)
         
-        df_legajos = df_legajos.merge(
-            conceptos_agrupados.rename(columns={'impp_conce': 'ImporteSAC'}),
-            on='nro_legaj', how='left'
+        # Lookup 1:1 por legajo; los legajos sin conceptos quedan en 0 junto con los otros campos
+        return df_legajos.assign(
+            ImporteSAC=_mapear_por_legajo(df_legajos, conceptos_agrupados, 'impp_conce', 0.0),
+            **_columnas_en_cero(len(df_legajos), CAMPOS_IMPORTES_CONCEPTOS)
         )
-        
-        # Inicializar otros campos
-        campos_inicializar = [
-            'ImporteNoRemun', 'ImporteHorasExtras', 'ImporteZonaDesfavorable',
-            'ImporteVacaciones', 'ImportePremios', 'ImporteAdicionales',
-            'IncrementoSolidario', 'ImporteImponibleBecario', 'ImporteImponible_6',
-            'SACInvestigador', 'NoRemun4y8', 'ImporteTipo91', 'ImporteNoRemun96'
-        ]
-        
-        for campo in campos_inicializar:
-            df_legajos[campo] = 0.0
-        
-        # Rellenar NAs
-        df_legajos['ImporteSAC'] = df_legajos['ImporteSAC'].fillna(0.0)
-        
-        return df_legajos
     
     def _agregar_otra_actividad(self, df_legajos: pd.DataFrame, 
                                df_otra_actividad: pd.DataFrame) -> pd.DataFrame:
@@ -432,153 +815,56 @@ class SicossDataProcessor:
             df_legajos['ImporteSACOtraActividad'] = 0.0
             return df_legajos
         
-        return df_legajos.merge(
-            df_otra_actividad.rename(columns={
-                'importebrutootraactividad': 'ImporteBrutoOtraActividad',
-                'importesacotraactividad': 'ImporteSACOtraActividad'
-            }),
-            on='nro_legaj', how='left'
-        ).fillna({
-            'ImporteBrutoOtraActividad': 0.0,
-            'ImporteSACOtraActividad': 0.0
-        })
+        return df_legajos.assign(
+            ImporteBrutoOtraActividad=_mapear_por_legajo(
+                df_legajos, df_otra_actividad, 'importebrutootraactividad', 0.0
+            ),
+            ImporteSACOtraActividad=_mapear_por_legajo(
+                df_legajos, df_otra_actividad, 'importesacotraactividad', 0.0
+            )
+        )
     
     def _agregar_codigos_obra_social(self, df_legajos: pd.DataFrame,
                                    df_obra_social: pd.DataFrame) -> pd.DataFrame:
-        """Agrega códigos de obra social"""
+        """Agrega códigos de obra social (category: hoy es siempre CODIGO_OS_DEFAULT)"""
         if df_obra_social.empty:
-            df_legajos['codigo_os'] = '000000'
+            df_legajos['codigo_os'] = pd.Categorical.from_codes(
+                np.zeros(len(df_legajos), dtype=np.int8), categories=[CODIGO_OS_DEFAULT]
+            )
             return df_legajos
         
-        return df_legajos.merge(
-            df_obra_social,
-            on='nro_legaj', how='left'
-        ).fillna({'codigo_os': '000000'})
-    
-    def _aplicar_calculos_sicoss(self, df_legajos: pd.DataFrame) -> pd.DataFrame:
-        """Aplica los cálculos principales de SICOSS usando operaciones vectorizadas"""
-        
-        # Calcular remuneración tipo C (simplificado)
-        df_legajos['Remuner78805'] = df_legajos['ImporteSAC']  # Simplificado
-        df_legajos['AsignacionesFliaresPagadas'] = 0.0  # Simplificado
-        df_legajos['ImporteImponiblePatronal'] = df_legajos['Remuner78805']
-        
-        # Calcular importes base
-        df_legajos['ImporteSACPatronal'] = df_legajos['ImporteSAC']
-        df_legajos['ImporteImponibleSinSAC'] = (
-            df_legajos['ImporteImponiblePatronal'] - df_legajos['ImporteSACPatronal']
-        )
-        
-        # Calcular IMPORTE_BRUTO
-        df_legajos['IMPORTE_BRUTO'] = (
-            df_legajos['ImporteImponiblePatronal'] + df_legajos['ImporteNoRemun']
-        )
-        
-        # Calcular IMPORTE_IMPON (simplificado)
-        df_legajos['IMPORTE_IMPON'] = df_legajos['Remuner78805']
-        
-        # Inicializar campos adicionales
-        campos_adicionales = [
-            'DiferenciaSACImponibleConTope', 'DiferenciaImponibleConTope',
-            'ImporteSACNoDocente', 'ImporteImponible_4', 'ImporteImponible_5',
-            'TipoDeOperacion', 'ImporteSueldoMasAdicionales'
-        ]
-        
-        for campo in campos_adicionales:
-            df_legajos[campo] = 0.0
-        
-        # Asignar valores específicos
-        df_legajos['ImporteSACNoDocente'] = df_legajos['ImporteSAC']
-        df_legajos['ImporteImponible_4'] = df_legajos['IMPORTE_IMPON']
-        df_legajos['ImporteImponible_5'] = df_legajos['ImporteImponible_4']
-        df_legajos['TipoDeOperacion'] = 1
-        
+        codigos_os = dict(zip(df_obra_social['nro_legaj'].tolist(), df_obra_social['codigo_os'].tolist()))
+        df_legajos['codigo_os'] = df_legajos['nro_legaj'].map(codigos_os).fillna(CODIGO_OS_DEFAULT).astype('category')
         return df_legajos
     
-    def _aplicar_topes(self, df_legajos: pd.DataFrame) -> pd.DataFrame:
-        """Aplica topes jubilatorios usando operaciones vectorizadas"""
-        
-        # Aplicar tope SAC patronal
-        mask_tope_sac = (
-            (df_legajos['ImporteSAC'] > self.config.tope_sac_jubilatorio_patr) &
-            (self.config.trunca_tope)
-        )
-        
-        df_legajos.loc[mask_tope_sac, 'DiferenciaSACImponibleConTope'] = (
-            df_legajos.loc[mask_tope_sac, 'ImporteSAC'] - self.config.tope_sac_jubilatorio_patr
-        )
-        df_legajos.loc[mask_tope_sac, 'ImporteImponiblePatronal'] -= (
-            df_legajos.loc[mask_tope_sac, 'DiferenciaSACImponibleConTope']
-        )
-        df_legajos.loc[mask_tope_sac, 'ImporteSACPatronal'] = self.config.tope_sac_jubilatorio_patr
-        
-        # Aplicar tope imponible sin SAC
-        mask_tope_imponible = (
-            (df_legajos['ImporteImponibleSinSAC'] > self.config.tope_jubilatorio_patronal) &
-            (self.config.trunca_tope)
-        )
-        
-        df_legajos.loc[mask_tope_imponible, 'DiferenciaImponibleConTope'] = (
-            df_legajos.loc[mask_tope_imponible, 'ImporteImponibleSinSAC'] - 
-            self.config.tope_jubilatorio_patronal
-        )
-        df_legajos.loc[mask_tope_imponible, 'ImporteImponiblePatronal'] -= (
-            df_legajos.loc[mask_tope_imponible, 'DiferenciaImponibleConTope']
-        )
-        
-        # Recalcular IMPORTE_BRUTO después de aplicar topes
-        df_legajos['IMPORTE_BRUTO'] = (
-            df_legajos['ImporteImponiblePatronal'] + df_legajos['ImporteNoRemun']
-        )
-        
-        return df_legajos
-    
-    def _validar_legajos(self, df_legajos: pd.DataFrame) -> pd.DataFrame:
-        """Valida legajos según criterios de SICOSS"""
-        
-        # Verificar que tenga importes distintos de cero o situaciones especiales
-        campos_importes = ['IMPORTE_BRUTO', 'IMPORTE_IMPON', 'ImporteImponiblePatronal']
-        
-        mask_importes_validos = (
-            df_legajos[campos_importes].sum(axis=1) > 0
-        )
-        
-        # Situaciones especiales (maternidad, etc.)
-        mask_situaciones_especiales = df_legajos['codigosituacion'].isin([5, 11])
-        
-        # Licencias si está activado el check
-        mask_licencias = (
-            self.config.check_lic & (df_legajos['licencia'] == 1)
-        )
-        
-        # Situación reserva de puesto
-        mask_reserva_puesto = df_legajos['codigosituacion'] == 14
+    def _aplicar_calculos_sicoss(self, df_legajos: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        Aplica cálculos, topes jubilatorios y validación de SICOSS
         
-        # Combinear todas las condiciones
-        mask_validos = (
-            mask_importes_validos | 
-            mask_situaciones_especiales | 
-            mask_licencias | 
-            mask_reserva_puesto
+        Todo se resuelve en _calcular_importes_sicoss sobre arrays numpy; las columnas
+        resultantes se agregan de una vez. Retorna (todos los legajos, legajos válidos).
+        """
+        importes, mask_validos = _calcular_importes_sicoss(
+            importe_sac=df_legajos['ImporteSAC'].to_numpy(dtype=np.float64),
+            importe_no_remun=df_legajos['ImporteNoRemun'].to_numpy(dtype=np.float64),
+            codigosituacion=df_legajos['codigosituacion'].to_numpy(dtype=np.float64, na_value=np.nan),
+            licencia=df_legajos['licencia'].to_numpy(dtype=np.float64, na_value=np.nan),
+            tope_sac_patronal=self.config.tope_sac_jubilatorio_patr,
+            tope_jubilatorio_patronal=self.config.tope_jubilatorio_patronal,
+            trunca_tope=self.config.trunca_tope,
+            check_lic=self.config.check_lic
         )
+        df_legajos = df_legajos.assign(**importes)
         
-        return df_legajos[mask_validos].copy()
+        return df_legajos, df_legajos[mask_validos].copy()
     
     def _calcular_totales(self, df_legajos: pd.DataFrame) -> Dict[str, float]:
         """Calcula totales para el informe de control"""
         if df_legajos.empty:
             return self._crear_totales_vacios()
         
-        return {
-            'bruto': df_legajos['IMPORTE_BRUTO'].sum(),
-            'imponible_1': df_legajos['IMPORTE_IMPON'].sum(),
-            'imponible_2': df_legajos['ImporteImponiblePatronal'].sum(),
-            'imponible_4': df_legajos['ImporteImponible_4'].sum(),
-            'imponible_5': df_legajos['ImporteImponible_5'].sum(),
-            'imponible_6': df_legajos['ImporteImponible_6'].sum(),
-            'imponible_8': df_legajos['Remuner78805'].sum(),
-            'imponible_9': df_legajos['importeimponible_9'].sum()
-        }
+        totales = df_legajos[list(COLUMNAS_TOTALES.values())].to_numpy(dtype=np.float64).sum(axis=0)
+        return dict(zip(COLUMNAS_TOTALES, totales.tolist()))
     
     def _crear_resultado_vacio(self) -> Dict[str, Any]:
         """Crea resultado vacío"""
@@ -594,16 +880,7 @@ class SicossDataProcessor:
     
     def _crear_totales_vacios(self) -> Dict[str, float]:
         """Crea totales vacíos"""
-        return {
-            'bruto': 0.0,
-            'imponible_1': 0.0,
-            'imponible_2': 0.0,
-            'imponible_4': 0.0,
-            'imponible_5': 0.0,
-            'imponible_6': 0.0,
-            'imponible_8': 0.0,
-            'imponible_9': 0.0
-        }
+        return dict.fromkeys(COLUMNAS_TOTALES, 0.0)
 
 
 # Función principal de demostración
@@ -625,16 +902,14 @@ def main():
         extractor = SicossDataExtractor(db)
         procesador = SicossDataProcessor(config)
         
-        # Extraer datos
-        datos_extraidos = extractor.extraer_datos_completos(
+        # Extraer y procesar por lotes de legajos (todos los legajos del período)
+        chunks = extractor.extraer_datos_completos_chunked(
             config=config,
             per_anoct=2025,
             per_mesct=6,
-            nro_legajo=None  # Todos los legajos
+            sumarizar_en_bd=True  # SicossDataProcessor sólo usa la suma por legajo
         )
-        
-        # Procesar datos
-        resultado = procesador.procesar_datos_extraidos(datos_extraidos)
+        resultado = procesador.procesar_por_chunks(chunks)
         
         # Mostrar resultados
         print("\n=== RESULTADO DEL PROCESAMIENTO ===")
@@ -650,4 +925,6 @@ def main():
 
 
 if __name__ == "__main__":
+    # Configurar logging
+    logging.basicConfig(level=logging.INFO)
     main()
\ No newline at end of file
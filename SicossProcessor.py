@@ -1,18 +1,317 @@
+import os
 import time
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Optional, Any, Union
+from typing import Dict, Iterator, List, Optional, Any, Union
 import logging
 
 from pandas import DataFrame
 
-import SicossProcessorTester
 
 logger = logging.getLogger(__name__)
 
+# Tipos de concepto SICOSS (categorías de tipo_sicoss)
+TIPOS_SICOSS = (
+    "SAC",
+    "HORAS_EXTRAS",
+    "ZONA_DESFAVORABLE",
+    "VACACIONES",
+    "PREMIOS",
+    "ADICIONALES",
+    "NO_REMUNERATIVO",
+    "BECARIOS",
+    "SAC_INVESTIGADOR",
+    "OTROS",
+)
+
+# Rangos de codn_conce por tipo SICOSS (extremos incluidos, como Series.between)
+RANGOS_CODN_CONCE = {
+    "HORAS_EXTRAS": (2000, 2099),
+    "ZONA_DESFAVORABLE": (3000, 3099),
+    "VACACIONES": (4000, 4099),
+    "PREMIOS": (5000, 5099),
+    "ADICIONALES": (6000, 6099),
+    "BECARIOS": (7000, 7099),
+}
+INTERVALOS_CODN_CONCE = pd.IntervalIndex.from_tuples(
+    list(RANGOS_CODN_CONCE.values()), closed="both"
+)
+
+# Columna del pivot de conceptos (tipo SICOSS) -> campo SICOSS del legajo
+CAMPOS_POR_TIPO_SICOSS = {
+    "SAC": "ImporteSAC",
+    "SAC_INVESTIGADOR": "SACInvestigador",
+    "HORAS_EXTRAS": "ImporteHorasExtras",
+    "CantidadHORAS_EXTRAS": "CantidadHorasExtras",
+    "ZONA_DESFAVORABLE": "ImporteZonaDesfavorable",
+    "VACACIONES": "ImporteVacaciones",
+    "PREMIOS": "ImportePremios",
+    "ADICIONALES": "ImporteAdicionales",
+    "NO_REMUNERATIVO": "ImporteNoRemun",
+    "BECARIOS": "ImporteImponibleBecario",
+    "INCREMENTO_SOLIDARIO": "IncrementoSolidario",
+    "NO_REMUN_4Y8": "NoRemun4y8",
+    "TIPO_91": "ImporteTipo91",
+    "NO_REMUN_96": "ImporteNoRemun96",
+    "ASIGNACIONES_FAMILIARES": "AsignacionesFliaresPagadas",  # Tipo F
+}
+
+# Columna de legajos que suma cada total
+COLUMNAS_TOTALES = {
+    "bruto": "IMPORTE_BRUTO",
+    "imponible_1": "IMPORTE_IMPON",
+    "imponible_2": "ImporteImponiblePatronal",
+    "imponible_4": "ImporteImponible_4",
+    "imponible_5": "ImporteImponible_5",
+    "imponible_6": "ImporteImponible_6",
+    "imponible_8": "Remuner78805",
+    "imponible_9": "importeimponible_9",
+}
+
+# Códigos enteros chicos que _completar_campos_sicoss_pandas deja en int8
+CODIGOS_INT8 = ("codigosituacion", "TipoDeOperacion")
+
+# 📋 LISTA COMPLETA DE CAMPOS SICOSS (basada en grabar_en_txt del PHP)
+CAMPOS_REQUERIDOS = {
+    # Campos básicos
+    "cuit": "",
+    "apyno": "",
+    "conyugue": 0,
+    "hijos": 0,
+    "codigosituacion": 1,
+    "codigocondicion": 1,
+    "TipoDeActividad": 0,
+    "codigozona": 0,
+    "aporteadicional": 0.0,
+    "codigocontratacion": 0,
+    "codigo_os": "000000",
+    "adherentes": 0,
+    "regimen": "1",
+    "provincialocalidad": "",
+    # Importes principales
+    "IMPORTE_BRUTO": 0.0,
+    "IMPORTE_IMPON": 0.0,
+    "AsignacionesFliaresPagadas": 0.0,
+    "IMPORTE_VOLUN": 0.0,
+    "IMPORTE_ADICI": 0.0,
+    "ImporteSICOSSDec56119": 0.0,
+    "ImporteImponiblePatronal": 0.0,
+    "ImporteImponible_4": 0.0,
+    "AporteAdicionalObraSocial": 0.0,
+    # Revistas y días
+    "codigorevista1": 1,
+    "fecharevista1": 1,
+    "codigorevista2": 0,
+    "fecharevista2": 0,
+    "codigorevista3": 0,
+    "fecharevista3": 0,
+    "dias_trabajados": 30,
+    # Importes detallados
+    "ImporteSueldoMasAdicionales": 0.0,
+    "ImporteSAC": 0.0,
+    "ImporteHorasExtras": 0.0,
+    "ImporteZonaDesfavorable": 0.0,
+    "ImporteVacaciones": 0.0,
+    "ImporteAdicionales": 0.0,
+    "ImportePremios": 0.0,
+    "ImporteImponible_6": 0.0,
+    "TipoDeOperacion": 1,
+    "CantidadHorasExtras": 0.0,
+    "ImporteNoRemun": 0.0,
+    "ImporteMaternidad": 0.0,
+    "ImporteRectificacionRemun": 0.0,
+    "importeimponible_9": 0.0,
+    "ContribTareaDif": 0.0,
+    "SeguroVidaObligatorio": 0,
+    "ImporteSICOSS27430": 0.0,
+    "IncrementoSolidario": 0.0,
+    "trabajadorconvencionado": "S",
+}
+
+# Clasificación de CAMPOS_REQUERIDOS, calculada una vez al importar
+CAMPOS_NUMERICOS = tuple(
+    campo
+    for campo, valor in CAMPOS_REQUERIDOS.items()
+    if isinstance(valor, (int, float))
+)
+CAMPOS_TEXTO = tuple(
+    campo for campo, valor in CAMPOS_REQUERIDOS.items() if isinstance(valor, str)
+)
+
+# Códigos enteros (int8 los de CODIGOS_INT8, int32 el resto)
+CAMPOS_ENTEROS = (
+    "codigosituacion",
+    "codigocondicion",
+    "TipoDeActividad",
+    "codigozona",
+    "codigocontratacion",
+    "adherentes",
+    "hijos",
+    "codigorevista1",
+    "codigorevista2",
+    "codigorevista3",
+    "fecharevista1",
+    "fecharevista2",
+    "fecharevista3",
+    "dias_trabajados",
+    "TipoDeOperacion",
+    "SeguroVidaObligatorio",
+)
+TIPOS_ENTEROS = {
+    campo: np.int8 if campo in CODIGOS_INT8 else np.int32 for campo in CAMPOS_ENTEROS
+}
+
+# Textos con pocos valores distintos que quedan como categóricos
+CAMPOS_CATEGORICOS = {
+    campo: "category"
+    for campo in ("codigo_os", "regimen", "provincialocalidad", "trabajadorconvencionado")
+}
+
+# Directorio por defecto del archivo SICOSS
+DIRECTORIO_SALIDA = "storage/comunicacion/sicoss"
+
+# Líneas del TXT que se codifican y escriben juntas (acota la memoria del buffer)
+LINEAS_POR_ESCRITURA = 100_000
+
+
+def _calcular_remuneraciones_conceptos(
+    sac: np.ndarray,
+    horas_extras: np.ndarray,
+    zona_desfavorable: np.ndarray,
+    vacaciones: np.ndarray,
+    premios: np.ndarray,
+    adicionales: np.ndarray,
+    otros: np.ndarray,
+    becario: np.ndarray,
+    sac_investigador: np.ndarray,
+) -> tuple:
+    """
+    🔧 HELPER: Núcleo numérico de las reglas de negocio de conceptos
+
+    Remuner78805 (tipo C) = SAC + horas extras + zona desfavorable + vacaciones
+    + premios + adicionales + otros, más el imponible de becarios si es > 0;
+    también es la base del ImporteImponiblePatronal. El SAC se reduce en el
+    SAC de investigador cuando éste es > 0.
+
+    Returns:
+        (remuner78805, importe_sac) como arrays float64
+    """
+    remuner = sac + horas_extras
+    remuner += zona_desfavorable
+    remuner += vacaciones
+    remuner += premios
+    remuner += adicionales
+    remuner += otros
+
+    # Si tiene becarios, sumar al imponible
+    np.add(remuner, becario, out=remuner, where=becario > 0)
+
+    # Ajustar SAC si hay investigadores
+    importe_sac = sac.copy()
+    np.subtract(
+        importe_sac, sac_investigador, out=importe_sac, where=sac_investigador > 0
+    )
+
+    return remuner, importe_sac
+
+
+def _agregar_campos_en_cero(df: pd.DataFrame, campos: List[str]) -> pd.DataFrame:
+    """
+    🔧 HELPER: Agrega (o reinicia) campos float64 en 0 como un único bloque
+
+    Un solo DataFrame de ceros concatenado en lugar de una asignación por
+    campo; los campos que ya existían se reemplazan
+    """
+    ceros = pd.DataFrame(
+        np.zeros((len(df), len(campos)), dtype=np.float64, order="F"),
+        columns=campos,
+        index=df.index,
+    )
+    existentes = df.columns.intersection(campos)
+    return pd.concat([df.drop(columns=existentes), ceros], axis=1)
+
+
+def _restar_en_mascara(
+    df: pd.DataFrame, columna: str, sustraendo: str, mask: pd.Series
+) -> None:
+    """
+    🔧 HELPER: df.loc[mask, columna] -= df.loc[mask, sustraendo] sin indexar
+
+    Resta en el lugar sobre el array de la columna (ufunc con where=) y la
+    reasigna completa; las filas fuera de la máscara no se tocan
+    """
+    valores = df[columna].to_numpy(dtype=np.float64, copy=True)
+    np.subtract(
+        valores,
+        df[sustraendo].to_numpy(dtype=np.float64),
+        out=valores,
+        where=np.asarray(mask, dtype=bool),
+    )
+    df[columna] = valores
+
+
+def _excedente_sobre_tope(
+    df: pd.DataFrame, columna: str, tope: float, diferencia: str
+) -> np.ndarray:
+    """
+    🔧 HELPER: Guarda en `diferencia` lo que `columna` excede del tope
+
+    Una sola pasada sobre el array: máscara de excedidos y resta con where=.
+    En las demás filas `diferencia` conserva su valor (NaN si no existía,
+    igual que con df.loc[mask, diferencia] = ...). Devuelve la máscara.
+    """
+    valores = df[columna].to_numpy(dtype=np.float64)
+    mask = valores > tope
+    if diferencia in df.columns:
+        diferencias = df[diferencia].to_numpy(dtype=np.float64, copy=True)
+    else:
+        diferencias = np.full(len(df), np.nan)
+    np.subtract(valores, tope, out=diferencias, where=mask)
+    df[diferencia] = diferencias
+    return mask
+
+
+def _campos_sicoss_completos(df: pd.DataFrame) -> bool:
+    """
+    🔧 HELPER: Indica si df ya tiene el esquema que deja _completar_campos_sicoss_pandas
+
+    Están todos los CAMPOS_REQUERIDOS sin nulos, los códigos con su dtype de
+    TIPOS_ENTEROS, los CAMPOS_CATEGORICOS como category, el resto de los
+    textos como string y el resto de los importes numéricos
+    """
+    if not set(CAMPOS_REQUERIDOS).issubset(df.columns):
+        return False
+
+    for campo in CAMPOS_REQUERIDOS:
+        serie = df[campo]
+        if campo in TIPOS_ENTEROS:
+            esquema_ok = serie.dtype == TIPOS_ENTEROS[campo]
+        elif campo in CAMPOS_CATEGORICOS:
+            esquema_ok = isinstance(serie.dtype, pd.CategoricalDtype)
+        elif campo in CAMPOS_TEXTO:
+            esquema_ok = pd.api.types.is_string_dtype(serie) and not isinstance(
+                serie.dtype, pd.CategoricalDtype
+            )
+        else:
+            esquema_ok = pd.api.types.is_numeric_dtype(serie.dtype)
+        if not esquema_ok or serie.isna().any():
+            return False
+
+    return True
+
+
+def _recortar_a_tope(df: pd.DataFrame, columna: str, tope: float) -> None:
+    """
+    🔧 HELPER: df[columna] = min(df[columna], tope) con np.minimum en el lugar
+    """
+    valores = df[columna].to_numpy(dtype=np.float64, copy=True)
+    np.minimum(valores, tope, out=valores)
+    df[columna] = valores
+
 
 class SicossProcessor:
-    def __init__(self):
+    def __init__(self, directorio_salida: str = DIRECTORIO_SALIDA):
+        self.directorio_salida = directorio_salida
         self.porc_aporte_adicional_jubilacion = None
         self.categoria_diferencial = None
         self.trabajador_convencionado = None
@@ -60,19 +359,67 @@ class SicossProcessor:
             logger.warning("⚠️ No hay legajos para procesar")
             return total
 
+        df_legajos_validos = self._procesar_legajos_validos_pandas(
+            datos, config, df_legajos, df_conceptos, df_otra_actividad, licencias, retro
+        )
+
+        # 📊 PASO 12: Calcular totales
+        logger.info("📊 PASO 12: Calculando totales...")
+        if not df_legajos_validos.empty:
+            total = self._calcular_totales_pandas(df_legajos_validos)
+
+        # 📊 PASO 13: Generar salida
+        fin_total = time.time()
+        tiempo_total = fin_total - inicio_total
+
+        logger.info("🎉 === PROCESAMIENTO SICOSS COMPLETADO ===")
+        logger.info(f"⏱️ Tiempo total: {tiempo_total:.2f} segundos")
+        logger.info(f"📊 Estadísticas finales:")
+        logger.info(f"  - Legajos procesados: {len(df_legajos)}")
+        logger.info(f"  - Legajos válidos: {len(df_legajos_validos)}")
+        logger.info(
+            f"  - Legajos rechazados: {len(df_legajos) - len(df_legajos_validos)}"
+        )
+        logger.info(f"  - Total bruto: ${total.get('bruto', 0):,.2f}")
+        logger.info(f"  - Total imponible: ${total.get('imponible_1', 0):,.2f}")
+
+        # 🎯 RETORNAR SEGÚN PARÁMETROS
+        if not df_legajos_validos.empty:
+            if retornar_datos:
+                logger.info("📤 Retornando datos procesados")
+                return self._dataframe_a_registros(df_legajos_validos)
+            else:
+                logger.info(f"💾 Grabando archivo: {nombre_arch}")
+                self._grabar_en_txt_pandas(df_legajos_validos, nombre_arch)
+
+        return total
+
+    def _procesar_legajos_validos_pandas(
+        self,
+        datos: Dict,
+        config: Dict,
+        df_legajos: pd.DataFrame,
+        df_conceptos: pd.DataFrame,
+        df_otra_actividad: pd.DataFrame,
+        licencias: Optional[List] = None,
+        retro: bool = False,
+    ) -> pd.DataFrame:
+        """
+        🔧 HELPER: Ejecuta los pasos 1 a 11 y devuelve los legajos válidos
+
+        Compartido por procesa_sicoss_dataframes y el proceso por bloques del
+        backend, que graba y totaliza cada bloque por separado
+        """
         # 📊 PASO 1: Inicializar campos de todos los legajos
         logger.info("📊 PASO 1: Inicializando campos...")
         df_legajos = self._inicializar_campos_todos_legajos(df_legajos)
 
-        # 📊 PASO 2: Agregar códigos de obra social
-        logger.info("📊 PASO 2: Agregando códigos obra social...")
-        df_obra_social = pd.DataFrame()
-        df_legajos = self._agregar_codigos_obra_social_pandas(
-            df_legajos, df_obra_social
-        )
+        # nro_legaj como índice (conservando la columna): los JOIN siguientes
+        # se alinean por índice en lugar de rehashear la clave en cada merge
+        df_legajos = df_legajos.set_index("nro_legaj", drop=False)
 
-        # 📊 PASO 3: Procesar situaciones (normal vs. retro)
-        logger.info("📊 PASO 3: Procesando situaciones...")
+        # 📊 PASO 2: Procesar situaciones (normal vs. retro)
+        logger.info("📊 PASO 2: Procesando situaciones...")
         if not retro:
             df_legajos = self._procesar_situaciones_normales_pandas(
                 df_legajos, licencias
@@ -80,74 +427,43 @@ class SicossProcessor:
         else:
             df_legajos = self._procesar_situaciones_retro_pandas(df_legajos, datos)
 
-        # 📊 PASO 4: Procesar conyugues
-        logger.info("📊 PASO 4: Procesando conyugues...")
+        # 📊 PASO 3: Procesar conyugues
+        logger.info("📊 PASO 3: Procesando conyugues...")
         df_legajos = self._procesar_conyugues_pandas(df_legajos)
 
-        # 📊 PASO 5: ⭐ SUMARIZAR CONCEPTOS (MÁS IMPORTANTE)
-        logger.info("📊 PASO 5: ⭐ Sumarizando conceptos...")
+        # 📊 PASO 4: ⭐ SUMARIZAR CONCEPTOS (MÁS IMPORTANTE)
+        logger.info("📊 PASO 4: ⭐ Sumarizando conceptos...")
         df_legajos = self._sumarizar_conceptos_pandas(df_legajos, df_conceptos)
 
-        # 📊 PASO 6: Calcular importes principales
-        logger.info("📊 PASO 6: Calculando importes...")
+        # 📊 PASO 5: Calcular importes principales
+        logger.info("📊 PASO 5: Calculando importes...")
         df_legajos = self._calcular_importes_pandas(df_legajos, config)
 
-        # 📊 PASO 7: Aplicar topes
-        logger.info("📊 PASO 7: Aplicando topes...")
+        # 📊 PASO 6: Aplicar topes
+        logger.info("📊 PASO 6: Aplicando topes...")
         df_legajos = self._aplicar_topes_pandas(df_legajos, config)
 
-        # 📊 PASO 8: Procesar otra actividad
-        logger.info("📊 PASO 8: Procesando otra actividad...")
+        # 📊 PASO 7: Procesar otra actividad
+        logger.info("📊 PASO 7: Procesando otra actividad...")
         df_legajos = self._procesar_otra_actividad_pandas(
             df_legajos, df_otra_actividad, config
         )
 
-        # 📊 PASO 9: Calcular ART
-        logger.info("📊 PASO 9: Calculando ART...")
+        # 📊 PASO 8: Calcular ART
+        logger.info("📊 PASO 8: Calculando ART...")
         df_legajos = self._calcular_art_pandas(df_legajos, datos)
 
-        # 📊 PASO 10: Aplicar ajustes finales
-        logger.info("📊 PASO 10: Aplicando ajustes finales...")
+        # 📊 PASO 9: Aplicar ajustes finales
+        logger.info("📊 PASO 9: Aplicando ajustes finales...")
         df_legajos = self._aplicar_ajustes_finales_pandas(df_legajos, datos)
 
-        # 📊 PASO 11: Completar campos SICOSS
-        logger.info("📊 PASO 11: Completando campos SICOSS...")
+        # 📊 PASO 10: Completar campos SICOSS
+        logger.info("📊 PASO 10: Completando campos SICOSS...")
         df_legajos = self._completar_campos_sicoss_pandas(df_legajos)
 
-        # 📊 PASO 12: Validar legajos
-        logger.info("📊 PASO 12: Validando legajos...")
-        df_legajos_validos = self._validar_legajos_pandas(df_legajos, datos)
-
-        # 📊 PASO 13: Calcular totales
-        logger.info("📊 PASO 13: Calculando totales...")
-        if not df_legajos_validos.empty:
-            total = self._calcular_totales_pandas(df_legajos_validos)
-
-        # 📊 PASO 14: Generar salida
-        fin_total = time.time()
-        tiempo_total = fin_total - inicio_total
-
-        logger.info("🎉 === PROCESAMIENTO SICOSS COMPLETADO ===")
-        logger.info(f"⏱️ Tiempo total: {tiempo_total:.2f} segundos")
-        logger.info(f"📊 Estadísticas finales:")
-        logger.info(f"  - Legajos procesados: {len(df_legajos)}")
-        logger.info(f"  - Legajos válidos: {len(df_legajos_validos)}")
-        logger.info(
-            f"  - Legajos rechazados: {len(df_legajos) - len(df_legajos_validos)}"
-        )
-        logger.info(f"  - Total bruto: ${total.get('bruto', 0):,.2f}")
-        logger.info(f"  - Total imponible: ${total.get('imponible_1', 0):,.2f}")
-
-        # 🎯 RETORNAR SEGÚN PARÁMETROS
-        if not df_legajos_validos.empty:
-            if retornar_datos:
-                logger.info("📤 Retornando datos procesados")
-                return df_legajos_validos.to_dict("records")
-            else:
-                logger.info(f"💾 Grabando archivo: {nombre_arch}")
-                self._grabar_en_txt_pandas(df_legajos_validos, nombre_arch)
-
-        return total
+        # 📊 PASO 11: Validar legajos
+        logger.info("📊 PASO 11: Validando legajos...")
+        return self._validar_legajos_pandas(df_legajos, datos)
 
     def _crear_resultado_vacio(self) -> Dict[str, Any]:
         """
@@ -167,22 +483,30 @@ class SicossProcessor:
     def _inicializar_configuracion(self, datos: Dict) -> Dict:
         """
         🔧 HELPER: Inicializa configuración desde datos
+
+        Los topes se convierten una sola vez a float de Python (pueden llegar
+        como Decimal o escalares numpy desde la BD): las máscaras y ufuncs de
+        cada paso comparan contra escalares nativos y los pasos los leen a
+        variables locales una vez por llamada.
         :param datos:
         :return:
         """
         return {
-            "tope_jubilatorio_patronal": datos.get("TopeJubilatorioPatronal", 0.0),
-            "tope_jubilatorio_personal": datos.get("TopeJubilatorioPersonal", 0.0),
-            "tope_sac_jubilatorio_patr": datos.get("TopeSacJubilatorioPatronal", 0.0),
-            "tope_sac_jubilatorio_pers": datos.get("TopeSacJubilatorioPersonal", 0.0),
-            "tope_otros_aportes_personales": datos.get("TopeOtrosAportesPersonal", 0.0),
-            "tope_sac_jubilatorio_otro_ap": datos.get(
-                "TopeSacJubilatorioOtroAporte", 0.0
+            "tope_jubilatorio_patronal": float(datos.get("TopeJubilatorioPatronal", 0.0)),
+            "tope_jubilatorio_personal": float(datos.get("TopeJubilatorioPersonal", 0.0)),
+            "tope_sac_jubilatorio_patr": float(datos.get("TopeSacJubilatorioPatronal", 0.0)),
+            "tope_sac_jubilatorio_pers": float(datos.get("TopeSacJubilatorioPersonal", 0.0)),
+            "tope_otros_aportes_personales": float(
+                datos.get("TopeOtrosAportesPersonal", 0.0)
+            ),
+            "tope_sac_jubilatorio_otro_ap": float(
+                datos.get("TopeSacJubilatorioOtroAporte", 0.0)
             ),
-            "trunca_tope": datos.get("truncaTope", True),
+            "trunca_tope": bool(datos.get("truncaTope", True)),
         }
 
-    def _inicializar_totales(self) -> Dict[str, float]:
+    @staticmethod
+    def _inicializar_totales() -> Dict[str, float]:
         """
         🔧 HELPER: Inicializa diccionario de totales en 0
         """
@@ -197,6 +521,18 @@ class SicossProcessor:
             "imponible_9": 0.0,
         }
 
+    @staticmethod
+    def _dataframe_a_registros(df: pd.DataFrame) -> List[Dict[str, Any]]:
+        """
+        🔧 HELPER: Equivalente a df.to_dict("records") armado por columnas
+
+        Cada columna se convierte una vez a lista de valores Python (tolist)
+        y las filas se arman con zip, sin pasar celda por celda por pandas
+        """
+        columnas = df.columns.tolist()
+        valores = [df.iloc[:, posicion].tolist() for posicion in range(len(columnas))]
+        return [dict(zip(columnas, fila)) for fila in zip(*valores)]
+
     def _inicializar_campos_todos_legajos(
         self, df_legajos: pd.DataFrame
     ) -> pd.DataFrame:
@@ -242,44 +578,14 @@ class SicossProcessor:
         ]
 
         # 🚀 OPERACIÓN VECTORIZADA: Asignar 0 a todas las columnas a la vez
-        for campo in campos_numericos:
-            df_legajos[campo] = 0.0
-
-        # Inicializar campos de texto
-        df_legajos["codigo_os"] = "000000"  # Valor por defecto
-
-        logger.info(f"✅ Campos inicializados para {len(df_legajos)} legajos")
-        return df_legajos
-
-    def _agregar_codigos_obra_social_pandas(
-        self, df_legajos: pd.DataFrame, df_obra_social: pd.DataFrame
-    ) -> pd.DataFrame:
-        """
-        🔧 NUEVO MÉTODO: Agrega códigos de obra social usando JOIN de pandas
-
-        Reemplaza: $legajoActual['codigo_os'] = self::codigo_os_optimizado($legajo, $codigos_dgi_por_legajo);
-        """
-        logger.info("🔧 Agregando códigos de obra social...")
-
-        if df_obra_social.empty:
-            logger.warning("⚠️ No hay códigos de obra social, usando valor por defecto")
-            df_legajos["codigo_os"] = "000000"
-            return df_legajos
+        df_legajos = _agregar_campos_en_cero(df_legajos, campos_numericos)
 
-        # 🚀 OPERACIÓN VECTORIZADA: JOIN en lugar de búsqueda individual
-        df_legajos = df_legajos.merge(
-            df_obra_social[["nro_legaj", "codigo_os"]],
-            on="nro_legaj",
-            how="left",
-            suffixes=("", "_os"),
+        # Inicializar campos de texto (codigo_os por defecto, categórico)
+        df_legajos["codigo_os"] = pd.Categorical.from_codes(
+            np.zeros(len(df_legajos), dtype=np.int8), categories=["000000"]
         )
 
-        # Rellenar valores faltantes
-        df_legajos["codigo_os"] = df_legajos["codigo_os"].fillna("000000")
-
-        logger.info(
-            f"✅ Códigos de obra social agregados para {len(df_legajos)} legajos"
-        )
+        logger.info(f"✅ Campos inicializados para {len(df_legajos)} legajos")
         return df_legajos
 
     def _generar_estadisticas(
@@ -314,14 +620,15 @@ class SicossProcessor:
         """
         logger.info("🔧 Procesando situaciones normales...")
 
-        # Inicializar campos de revista con valores por defecto
-        df_legajos["dias_trabajados"] = 30  # Por defecto mes completo
+        # Inicializar campos de revista con valores por defecto (int8: días y
+        # códigos chicos; se pasan a int al completar los campos SICOSS)
+        df_legajos["dias_trabajados"] = np.int8(30)  # Por defecto mes completo
         df_legajos["codigorevista1"] = df_legajos["codigosituacion"]
-        df_legajos["fecharevista1"] = 1
-        df_legajos["codigorevista2"] = 0
-        df_legajos["fecharevista2"] = 0
-        df_legajos["codigorevista3"] = 0
-        df_legajos["fecharevista3"] = 0
+        df_legajos["fecharevista1"] = np.int8(1)
+        df_legajos["codigorevista2"] = np.int8(0)
+        df_legajos["fecharevista2"] = np.int8(0)
+        df_legajos["codigorevista3"] = np.int8(0)
+        df_legajos["fecharevista3"] = np.int8(0)
 
         # TODO: Implementar lógica completa de licencias y cargos
         # Esta es una versión simplificada para que funcione el flujo
@@ -337,8 +644,8 @@ class SicossProcessor:
         """
         logger.info("🔧 Procesando situaciones retro...")
 
-        # Lógica del PHP para retro
-        df_legajos["dias_trabajados"] = 30  # Por defecto
+        # Lógica del PHP para retro (campos de revista en int8, como en normales)
+        df_legajos["dias_trabajados"] = np.int8(30)  # Por defecto
 
         # Si tiene licencias y está activado el check
         if datos.get("check_lic", False):
@@ -348,11 +655,11 @@ class SicossProcessor:
 
         # Configurar revistas para retro
         df_legajos["codigorevista1"] = df_legajos["codigosituacion"]
-        df_legajos["fecharevista1"] = 1
-        df_legajos["codigorevista2"] = 0
-        df_legajos["fecharevista2"] = 0
-        df_legajos["codigorevista3"] = 0
-        df_legajos["fecharevista3"] = 0
+        df_legajos["fecharevista1"] = np.int8(1)
+        df_legajos["codigorevista2"] = np.int8(0)
+        df_legajos["fecharevista2"] = np.int8(0)
+        df_legajos["codigorevista3"] = np.int8(0)
+        df_legajos["fecharevista3"] = np.int8(0)
 
         logger.info("✅ Situaciones retro procesadas")
         return df_legajos
@@ -366,11 +673,12 @@ class SicossProcessor:
         logger.info("🔧 Procesando conyugues...")
 
         # 🚀 OPERACIÓN VECTORIZADA: Convertir >0 a 1, =0 a 0
-        df_legajos["conyugue"] = (df_legajos["conyugue"] > 0).astype(int)
+        # (el array booleano se reinterpreta como int8, sin copiarlo a int64)
+        df_legajos["conyugue"] = (df_legajos["conyugue"].to_numpy() > 0).view(np.int8)
 
-        logger.info(
-            f"✅ Conyugues procesados: {df_legajos['conyugue'].sum()} con conyugue"
-        )
+        logger.info("✅ Conyugues procesados")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"  - {df_legajos['conyugue'].sum()} con conyugue")
         return df_legajos
 
     def _sumarizar_conceptos_pandas(
@@ -397,20 +705,19 @@ class SicossProcessor:
         # 📊 PASO 1: Preparar datos de conceptos
         df_conceptos_prep = self._preparar_conceptos_para_sumarizacion(df_conceptos)
 
-        # 📊 PASO 2: Sumarizar por tipo de concepto usando groupby
-        df_conceptos_agrupados = self._agrupar_conceptos_por_tipo(df_conceptos_prep)
-
-        # 📊 PASO 3: Pivotar datos para tener una fila por legajo
-        df_conceptos_pivot = self._pivotar_conceptos_por_legajo(df_conceptos_agrupados)
+        # 📊 PASO 2: Sumarizar y pivotar por tipo de concepto (una fila por legajo)
+        df_conceptos_pivot = self._pivotar_conceptos_por_legajo(df_conceptos_prep)
 
-        # 📊 PASO 4: Hacer JOIN con legajos
-        df_legajos_con_conceptos = self._unir_legajos_con_conceptos(
-            df_legajos, df_conceptos_pivot
+        # 📊 PASO 3: Aplicar reglas de negocio sobre el pivot (una fila por legajo
+        # con conceptos): las columnas temporales por tipo se consumen aquí y no
+        # llegan a materializarse en el DataFrame de legajos
+        df_conceptos_legajo = self._aplicar_reglas_negocio_conceptos(
+            df_conceptos_pivot
         )
 
-        # 📊 PASO 5: Aplicar reglas de negocio específicas
-        df_legajos_final = self._aplicar_reglas_negocio_conceptos(
-            df_legajos_con_conceptos
+        # 📊 PASO 4: Hacer JOIN con legajos una sola vez
+        df_legajos_final = self._unir_legajos_con_conceptos(
+            df_legajos, df_conceptos_legajo
         )
 
         logger.info("✅ Sumarización de conceptos completada")
@@ -426,170 +733,158 @@ class SicossProcessor:
         """
         logger.info("🔧 Preparando conceptos para sumarización...")
 
-        df_prep = df_conceptos.copy()
+        # Copia superficial: sólo se agrega tipo_sicoss; con Copy-on-Write las
+        # columnas de conceptos no se duplican ni se modifica el original
+        df_prep = df_conceptos.copy(deep=False)
+
+        # La clasificación depende sólo de los atributos del concepto: se
+        # resuelve una vez por combinación distinta y se propaga a las filas.
+        # tipos_grupos como texto una sola vez: hashable y cada etiqueta se
+        # busca con str.contains en lugar de un apply de Python por fila
+        claves = pd.DataFrame(
+            {
+                "codn_conce": df_prep["codn_conce"],
+                "tipo_conce": df_prep["tipo_conce"],
+                "nro_orimp": df_prep["nro_orimp"],
+                "codigoescalafon": df_prep["codigoescalafon"],
+                "tipos_grupos": df_prep["tipos_grupos"].astype(str),
+            }
+        )
+        grupo = (
+            claves.groupby(list(claves.columns), dropna=False, sort=False)
+            .ngroup()
+            .to_numpy()
+        )
+        _, primeras = np.unique(grupo, return_index=True)
+        df_tipos = claves.iloc[primeras].reset_index(drop=True)
+
+        # Tipo de concepto SICOSS (categórico: el groupby y el pivot trabajan
+        # sobre códigos enteros en lugar de strings)
+        df_tipos["tipo_sicoss"] = pd.Categorical.from_codes(
+            np.full(len(df_tipos), TIPOS_SICOSS.index("OTROS"), dtype=np.int8),
+            categories=TIPOS_SICOSS,
+        )
+        tipos_grupos = df_tipos["tipos_grupos"]
+
+        def tiene_tag(tag: str) -> pd.Series:
+            return tipos_grupos.str.contains(tag, regex=False, na=False)
+
+        # Rango de codn_conce de cada concepto en una sola búsqueda por
+        # intervalos (-1 si no cae en ninguno) en lugar de un between por tipo
+        rango_codn = pd.cut(df_tipos["codn_conce"], INTERVALOS_CODN_CONCE).cat.codes
 
-        # Inicializar columna de tipo de concepto SICOSS
-        df_prep["tipo_sicoss"] = "OTROS"
+        def en_rango(tipo: str) -> pd.Series:
+            return rango_codn == list(RANGOS_CODN_CONCE).index(tipo)
 
         # 🎯 REGLAS DE CLASIFICACIÓN (basadas en el PHP original)
 
         # SAC - Sueldo Anual Complementario
         mask_sac = (
-            (df_prep["codn_conce"].isin([1001, 1002, 1003]))  # Códigos SAC típicos
-            | (df_prep["tipo_conce"] == "SAC")
-            | (df_prep["tipos_grupos"].apply(lambda x: "SAC" in str(x) if x else False))
+            (df_tipos["codn_conce"].isin([1001, 1002, 1003]))  # Códigos SAC típicos
+            | (df_tipos["tipo_conce"] == "SAC")
+            | tiene_tag("SAC")
         )
-        df_prep.loc[mask_sac, "tipo_sicoss"] = "SAC"
+        df_tipos.loc[mask_sac, "tipo_sicoss"] = "SAC"
 
         # HORAS EXTRAS
-        mask_horas_extras = (
-            df_prep["codn_conce"].between(2000, 2099)
-        ) | (  # Rango códigos horas extras
-            df_prep["tipos_grupos"].apply(lambda x: "HE" in str(x) if x else False)
-        )
-        df_prep.loc[mask_horas_extras, "tipo_sicoss"] = "HORAS_EXTRAS"
+        mask_horas_extras = en_rango("HORAS_EXTRAS") | tiene_tag("HE")
+        df_tipos.loc[mask_horas_extras, "tipo_sicoss"] = "HORAS_EXTRAS"
 
         # ZONA DESFAVORABLE
-        mask_zona_desf = (df_prep["codn_conce"].between(3000, 3099)) | (
-            df_prep["tipos_grupos"].apply(lambda x: "ZD" in str(x) if x else False)
-        )
-        df_prep.loc[mask_zona_desf, "tipo_sicoss"] = "ZONA_DESFAVORABLE"
+        mask_zona_desf = en_rango("ZONA_DESFAVORABLE") | tiene_tag("ZD")
+        df_tipos.loc[mask_zona_desf, "tipo_sicoss"] = "ZONA_DESFAVORABLE"
 
         # VACACIONES
-        mask_vacaciones = (df_prep["codn_conce"].between(4000, 4099)) | (
-            df_prep["tipos_grupos"].apply(lambda x: "VAC" in str(x) if x else False)
-        )
-        df_prep.loc[mask_vacaciones, "tipo_sicoss"] = "VACACIONES"
+        mask_vacaciones = en_rango("VACACIONES") | tiene_tag("VAC")
+        df_tipos.loc[mask_vacaciones, "tipo_sicoss"] = "VACACIONES"
 
         # PREMIOS
-        mask_premios = (df_prep["codn_conce"].between(5000, 5099)) | (
-            df_prep["tipos_grupos"].apply(lambda x: "PREM" in str(x) if x else False)
-        )
-        df_prep.loc[mask_premios, "tipo_sicoss"] = "PREMIOS"
+        mask_premios = en_rango("PREMIOS") | tiene_tag("PREM")
+        df_tipos.loc[mask_premios, "tipo_sicoss"] = "PREMIOS"
 
         # ADICIONALES
-        mask_adicionales = (df_prep["codn_conce"].between(6000, 6099)) | (
-            df_prep["tipos_grupos"].apply(lambda x: "ADIC" in str(x) if x else False)
-        )
-        df_prep.loc[mask_adicionales, "tipo_sicoss"] = "ADICIONALES"
+        mask_adicionales = en_rango("ADICIONALES") | tiene_tag("ADIC")
+        df_tipos.loc[mask_adicionales, "tipo_sicoss"] = "ADICIONALES"
 
         # NO REMUNERATIVOS
         mask_no_remun = (
-            df_prep["nro_orimp"] == 0
+            df_tipos["nro_orimp"] == 0
         ) | (  # Sin origen de importe = no remunerativo
-            df_prep["tipos_grupos"].apply(lambda x: "NR" in str(x) if x else False)
+            tiene_tag("NR")
         )
-        df_prep.loc[mask_no_remun, "tipo_sicoss"] = "NO_REMUNERATIVO"
+        df_tipos.loc[mask_no_remun, "tipo_sicoss"] = "NO_REMUNERATIVO"
 
         # BECARIOS
-        mask_becarios = (df_prep["codn_conce"].between(7000, 7099)) | (
-            df_prep["tipos_grupos"].apply(lambda x: "BEC" in str(x) if x else False)
-        )
-        df_prep.loc[mask_becarios, "tipo_sicoss"] = "BECARIOS"
+        mask_becarios = en_rango("BECARIOS") | tiene_tag("BEC")
+        df_tipos.loc[mask_becarios, "tipo_sicoss"] = "BECARIOS"
 
         # INVESTIGADORES (para SAC especial)
-        mask_investigadores = (df_prep["codigoescalafon"] == "INV") | (
-            df_prep["tipos_grupos"].apply(lambda x: "INV" in str(x) if x else False)
+        mask_investigadores = (df_tipos["codigoescalafon"] == "INV") | (
+            tiene_tag("INV")
         )
-        df_prep.loc[mask_investigadores & mask_sac, "tipo_sicoss"] = "SAC_INVESTIGADOR"
-
-        logger.info(f"✅ Conceptos clasificados:")
-        logger.info(f"  {df_prep['tipo_sicoss'].value_counts().to_dict()}")
-
-        return df_prep
+        df_tipos.loc[mask_investigadores & mask_sac, "tipo_sicoss"] = "SAC_INVESTIGADOR"
 
-    def _agrupar_conceptos_por_tipo(
-        self, df_conceptos_prep: pd.DataFrame
-    ) -> pd.DataFrame:
-        """
-        🔧 PASO 2: Agrupa conceptos por legajo y tipo usando groupby
+        df_prep["tipo_sicoss"] = df_tipos["tipo_sicoss"].array.take(grupo)
 
-        Reemplaza los bucles PHP de sumarización
-        """
-        logger.info("🔧 Agrupando conceptos por tipo...")
+        logger.info(f"✅ Conceptos clasificados")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"  {df_prep['tipo_sicoss'].value_counts().to_dict()}")
 
-        # 🚀 OPERACIÓN VECTORIZADA: GroupBy + Sum
-        df_agrupado = (
-            df_conceptos_prep.groupby(["nro_legaj", "tipo_sicoss"])
-            .agg(
-                {
-                    "impp_conce": "sum",
-                    "nov1_conce": "sum",  # Cantidad (para horas extras)
-                    "nro_cargo": "count",  # Contador de conceptos
-                }
-            )
-            .reset_index()
-        )
-
-        # Renombrar columnas para claridad
-        df_agrupado.rename(
-            columns={
-                "impp_conce": "importe_total",
-                "nov1_conce": "cantidad_total",
-                "nro_cargo": "cantidad_conceptos",
-            },
-            inplace=True,
-        )
-
-        logger.info(f"✅ Conceptos agrupados: {len(df_agrupado)} grupos")
-        return df_agrupado
+        return df_prep
 
     def _pivotar_conceptos_por_legajo(
-        self, df_conceptos_agrupados: pd.DataFrame
+        self, df_conceptos_prep: pd.DataFrame
     ) -> pd.DataFrame:
         """
-        🔧 PASO 3: Pivota datos para tener columnas por tipo de concepto
+        🔧 PASO 2: Sumariza importes y cantidades por legajo y tipo de concepto
 
-        Transforma de formato largo a formato ancho
+        Un solo pivot_table (suma) reemplaza los bucles PHP de sumarización y
+        deja una columna por tipo (importe) y Cantidad<tipo> (cantidad),
+        indexado por nro_legaj
         """
         logger.info("🔧 Pivotando conceptos por legajo...")
 
-        # 🚀 OPERACIÓN VECTORIZADA: Pivot Table
-        df_pivot_importes = df_conceptos_agrupados.pivot_table(
-            index="nro_legaj",
-            columns="tipo_sicoss",
-            values="importe_total",
-            fill_value=0.0,
-            aggfunc="sum",
-        ).reset_index()
-
-        # Pivotar cantidades (para horas extras)
-        df_pivot_cantidades = df_conceptos_agrupados.pivot_table(
+        # 🚀 OPERACIÓN VECTORIZADA: Pivot Table sobre importes y cantidades
+        df_pivot = df_conceptos_prep.pivot_table(
             index="nro_legaj",
             columns="tipo_sicoss",
-            values="cantidad_total",
+            values=["impp_conce", "nov1_conce"],
             fill_value=0.0,
             aggfunc="sum",
-        ).reset_index()
-
-        # Renombrar columnas de cantidades
-        cantidad_cols = {
-            col: f"Cantidad{col}"
-            for col in df_pivot_cantidades.columns
-            if col != "nro_legaj"
-        }
-        df_pivot_cantidades.rename(columns=cantidad_cols, inplace=True)
-
-        # Unir importes y cantidades
-        df_pivot_final = df_pivot_importes.merge(
-            df_pivot_cantidades, on="nro_legaj", how="outer"
-        ).fillna(0.0)
+            observed=True,
+        )
 
-        logger.info(f"✅ Datos pivotados para {len(df_pivot_final)} legajos")
-        return df_pivot_final
+        # Aplanar columnas: importes por tipo, cantidades (para horas extras)
+        # como Cantidad<tipo>
+        df_pivot.columns = [
+            f"Cantidad{tipo}" if valor == "nov1_conce" else tipo
+            for valor, tipo in df_pivot.columns
+        ]
+        logger.info(f"✅ Datos pivotados para {len(df_pivot)} legajos")
+        return df_pivot
 
     def _unir_legajos_con_conceptos(
         self, df_legajos: pd.DataFrame, df_conceptos_pivot: pd.DataFrame
     ) -> pd.DataFrame:
         """
         🔧 PASO 4: Une legajos con conceptos sumarizados
+
+        Los campos calculados en los conceptos reemplazan a los inicializados
+        en el legajo; los legajos sin conceptos quedan en 0
         """
         logger.info("🔧 Uniendo legajos con conceptos...")
 
-        # 🚀 OPERACIÓN VECTORIZADA: LEFT JOIN
-        df_unido = df_legajos.merge(
-            df_conceptos_pivot, on="nro_legaj", how="left"
-        ).fillna(0.0)
+        columnas_conceptos = df_conceptos_pivot.columns
+        columnas_reemplazadas = df_legajos.columns.intersection(columnas_conceptos)
+
+        # 🚀 OPERACIÓN VECTORIZADA: LEFT JOIN por índice (nro_legaj)
+        df_unido = df_legajos.drop(columns=columnas_reemplazadas).join(
+            df_conceptos_pivot, how="left"
+        )
+
+        # Sólo las columnas traídas del pivot quedan en NaN para los legajos
+        # sin conceptos: rellenar esas, no el DataFrame completo
+        df_unido[columnas_conceptos] = df_unido[columnas_conceptos].fillna(0.0)
 
         logger.info(f"✅ Legajos unidos: {len(df_unido)}")
         return df_unido
@@ -598,108 +893,62 @@ class SicossProcessor:
         self, df_legajos: pd.DataFrame
     ) -> pd.DataFrame:
         """
-        🔧 PASO 5: Aplica reglas de negocio específicas de SICOSS
+        🔧 PASO 3: Aplica reglas de negocio específicas de SICOSS
 
-        Mapea las columnas pivotadas a los campos esperados por SICOSS
+        Mapea las columnas pivotadas a los campos esperados por SICOSS.
+        Trabaja sobre el pivot de conceptos (una fila por legajo), antes del JOIN
         """
         logger.info("🔧 Aplicando reglas de negocio de conceptos...")
 
-        # 🎯 MAPEO DE CAMPOS (basado en el PHP original)
+        # 🎯 MAPEO DE CAMPOS (basado en el PHP original): todas las columnas de
+        # tipo presentes de una vez (en 0 si no hubo conceptos de ese tipo) y
+        # renombradas a su campo SICOSS, sin copiar columna por columna
+        columnas_tipo = [*CAMPOS_POR_TIPO_SICOSS, "OTROS"]
+        df_legajos = df_legajos.reindex(
+            columns=df_legajos.columns.union(columnas_tipo, sort=False),
+            fill_value=0.0,
+        ).rename(columns=CAMPOS_POR_TIPO_SICOSS)
 
-        # SAC - Sueldo Anual Complementario
-        df_legajos["ImporteSAC"] = df_legajos.get("SAC", 0.0)
-        df_legajos["SACInvestigador"] = df_legajos.get("SAC_INVESTIGADOR", 0.0)
-        df_legajos["ImporteSACDoce"] = df_legajos[
-            "ImporteSAC"
-        ]  # Por defecto igual al SAC
-
-        # Horas Extras
-        df_legajos["ImporteHorasExtras"] = df_legajos.get("HORAS_EXTRAS", 0.0)
-        df_legajos["CantidadHorasExtras"] = df_legajos.get("CantidadHORAS_EXTRAS", 0.0)
-
-        # Otros conceptos
-        df_legajos["ImporteZonaDesfavorable"] = df_legajos.get("ZONA_DESFAVORABLE", 0.0)
-        df_legajos["ImporteVacaciones"] = df_legajos.get("VACACIONES", 0.0)
-        df_legajos["ImportePremios"] = df_legajos.get("PREMIOS", 0.0)
-        df_legajos["ImporteAdicionales"] = df_legajos.get("ADICIONALES", 0.0)
-        df_legajos["ImporteNoRemun"] = df_legajos.get("NO_REMUNERATIVO", 0.0)
-        df_legajos["ImporteImponibleBecario"] = df_legajos.get("BECARIOS", 0.0)
+        # SAC docente: por defecto igual al SAC
+        df_legajos["ImporteSACDoce"] = df_legajos["ImporteSAC"]
 
         # Campos adicionales requeridos por SICOSS
         df_legajos["ImporteMaternidad"] = 0.0  # Se calcula en otro proceso
         df_legajos["ImporteRectificacionRemun"] = 0.0
-        df_legajos["IncrementoSolidario"] = df_legajos.get("INCREMENTO_SOLIDARIO", 0.0)
-        df_legajos["NoRemun4y8"] = df_legajos.get("NO_REMUN_4Y8", 0.0)
-        df_legajos["ImporteTipo91"] = df_legajos.get("TIPO_91", 0.0)
-        df_legajos["ImporteNoRemun96"] = df_legajos.get("NO_REMUN_96", 0.0)
-
-        # 🎯 CÁLCULOS DERIVADOS (lógica del PHP original)
-        # Remuneración tipo C (conceptos remunerativos)
-        df_legajos["Remuner78805"] = (
-            df_legajos["ImporteSAC"]
-            + df_legajos["ImporteHorasExtras"]
-            + df_legajos["ImporteZonaDesfavorable"]
-            + df_legajos["ImporteVacaciones"]
-            + df_legajos["ImportePremios"]
-            + df_legajos["ImporteAdicionales"]
-            + df_legajos.get("OTROS", 0.0)  # Otros conceptos remunerativos
-        )
-
-        # Asignaciones familiares (tipo F)
-        df_legajos["AsignacionesFliaresPagadas"] = df_legajos.get(
-            "ASIGNACIONES_FAMILIARES", 0.0
-        )
-
-        # Importe imponible patronal base
-        df_legajos["ImporteImponiblePatronal"] = df_legajos["Remuner78805"]
 
-        # 🔍 VALIDACIONES Y AJUSTES
-
-        # Si tiene becarios, sumar al imponible
-        mask_becarios = df_legajos["ImporteImponibleBecario"] > 0
-        df_legajos.loc[mask_becarios, "ImporteImponiblePatronal"] += df_legajos.loc[
-            mask_becarios, "ImporteImponibleBecario"
-        ]
-        df_legajos.loc[mask_becarios, "Remuner78805"] += df_legajos.loc[
-            mask_becarios, "ImporteImponibleBecario"
-        ]
-
-        # Ajustar SAC si hay investigadores
-        mask_investigadores = df_legajos["SACInvestigador"] > 0
-        df_legajos.loc[mask_investigadores, "ImporteSAC"] = (
-            df_legajos.loc[mask_investigadores, "ImporteSAC"]
-            - df_legajos.loc[mask_investigadores, "SACInvestigador"]
+        # 🎯 CÁLCULOS DERIVADOS (lógica del PHP original) en una sola pasada
+        # sobre los arrays de importes
+        def importes(columna: str) -> np.ndarray:
+            return df_legajos[columna].to_numpy(dtype=np.float64)
+
+        remuner, importe_sac = _calcular_remuneraciones_conceptos(
+            importes("ImporteSAC"),
+            importes("ImporteHorasExtras"),
+            importes("ImporteZonaDesfavorable"),
+            importes("ImporteVacaciones"),
+            importes("ImportePremios"),
+            importes("ImporteAdicionales"),
+            importes("OTROS"),  # Otros conceptos remunerativos
+            importes("ImporteImponibleBecario"),
+            importes("SACInvestigador"),
         )
 
-        # 🧹 LIMPIAR COLUMNAS TEMPORALES
-        columnas_a_eliminar = [
-            col
-            for col in df_legajos.columns
-            if col
-            in [
-                "SAC",
-                "HORAS_EXTRAS",
-                "ZONA_DESFAVORABLE",
-                "VACACIONES",
-                "PREMIOS",
-                "ADICIONALES",
-                "NO_REMUNERATIVO",
-                "BECARIOS",
-                "SAC_INVESTIGADOR",
-                "CantidadHORAS_EXTRAS",
-                "OTROS",
-            ]
-        ]
-
-        df_legajos.drop(columns=columnas_a_eliminar, errors="ignore", inplace=True)
+        # 🧹 LIMPIAR COLUMNAS TEMPORALES (OTROS sólo suma a Remuner78805)
+        df_legajos = df_legajos.assign(
+            Remuner78805=remuner,
+            ImporteImponiblePatronal=remuner,
+            ImporteSAC=importe_sac,
+        ).drop(columns="OTROS")
 
         logger.info("✅ Reglas de negocio aplicadas")
-        logger.info(f"📊 Resumen importes:")
-        logger.info(f"  - Remuner78805: ${df_legajos['Remuner78805'].sum():,.2f}")
-        logger.info(f"  - ImporteSAC: ${df_legajos['ImporteSAC'].sum():,.2f}")
-        logger.info(
-            f"  - ImporteHorasExtras: ${df_legajos['ImporteHorasExtras'].sum():,.2f}"
-        )
+        # Las sumas recorren columnas completas: sólo en DEBUG
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"📊 Resumen importes:")
+            logger.debug(f"  - Remuner78805: ${df_legajos['Remuner78805'].sum():,.2f}")
+            logger.debug(f"  - ImporteSAC: ${df_legajos['ImporteSAC'].sum():,.2f}")
+            logger.debug(
+                f"  - ImporteHorasExtras: ${df_legajos['ImporteHorasExtras'].sum():,.2f}"
+            )
 
         return df_legajos
 
@@ -734,10 +983,7 @@ class SicossProcessor:
             "ImporteImponiblePatronal",
         ]
 
-        for campo in campos_conceptos:
-            df_legajos[campo] = 0.0
-
-        return df_legajos
+        return _agregar_campos_en_cero(df_legajos, campos_conceptos)
 
     def _calcular_importes_pandas(
         self, df_legajos: pd.DataFrame, config: Dict
@@ -775,33 +1021,33 @@ class SicossProcessor:
         """
         logger.info("💰 Calculando importes base...")
 
-        # Inicializar diferencias en 0
-        df_legajos["DiferenciaSACImponibleConTope"] = 0.0
-        df_legajos["DiferenciaImponibleConTope"] = 0.0
-
-        # SAC Patronal = SAC inicial
-        df_legajos["ImporteSACPatronal"] = df_legajos["ImporteSAC"]
-
-        # Imponible sin SAC
-        df_legajos["ImporteImponibleSinSAC"] = (
-            df_legajos["ImporteImponiblePatronal"] - df_legajos["ImporteSACPatronal"]
-        )
-
-        # 🎯 IMPORTE_BRUTO (clave para SICOSS)
-        df_legajos["IMPORTE_BRUTO"] = (
-            df_legajos["ImporteImponiblePatronal"] + df_legajos["ImporteNoRemun"]
+        importe_imponible_patronal = df_legajos["ImporteImponiblePatronal"].to_numpy()
+        importe_sac = df_legajos["ImporteSAC"].to_numpy()
+
+        # 🚀 Todas las columnas derivadas en un único assign
+        df_legajos = df_legajos.assign(
+            # Inicializar diferencias en 0
+            DiferenciaSACImponibleConTope=0.0,
+            DiferenciaImponibleConTope=0.0,
+            # SAC Patronal = SAC inicial
+            ImporteSACPatronal=importe_sac,
+            # Imponible sin SAC
+            ImporteImponibleSinSAC=importe_imponible_patronal - importe_sac,
+            # 🎯 IMPORTE_BRUTO (clave para SICOSS)
+            IMPORTE_BRUTO=importe_imponible_patronal
+            + df_legajos["ImporteNoRemun"].to_numpy(),
+            # 🎯 IMPORTE_IMPON inicial
+            IMPORTE_IMPON=df_legajos["Remuner78805"].to_numpy(),
         )
 
-        # 🎯 IMPORTE_IMPON inicial
-        df_legajos["IMPORTE_IMPON"] = df_legajos["Remuner78805"]
-
-        logger.info(f"✅ Importes base calculados:")
-        logger.info(
-            f"  - IMPORTE_BRUTO total: ${df_legajos['IMPORTE_BRUTO'].sum():,.2f}"
-        )
-        logger.info(
-            f"  - IMPORTE_IMPON total: ${df_legajos['IMPORTE_IMPON'].sum():,.2f}"
-        )
+        logger.info(f"✅ Importes base calculados")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                f"  - IMPORTE_BRUTO total: ${df_legajos['IMPORTE_BRUTO'].sum():,.2f}"
+            )
+            logger.debug(
+                f"  - IMPORTE_IMPON total: ${df_legajos['IMPORTE_IMPON'].sum():,.2f}"
+            )
 
         return df_legajos
 
@@ -819,6 +1065,13 @@ class SicossProcessor:
         """
         logger.info("🎯 Aplicando topes con pandas...")
 
+        # Sin truncar topes ningún paso modifica importes e IMPORTE_BRUTO ya vale
+        # ImporteImponiblePatronal + ImporteNoRemun desde los importes base. Los
+        # métodos de cada tope conservan su propio chequeo para uso individual
+        if not config["trunca_tope"]:
+            logger.info("ℹ️ Topes desactivados en configuración")
+            return df_legajos
+
         # 📊 PASO 1: Aplicar topes patronales (SAC + Imponible)
         df_legajos = self._aplicar_topes_patronales_pandas(df_legajos, config)
 
@@ -860,39 +1113,45 @@ class SicossProcessor:
             "AsignacionesFliaresPagadas",
         ]
 
-        # Sumar todos los campos de importes por fila
-        suma_importes = df_legajos[campos_importes].abs().sum(axis=1)
-        mask_importes_validos = suma_importes > 0
+        # Algún importe distinto de cero por fila (equivale a suma de absolutos > 0
+        # sin contar NaN), reducido sobre un único bloque numpy 2-D
+        importes = df_legajos[campos_importes].to_numpy(dtype=np.float64)
+        mask_importes_validos = (np.abs(importes) > 0).any(axis=1)
 
         # Máscara 2: Situaciones especiales (maternidad)
-        mask_situaciones_especiales = df_legajos["codigosituacion"].isin([5, 11])
+        codigosituacion = df_legajos["codigosituacion"].to_numpy()
+        mask_situaciones_especiales = np.isin(codigosituacion, [5, 11])
 
         # Máscara 3: Check licencias (si está activado)
-        mask_licencias = False
         if datos.get("check_lic", False):
-            mask_licencias = df_legajos["licencia"] == 1
+            mask_licencias = df_legajos["licencia"].to_numpy() == 1
+        else:
+            mask_licencias = np.zeros(len(df_legajos), dtype=bool)
 
         # Máscara 4: Situación reserva de puesto
-        mask_reserva_puesto = df_legajos["codigosituacion"] == 14
-
-        # 🔗 COMBINAR TODAS LAS MÁSCARAS con OR lógico
-        mask_legajos_validos = (
-            mask_importes_validos
-            | mask_situaciones_especiales
-            | mask_licencias
-            | mask_reserva_puesto
+        mask_reserva_puesto = codigosituacion == 14
+
+        # 🔗 COMBINAR TODAS LAS MÁSCARAS con OR lógico (arrays numpy bool, una pasada)
+        mask_legajos_validos = np.logical_or.reduce(
+            [
+                mask_importes_validos,
+                mask_situaciones_especiales,
+                mask_licencias,
+                mask_reserva_puesto,
+            ]
         )
 
-        # 🎯 FILTRAR DataFrame usando la máscara combinada
-        df_legajos_validos = df_legajos[mask_legajos_validos].copy()
+        # 🎯 FILTRAR DataFrame usando la máscara combinada (el filtro booleano ya
+        # devuelve un DataFrame nuevo y totales/archivo/registros sólo lo leen:
+        # un .copy() extra duplicaría todo el bloque de legajos válidos)
+        df_legajos_validos = df_legajos[mask_legajos_validos]
 
         logger.info(f"✅ Validación completada:")
-        logger.info(f"  - Con importes válidos: {mask_importes_validos.sum()}")
-        logger.info(f"  - Situaciones especiales: {mask_situaciones_especiales.sum()}")
-        logger.info(
-            f"  - Con licencias: {mask_licencias.sum() if isinstance(mask_licencias, pd.Series) else 0}"
-        )
-        logger.info(f"  - Reserva de puesto: {mask_reserva_puesto.sum()}")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(f"  - Con importes válidos: {mask_importes_validos.sum()}")
+            logger.info(f"  - Situaciones especiales: {mask_situaciones_especiales.sum()}")
+            logger.info(f"  - Con licencias: {mask_licencias.sum()}")
+            logger.info(f"  - Reserva de puesto: {mask_reserva_puesto.sum()}")
         logger.info(f"  - TOTAL VÁLIDOS: {len(df_legajos_validos)}/{len(df_legajos)}")
 
         return df_legajos_validos
@@ -911,46 +1170,37 @@ class SicossProcessor:
         if df_legajos.empty:
             return self._inicializar_totales()
 
-        # 🚀 OPERACIÓN VECTORIZADA: Sumar todas las columnas a la vez
-        totales = {
-            "bruto": df_legajos["IMPORTE_BRUTO"].sum(),
-            "imponible_1": df_legajos["IMPORTE_IMPON"].sum(),
-            "imponible_2": df_legajos["ImporteImponiblePatronal"].sum(),
-            "imponible_4": df_legajos["ImporteImponible_4"].sum(),
-            "imponible_5": df_legajos.get("ImporteImponible_5", pd.Series([0])).sum(),
-            "imponible_6": df_legajos["ImporteImponible_6"].sum(),
-            "imponible_8": df_legajos.get("Remuner78805", pd.Series([0])).sum(),
-            "imponible_9": df_legajos["importeimponible_9"].sum(),
-        }
+        # 🚀 OPERACIÓN VECTORIZADA: Sumar todas las columnas a la vez sobre un
+        # bloque 2-D. En orden Fortran cada columna es contigua y nansum suma
+        # igual que Series.sum (mismo orden de suma, NaN como 0). Todas las
+        # columnas existen: Remuner78805 sale de la sumarización de conceptos (o
+        # de los campos de conceptos vacíos) e ImporteImponible_5 de los importes
+        # imponibles, así que no hay valores por defecto que resolver aquí
+        importes = np.asfortranarray(
+            df_legajos[list(COLUMNAS_TOTALES.values())].to_numpy(dtype=np.float64)
+        )
+        sumas = np.nansum(importes, axis=0).tolist()
 
         # Redondear todos los valores
-        totales = {k: round(v, 2) for k, v in totales.items()}
+        totales = {k: round(v, 2) for k, v in zip(COLUMNAS_TOTALES, sumas)}
 
         logger.info(f"✅ Totales calculados: {totales}")
         return totales
 
     def _grabar_en_txt_pandas(self, df_legajos: pd.DataFrame, nombre_arch: str):
         """
-        💾 MÉTODO IMPLEMENTADO: Graba archivo usando pandas.iterrows()
+        💾 MÉTODO IMPLEMENTADO: Graba el archivo SICOSS con las líneas ya formateadas
 
         Reemplaza el bucle PHP de escritura de archivo
         """
         logger.info(f"💾 Grabando archivo: {nombre_arch}")
 
-        import os
-
-        # Crear directorio si no existe
-        directorio = "storage/comunicacion/sicoss"
-        os.makedirs(directorio, exist_ok=True)
-
-        archivo_path = f"{directorio}/{nombre_arch}.txt"
+        archivo_path = self._ruta_archivo_salida(nombre_arch)
 
         try:
-            with open(archivo_path, "w", encoding="latin1") as archivo:
-                # 🔄 Iterar sobre el DataFrame (más eficiente que bucle manual)
-                for idx, legajo in df_legajos.iterrows():
-                    linea = self._formatear_linea_sicoss(legajo)
-                    archivo.write(linea + "\r\n")
+            with self._abrir_archivo_salida(archivo_path) as archivo:
+                for tramo in self._codificar_lineas_sicoss(df_legajos):
+                    archivo.write(tramo)
 
             logger.info(f"✅ Archivo grabado exitosamente: {archivo_path}")
             logger.info(f"📊 Registros escritos: {len(df_legajos)}")
@@ -959,30 +1209,74 @@ class SicossProcessor:
             logger.error(f"❌ Error grabando archivo: {e}")
             raise
 
-    def _formatear_linea_sicoss(self, legajo: pd.Series) -> str:
+    def _codificar_lineas_sicoss(self, df_legajos: pd.DataFrame) -> Iterator[bytes]:
+        """
+        🔧 HELPER: Devuelve las líneas del TXT codificadas, en tramos de
+        LINEAS_POR_ESCRITURA líneas
+
+        🚀 OPERACIÓN VECTORIZADA: todas las líneas se arman por columna (sin
+        iterrows ni un format por fila). Cada tramo se codifica a latin1 una vez,
+        para escribirse en binario sin traducción de fin de línea (CRLF exacto)
+        """
+        lineas = self._formatear_lineas_sicoss(df_legajos).tolist()
+        for inicio in range(0, len(lineas), LINEAS_POR_ESCRITURA):
+            tramo = lineas[inicio : inicio + LINEAS_POR_ESCRITURA]
+            yield ("\r\n".join(tramo) + "\r\n").encode("latin1")
+
+    def _ruta_archivo_salida(self, nombre_arch: str) -> str:
+        """
+        🔧 HELPER: Ruta del TXT de nombre_arch en el directorio de salida
         """
-        🔧 HELPER: Formatea una línea del archivo SICOSS
+        return f"{self.directorio_salida}/{nombre_arch}.txt"
 
-        Reemplaza la concatenación manual del PHP
+    def _abrir_archivo_salida(self, archivo_path: str):
         """
+        🔧 HELPER: Abre el archivo de salida en binario
+
+        El directorio de salida se crea sólo si todavía no existe (al fallar la
+        apertura), sin un makedirs por cada archivo grabado
+        """
+        try:
+            return open(archivo_path, "wb")
+        except FileNotFoundError:
+            os.makedirs(self.directorio_salida, exist_ok=True)
+            return open(archivo_path, "wb")
+
+    def _formatear_lineas_sicoss(self, df_legajos: pd.DataFrame) -> pd.Series:
+        """
+        🔧 HELPER: Formatea las líneas del archivo SICOSS, una por legajo
+
+        Reemplaza la concatenación manual del PHP. Cada campo se formatea una vez
+        para toda la columna (mismo texto que str/ljust/zfill sobre cada valor).
+        """
+
+        def campo(nombre: str, defecto) -> pd.Series:
+            if nombre in df_legajos.columns:
+                return df_legajos[nombre]
+            return pd.Series(defecto, index=df_legajos.index)
+
+        def texto(nombre: str, defecto) -> pd.Series:
+            # map(str) conserva el texto de cada valor (también 'nan' para nulos)
+            return campo(nombre, defecto).astype(object).map(str).astype(str)
+
         # Esta es una versión simplificada - necesitarás implementar
         # todo el formateo según las especificaciones SICOSS
         return (
-            f"{legajo.get('cuit', '00000000000')}"
-            f"{self._llenar_blancos(str(legajo.get('apyno', '')), 30)}"
-            f"{legajo.get('conyugue', 0)}"
-            f"{self._llenar_importes(legajo.get('hijos', 0), 2)}"
-            f"{self._llenar_importes(legajo.get('codigosituacion', 0), 2)}"
+            texto("cuit", "00000000000")
+            + self._llenar_blancos_columna(texto("apyno", ""), 30)
+            + texto("conyugue", 0)
+            + self._llenar_importes_columna(campo("hijos", 0), 2)
+            + self._llenar_importes_columna(campo("codigosituacion", 0), 2)
             # ... Resto del formateo según especificaciones
         )
 
-    def _llenar_blancos(self, texto: str, longitud: int) -> str:
-        """🔧 HELPER: Llena con blancos a la derecha"""
-        return texto.ljust(longitud)[:longitud]
+    def _llenar_blancos_columna(self, textos: pd.Series, longitud: int) -> pd.Series:
+        """🔧 HELPER: Llena con blancos a la derecha (y corta en longitud)"""
+        return textos.str.ljust(longitud).str[:longitud]
 
-    def _llenar_importes(self, valor: float, longitud: int) -> str:
-        """🔧 HELPER: Formatea importes con ceros a la izquierda"""
-        return str(int(valor)).zfill(longitud)
+    def _llenar_importes_columna(self, valores: pd.Series, longitud: int) -> pd.Series:
+        """🔧 HELPER: Formatea enteros con ceros a la izquierda"""
+        return valores.astype("int64").astype(str).str.zfill(longitud)
 
     def _calcular_importes_imponibles_pandas(
         self, df_legajos: pd.DataFrame, config: Dict
@@ -1008,56 +1302,58 @@ class SicossProcessor:
 
         # 🎯 ImporteImponible_6 (lógica compleja del PHP)
         # Si hay importe imponible 6 previo, calcularlo proporcionalmente
-        mask_tiene_imp6 = df_legajos["ImporteImponible_6"] > 0
+        imp6 = df_legajos["ImporteImponible_6"].to_numpy(dtype=np.float64)
+        mask_tiene_imp6 = imp6 > 0
 
         if mask_tiene_imp6.any():
-            # Calcular proporción (lógica del PHP líneas 1450-1480)
-            df_legajos.loc[mask_tiene_imp6, "ImporteImponible_6"] = (
-                (df_legajos.loc[mask_tiene_imp6, "ImporteImponible_6"] * 100)
-                / df_legajos.loc[mask_tiene_imp6, "PorcAporteDiferencialJubilacion"]
-            ).round(2)
-
-            # Determinar tipo de operación basado en diferencias
-            diferencia = abs(
-                df_legajos.loc[mask_tiene_imp6, "ImporteImponible_6"]
-                - df_legajos.loc[mask_tiene_imp6, "IMPORTE_IMPON"]
-            )
+            # 🚀 OPERACIÓN VECTORIZADA: todas las máscaras salen de una pasada sobre
+            # arrays y cada columna se asigna una sola vez (sin cadenas .loc)
+            importe_impon = df_legajos["IMPORTE_IMPON"].to_numpy(dtype=np.float64)
+            importe_sac = df_legajos["ImporteSAC"].to_numpy(dtype=np.float64)
 
-            # Máscara para operación tipo 2 (diferencia > 5 y menor que IMPORTE_IMPON)
-            mask_tipo2 = (diferencia > 5) & (
-                df_legajos.loc[mask_tiene_imp6, "ImporteImponible_6"]
-                < df_legajos.loc[mask_tiene_imp6, "IMPORTE_IMPON"]
+            # Calcular proporción (lógica del PHP líneas 1450-1480)
+            imp6 = np.where(
+                mask_tiene_imp6,
+                np.round(
+                    (imp6 * 100)
+                    / df_legajos["PorcAporteDiferencialJubilacion"].to_numpy(
+                        dtype=np.float64
+                    ),
+                    2,
+                ),
+                imp6,
             )
 
-            # Aplicar tipo de operación 2
-            indices_tipo2 = df_legajos.loc[mask_tiene_imp6].loc[mask_tipo2].index
-            df_legajos.loc[indices_tipo2, "TipoDeOperacion"] = 2
-            df_legajos.loc[indices_tipo2, "IMPORTE_IMPON"] = (
-                df_legajos.loc[indices_tipo2, "IMPORTE_IMPON"]
-                - df_legajos.loc[indices_tipo2, "ImporteImponible_6"]
-            )
-            df_legajos.loc[indices_tipo2, "ImporteSACNoDocente"] = (
-                df_legajos.loc[indices_tipo2, "ImporteSAC"]
-                - df_legajos.loc[indices_tipo2, "SACInvestigador"]
-            )
+            # Determinar tipo de operación basado en diferencias
+            diferencia = np.abs(imp6 - importe_impon)
 
-            # Aplicar tipo de operación 1 (casos restantes)
-            mask_tipo1 = ~mask_tipo2
-            indices_tipo1 = df_legajos.loc[mask_tiene_imp6].loc[mask_tipo1].index
+            # Tipo de operación 2 (diferencia > 5 y menor que IMPORTE_IMPON);
+            # tipo 1 el resto de los que tienen imponible 6
+            mask_tipo2 = mask_tiene_imp6 & (diferencia > 5) & (imp6 < importe_impon)
+            mask_tipo1 = mask_tiene_imp6 & ~mask_tipo2
 
             # Ajustar ImporteImponible_6 si está en rango de tolerancia (±5)
-            mask_tolerancia = diferencia <= 5
-            indices_tolerancia = (
-                df_legajos.loc[mask_tiene_imp6].loc[mask_tolerancia].index
+            mask_tolerancia = mask_tiene_imp6 & (diferencia <= 5)
+
+            tipo_de_operacion = df_legajos["TipoDeOperacion"].to_numpy(copy=True)
+            tipo_de_operacion[mask_tipo2] = 2
+            tipo_de_operacion[mask_tipo1] = 1
+
+            # Los legajos sin imponible 6 conservan TipoDeOperacion y SAC No Docente en 0
+            sac_no_docente = np.where(mask_tipo1, importe_sac, 0.0)
+            np.subtract(
+                importe_sac,
+                df_legajos["SACInvestigador"].to_numpy(dtype=np.float64),
+                out=sac_no_docente,
+                where=mask_tipo2,
             )
-            df_legajos.loc[indices_tolerancia, "ImporteImponible_6"] = df_legajos.loc[
-                indices_tolerancia, "IMPORTE_IMPON"
-            ]
 
-            df_legajos.loc[indices_tipo1, "TipoDeOperacion"] = 1
-            df_legajos.loc[indices_tipo1, "ImporteSACNoDocente"] = df_legajos.loc[
-                indices_tipo1, "ImporteSAC"
-            ]
+            df_legajos = df_legajos.assign(
+                ImporteImponible_6=np.where(mask_tolerancia, importe_impon, imp6),
+                IMPORTE_IMPON=np.where(mask_tipo2, importe_impon - imp6, importe_impon),
+                ImporteSACNoDocente=sac_no_docente,
+                TipoDeOperacion=tipo_de_operacion,
+            )
 
         else:
             # Si no hay ImporteImponible_6 previo
@@ -1120,18 +1416,22 @@ class SicossProcessor:
 
         # Si es positivo, restar incremento solidario
         mask_positivo = df_legajos["ImporteSueldoMasAdicionales"] > 0
-        df_legajos.loc[mask_positivo, "ImporteSueldoMasAdicionales"] -= df_legajos.loc[
-            mask_positivo, "IncrementoSolidario"
-        ]
+        _restar_en_mascara(
+            df_legajos,
+            "ImporteSueldoMasAdicionales",
+            "IncrementoSolidario",
+            mask_positivo,
+        )
 
         # Configurar trabajador convencionado si no está definido
-        mask_sin_convencionado = df_legajos["trabajadorconvencionado"].isna()
+        # (fillna reasigna la columna una vez, sin máscara ni escritura .loc)
         if self.trabajador_convencionado is not None:
-            df_legajos.loc[mask_sin_convencionado, "trabajadorconvencionado"] = (
-                self.trabajador_convencionado
-            )
+            convencionado_por_defecto = self.trabajador_convencionado
         else:
-            df_legajos.loc[mask_sin_convencionado, "trabajadorconvencionado"] = "S"
+            convencionado_por_defecto = "S"
+        df_legajos["trabajadorconvencionado"] = df_legajos[
+            "trabajadorconvencionado"
+        ].fillna(convencionado_por_defecto)
 
         logger.info("✅ Sueldo más adicionales calculado")
         return df_legajos
@@ -1150,23 +1450,22 @@ class SicossProcessor:
 
         # 🚀 TOPE SAC PATRONAL
         tope_sac_patronal = config["tope_sac_jubilatorio_patr"]
-        mask_excede_sac = df_legajos["ImporteSAC"] > tope_sac_patronal
+        # Calcular diferencia (sólo en los legajos que exceden el tope)
+        mask_excede_sac = _excedente_sobre_tope(
+            df_legajos, "ImporteSAC", tope_sac_patronal, "DiferenciaSACImponibleConTope"
+        )
 
         if mask_excede_sac.any():
-            logger.info(f"⚠️ {mask_excede_sac.sum()} legajos exceden tope SAC patronal")
-
-            # Calcular diferencia
-            df_legajos.loc[mask_excede_sac, "DiferenciaSACImponibleConTope"] = (
-                df_legajos.loc[mask_excede_sac, "ImporteSAC"] - tope_sac_patronal
-            )
-
-            # Ajustar importes
-            df_legajos.loc[mask_excede_sac, "ImporteImponiblePatronal"] = pd.to_numeric(
-                df_legajos.loc[mask_excede_sac, "ImporteImponiblePatronal"],
-                errors="coerce",
-            ) - pd.to_numeric(
-                df_legajos.loc[mask_excede_sac, "DiferenciaSACImponibleConTope"],
-                errors="coerce",
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(f"⚠️ {mask_excede_sac.sum()} legajos exceden tope SAC patronal")
+
+            # Ajustar importes (ambas columnas ya son float64: el imponible sale de
+            # la sumarización de conceptos y la diferencia de _excedente_sobre_tope)
+            _restar_en_mascara(
+                df_legajos,
+                "ImporteImponiblePatronal",
+                "DiferenciaSACImponibleConTope",
+                mask_excede_sac,
             )
             df_legajos.loc[mask_excede_sac, "ImporteSACPatronal"] = tope_sac_patronal
 
@@ -1178,25 +1477,27 @@ class SicossProcessor:
             df_legajos["ImporteImponiblePatronal"] - df_legajos["ImporteSACPatronal"]
         )
 
-        mask_excede_imponible = (
-            df_legajos["ImporteImponibleSinSAC"] > tope_jubilatorio_patronal
+        # Calcular diferencia
+        mask_excede_imponible = _excedente_sobre_tope(
+            df_legajos,
+            "ImporteImponibleSinSAC",
+            tope_jubilatorio_patronal,
+            "DiferenciaImponibleConTope",
         )
 
         if mask_excede_imponible.any():
-            logger.info(
-                f"⚠️ {mask_excede_imponible.sum()} legajos exceden tope imponible patronal"
-            )
-
-            # Calcular diferencia
-            df_legajos.loc[mask_excede_imponible, "DiferenciaImponibleConTope"] = (
-                df_legajos.loc[mask_excede_imponible, "ImporteImponibleSinSAC"]
-                - tope_jubilatorio_patronal
-            )
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(
+                    f"⚠️ {mask_excede_imponible.sum()} legajos exceden tope imponible patronal"
+                )
 
             # Ajustar importe patronal
-            df_legajos.loc[
-                mask_excede_imponible, "ImporteImponiblePatronal"
-            ] -= df_legajos.loc[mask_excede_imponible, "DiferenciaImponibleConTope"]
+            _restar_en_mascara(
+                df_legajos,
+                "ImporteImponiblePatronal",
+                "DiferenciaImponibleConTope",
+                mask_excede_imponible,
+            )
 
         logger.info("✅ Topes patronales aplicados")
         return df_legajos
@@ -1225,9 +1526,10 @@ class SicossProcessor:
         )
 
         if mask_excede_personal_con_sac.any():
-            logger.info(
-                f"⚠️ {mask_excede_personal_con_sac.sum()} legajos exceden tope personal con SAC"
-            )
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(
+                    f"⚠️ {mask_excede_personal_con_sac.sum()} legajos exceden tope personal con SAC"
+                )
 
             df_legajos.loc[
                 mask_excede_personal_con_sac, "DiferenciaSACImponibleConTope"
@@ -1236,11 +1538,12 @@ class SicossProcessor:
                 - tope_sac_personal
             )
 
-            df_legajos.loc[
-                mask_excede_personal_con_sac, "IMPORTE_IMPON"
-            ] -= df_legajos.loc[
-                mask_excede_personal_con_sac, "DiferenciaSACImponibleConTope"
-            ]
+            _restar_en_mascara(
+                df_legajos,
+                "IMPORTE_IMPON",
+                "DiferenciaSACImponibleConTope",
+                mask_excede_personal_con_sac,
+            )
 
             df_legajos.loc[mask_excede_personal_con_sac, "ImporteSACNoDocente"] = (
                 tope_sac_personal
@@ -1252,32 +1555,30 @@ class SicossProcessor:
             mask_aplicar_topes_complejos = ~mask_excede_personal_con_sac
 
             if mask_aplicar_topes_complejos.any():
-                # Calcular componentes para tope complejo
-                bruto_nodo_sin_sac = (
-                    df_legajos.loc[mask_aplicar_topes_complejos, "IMPORTE_BRUTO"]
-                    - df_legajos.loc[mask_aplicar_topes_complejos, "ImporteImponible_6"]
-                    - df_legajos.loc[
-                        mask_aplicar_topes_complejos, "ImporteSACNoDocente"
-                    ]
+                # 🚀 OPERACIÓN VECTORIZADA: componentes del tope complejo sobre
+                # arrays float64 de la columna completa (sin gather/scatter .loc)
+                sac = df_legajos["ImporteSACNoDocente"].to_numpy(dtype=np.float64)
+                importe_con_topes = np.subtract(
+                    df_legajos["IMPORTE_BRUTO"].to_numpy(dtype=np.float64),
+                    df_legajos["ImporteImponible_6"].to_numpy(dtype=np.float64),
                 )
-
-                sac = df_legajos.loc[
-                    mask_aplicar_topes_complejos, "ImporteSACNoDocente"
-                ]
+                importe_con_topes -= sac
+                importe_con_topes -= df_legajos["ImporteNoRemun"].to_numpy(dtype=np.float64)
 
                 # Aplicar topes por componente
-                tope_sueldo = np.minimum(
-                    bruto_nodo_sin_sac
-                    - df_legajos.loc[mask_aplicar_topes_complejos, "ImporteNoRemun"],
-                    tope_jubil_personal_base,
-                )
-
-                tope_sac = np.minimum(sac, tope_sac_personal)
+                np.minimum(importe_con_topes, tope_jubil_personal_base, out=importe_con_topes)
+                importe_con_topes += np.minimum(sac, tope_sac_personal)
 
-                # Asignar IMPORTE_IMPON calculado
-                df_legajos.loc[mask_aplicar_topes_complejos, "IMPORTE_IMPON"] = (
-                    tope_sueldo + tope_sac
+                # Asignar IMPORTE_IMPON calculado (sólo en la máscara)
+                importe_impon = df_legajos["IMPORTE_IMPON"].to_numpy(
+                    dtype=np.float64, copy=True
                 )
+                np.copyto(
+                    importe_impon,
+                    importe_con_topes,
+                    where=mask_aplicar_topes_complejos.to_numpy(),
+                )
+                df_legajos["IMPORTE_IMPON"] = importe_impon
 
             logger.info("✅ Topes personales aplicados")
             return df_legajos
@@ -1299,25 +1600,27 @@ class SicossProcessor:
 
         # 🚀 TOPE SAC OTROS APORTES
         tope_sac_otro_aporte = config["tope_sac_jubilatorio_otro_ap"]
-        mask_excede_sac_otro = df_legajos["ImporteSACOtroAporte"] > tope_sac_otro_aporte
+        mask_excede_sac_otro = _excedente_sobre_tope(
+            df_legajos,
+            "ImporteSACOtroAporte",
+            tope_sac_otro_aporte,
+            "DifSACImponibleConOtroTope",
+        )
 
         if mask_excede_sac_otro.any():
-            logger.info(
-                f"⚠️ {mask_excede_sac_otro.sum()} legajos exceden tope SAC otros aportes"
-            )
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(
+                    f"⚠️ {mask_excede_sac_otro.sum()} legajos exceden tope SAC otros aportes"
+                )
 
-            df_legajos.loc[mask_excede_sac_otro, "DifSACImponibleConOtroTope"] = (
-                df_legajos.loc[mask_excede_sac_otro, "ImporteSACOtroAporte"]
-                - tope_sac_otro_aporte
+            _restar_en_mascara(
+                df_legajos,
+                "ImporteImponible_4",
+                "DifSACImponibleConOtroTope",
+                mask_excede_sac_otro,
             )
 
-            df_legajos.loc[
-                mask_excede_sac_otro, "ImporteImponible_4"
-            ] -= df_legajos.loc[mask_excede_sac_otro, "DifSACImponibleConOtroTope"]
-
-            df_legajos.loc[mask_excede_sac_otro, "ImporteSACOtroAporte"] = (
-                tope_sac_otro_aporte
-            )
+            _recortar_a_tope(df_legajos, "ImporteSACOtroAporte", tope_sac_otro_aporte)
 
         # 🚀 TOPE OTROS APORTES SIN SAC
         df_legajos["OtroImporteImponibleSinSAC"] = (
@@ -1325,23 +1628,27 @@ class SicossProcessor:
         )
 
         tope_otros_aportes = config["tope_otros_aportes_personales"]
-        mask_excede_otros = (
-            df_legajos["OtroImporteImponibleSinSAC"] > tope_otros_aportes
-        )
+        mask_excede_otros = df_legajos["OtroImporteImponibleSinSAC"].to_numpy() > tope_otros_aportes
 
         if mask_excede_otros.any():
-            logger.info(
-                f"⚠️ {mask_excede_otros.sum()} legajos exceden tope otros aportes"
-            )
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(
+                    f"⚠️ {mask_excede_otros.sum()} legajos exceden tope otros aportes"
+                )
 
-            df_legajos.loc[mask_excede_otros, "DifImporteImponibleConOtroTope"] = (
-                df_legajos.loc[mask_excede_otros, "OtroImporteImponibleSinSAC"]
-                - tope_otros_aportes
+            _excedente_sobre_tope(
+                df_legajos,
+                "OtroImporteImponibleSinSAC",
+                tope_otros_aportes,
+                "DifImporteImponibleConOtroTope",
             )
 
-            df_legajos.loc[mask_excede_otros, "ImporteImponible_4"] -= df_legajos.loc[
-                mask_excede_otros, "DifImporteImponibleConOtroTope"
-            ]
+            _restar_en_mascara(
+                df_legajos,
+                "ImporteImponible_4",
+                "DifImporteImponibleConOtroTope",
+                mask_excede_otros,
+            )
 
         # 🎯 REGLA ESPECIAL: Si ImporteImponible_6 != 0 y TipoDeOperacion == 1, entonces IMPORTE_IMPON = 0
         mask_regla_especial = (df_legajos["ImporteImponible_6"] != 0) & (
@@ -1349,9 +1656,10 @@ class SicossProcessor:
         )
 
         if mask_regla_especial.any():
-            logger.info(
-                f"ℹ️ {mask_regla_especial.sum()} legajos con regla especial IMPORTE_IMPON = 0"
-            )
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(
+                    f"ℹ️ {mask_regla_especial.sum()} legajos con regla especial IMPORTE_IMPON = 0"
+                )
             df_legajos.loc[mask_regla_especial, "IMPORTE_IMPON"] = 0.0
 
         logger.info("✅ Topes de otros aportes aplicados")
@@ -1374,22 +1682,37 @@ class SicossProcessor:
             logger.info("ℹ️ No hay datos de otra actividad")
             return df_legajos
 
-        # 🚀 JOIN con datos de otra actividad
-        df_legajos = df_legajos.merge(
-            df_otra_actividad[
-                ["nro_legaj", "importebrutootraactividad", "importesacotraactividad"]
-            ],
-            on="nro_legaj",
-            how="left",
-        ).fillna({"importebrutootraactividad": 0.0, "importesacotraactividad": 0.0})
-
-        # Renombrar columnas
-        df_legajos.rename(
-            columns={
-                "importebrutootraactividad": "ImporteBrutoOtraActividad",
-                "importesacotraactividad": "ImporteSACOtraActividad",
-            },
-            inplace=True,
+        # Una fila por legajo antes del reindex: los DataFrames armados por el
+        # llamador pueden repetir legajos. Se queda la declaración más reciente
+        # (vig_ano, vig_mes descendentes, igual que la consulta SQL) si vienen
+        # esas columnas, y si no la primera fila de cada legajo
+        if df_otra_actividad["nro_legaj"].duplicated().any():
+            columnas_vigencia = [
+                columna
+                for columna in ("vig_ano", "vig_mes")
+                if columna in df_otra_actividad.columns
+            ]
+            if columnas_vigencia:
+                df_otra_actividad = df_otra_actividad.sort_values(
+                    columnas_vigencia, ascending=False, kind="stable"
+                )
+            df_otra_actividad = df_otra_actividad.drop_duplicates(
+                "nro_legaj", keep="first"
+            )
+
+        # 🚀 Alinear otra actividad al índice nro_legaj de legajos (una fila por
+        # legajo) con reindex y asignar las columnas ya con su nombre final:
+        # sin join, fillna sobre el DataFrame unido ni rename
+        otra_actividad = (
+            df_otra_actividad.set_index("nro_legaj")[
+                ["importebrutootraactividad", "importesacotraactividad"]
+            ]
+            .reindex(df_legajos.index)
+            .fillna(0.0)
+        )
+        df_legajos = df_legajos.assign(
+            ImporteBrutoOtraActividad=otra_actividad["importebrutootraactividad"].to_numpy(),
+            ImporteSACOtraActividad=otra_actividad["importesacotraactividad"].to_numpy(),
         )
 
         # 🎯 APLICAR LÓGICA DE TOPES CON OTRA ACTIVIDAD
@@ -1402,64 +1725,66 @@ class SicossProcessor:
         )
 
         if mask_tiene_otra_actividad.any():
-            logger.info(
-                f"🏢 {mask_tiene_otra_actividad.sum()} legajos con otra actividad"
-            )
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(
+                    f"🏢 {mask_tiene_otra_actividad.sum()} legajos con otra actividad"
+                )
 
-            # 🚀 CASO 1: Si otra actividad excede topes totales, IMPORTE_IMPON = 0
-            suma_otra_actividad = (
-                df_legajos.loc[mask_tiene_otra_actividad, "ImporteBrutoOtraActividad"]
-                + df_legajos.loc[mask_tiene_otra_actividad, "ImporteSACOtraActividad"]
+            # Máscaras sobre el DataFrame completo (sin cadenas .loc[mask].loc[mask2].index)
+            bruto_otra_actividad = df_legajos["ImporteBrutoOtraActividad"].to_numpy(
+                dtype=np.float64
+            )
+            sac_otra_actividad = df_legajos["ImporteSACOtraActividad"].to_numpy(
+                dtype=np.float64
             )
+            tiene_otra_actividad = mask_tiene_otra_actividad.to_numpy()
 
+            # 🚀 CASO 1: Si otra actividad excede topes totales, IMPORTE_IMPON = 0
             tope_total = tope_sac_pers + tope_jubil_patronal
-            mask_excede_total = suma_otra_actividad >= tope_total
+            excede_total = (bruto_otra_actividad + sac_otra_actividad) >= tope_total
+            mask_excede_total = tiene_otra_actividad & excede_total
 
-            indices_excede = (
-                df_legajos.loc[mask_tiene_otra_actividad].loc[mask_excede_total].index
+            importe_impon = df_legajos["IMPORTE_IMPON"].to_numpy(
+                dtype=np.float64, copy=True
             )
-            df_legajos.loc[indices_excede, "IMPORTE_IMPON"] = 0.0
+            importe_impon[mask_excede_total] = 0.0
 
             # 🚀 CASO 2: Calcular topes proporcionales
-            mask_no_excede = ~mask_excede_total
-            indices_no_excede = (
-                df_legajos.loc[mask_tiene_otra_actividad].loc[mask_no_excede].index
-            )
+            mask_no_excede = tiene_otra_actividad & ~excede_total
 
-            if len(indices_no_excede) > 0:
+            if mask_no_excede.any():
                 # Calcular tope disponible para sueldo
                 tope_disponible_sueldo = np.maximum(
-                    tope_jubil_patronal
-                    - df_legajos.loc[indices_no_excede, "ImporteBrutoOtraActividad"],
-                    0.0,
+                    tope_jubil_patronal - bruto_otra_actividad, 0.0
                 )
 
                 # Calcular tope disponible para SAC
-                tope_disponible_sac = np.maximum(
-                    tope_sac_pers
-                    - df_legajos.loc[indices_no_excede, "ImporteSACOtraActividad"],
-                    0.0,
-                )
+                tope_disponible_sac = np.maximum(tope_sac_pers - sac_otra_actividad, 0.0)
 
                 # Aplicar topes al importe actual
                 importe_sueldo_limitado = np.minimum(
-                    df_legajos.loc[indices_no_excede, "ImporteImponibleSinSAC"],
+                    df_legajos["ImporteImponibleSinSAC"].to_numpy(dtype=np.float64),
                     tope_disponible_sueldo,
                 )
 
                 importe_sac_limitado = np.minimum(
-                    df_legajos.loc[indices_no_excede, "ImporteSACPatronal"],
+                    df_legajos["ImporteSACPatronal"].to_numpy(dtype=np.float64),
                     tope_disponible_sac,
                 )
 
-                # Asignar IMPORTE_IMPON calculado
-                df_legajos.loc[indices_no_excede, "IMPORTE_IMPON"] = (
-                    importe_sueldo_limitado + importe_sac_limitado
+                # Asignar IMPORTE_IMPON calculado (sólo donde no excede)
+                np.copyto(
+                    importe_impon,
+                    importe_sueldo_limitado + importe_sac_limitado,
+                    where=mask_no_excede,
                 )
 
-            logger.info(
-                f"✅ Otra actividad procesada: {indices_excede.shape[0]} con tope excedido"
-            )
+            df_legajos["IMPORTE_IMPON"] = importe_impon
+
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(
+                    f"✅ Otra actividad procesada: {mask_excede_total.sum()} con tope excedido"
+                )
 
         else:
             # Si no hay otra actividad, inicializar campos en 0
@@ -1497,7 +1822,10 @@ class SicossProcessor:
         logger.info(f"✅ ART calculado:")
         logger.info(f"  - Con tope: {art_con_tope}")
         logger.info(f"  - Con no remunerativos: {conceptos_no_remun_en_art}")
-        logger.info(f"  - Total ART: ${df_legajos['importeimponible_9'].sum():,.2f}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                f"  - Total ART: ${df_legajos['importeimponible_9'].sum():,.2f}"
+            )
 
         return df_legajos
 
@@ -1511,26 +1839,42 @@ class SicossProcessor:
         """
         logger.info("🔧 Aplicando ajustes finales...")
 
+        # 🚀 OPERACIÓN VECTORIZADA: las sumas de los ajustes 1 a 3 se acumulan en
+        # el lugar sobre arrays float64 y las columnas se asignan en un solo assign
+        def importes(campo: str) -> np.ndarray:
+            return df_legajos[campo].to_numpy(dtype=np.float64)
+
         # 🎯 AJUSTE 1: Sumar conceptos no remunerativos a remuneraciones 4 y 8
-        df_legajos["Remuner78805"] += df_legajos["NoRemun4y8"]
-        df_legajos["ImporteImponible_4"] += df_legajos["NoRemun4y8"]
-        df_legajos["ImporteImponible_4"] += df_legajos["ImporteTipo91"]
+        no_remun_4y8 = importes("NoRemun4y8")
+        remuner_78805 = importes("Remuner78805") + no_remun_4y8
+        importe_imponible_4 = importes("ImporteImponible_4") + no_remun_4y8
+        importe_imponible_4 += importes("ImporteTipo91")
 
         # 🎯 AJUSTE 2: Agregar ImporteNoRemun96 al bruto
-        df_legajos["IMPORTE_BRUTO"] += df_legajos["ImporteNoRemun96"]
+        importe_bruto = importes("IMPORTE_BRUTO") + importes("ImporteNoRemun96")
+
+        ajustes = {
+            "Remuner78805": remuner_78805,
+            "ImporteImponible_4": importe_imponible_4,
+            "IMPORTE_BRUTO": importe_bruto,
+        }
 
         # 🎯 AJUSTE 3: Configurar asignaciones familiares si está activado
         if self.asignacion_familiar:
             logger.info("ℹ️ Sumando asignaciones familiares al bruto")
-            df_legajos["IMPORTE_BRUTO"] += df_legajos["AsignacionesFliaresPagadas"]
-            df_legajos["AsignacionesFliaresPagadas"] = 0.0
+            importe_bruto += importes("AsignacionesFliaresPagadas")
+            ajustes["AsignacionesFliaresPagadas"] = 0.0
+
+        df_legajos = df_legajos.assign(**ajustes)
 
         # 🎯 AJUSTE 4: Configurar seguro de vida obligatorio para licencias
+        # 🚀 OPERACIÓN VECTORIZADA: la columna se asigna entera en una pasada
+        # (1 para licencias si está activado, 0 en el resto)
         if datos.get("seguro_vida_patronal") == 1 and datos.get("check_lic") == 1:
-            mask_licencias = df_legajos["licencia"] == 1
-            df_legajos.loc[mask_licencias, "SeguroVidaObligatorio"] = 1
+            mask_licencias = df_legajos["licencia"].to_numpy() == 1
+            df_legajos["SeguroVidaObligatorio"] = mask_licencias.view(np.int8)
         else:
-            df_legajos["SeguroVidaObligatorio"] = 0
+            df_legajos["SeguroVidaObligatorio"] = np.int8(0)
 
         # 🎯 AJUSTE 5: Inicializar campos faltantes con valores por defecto
         campos_por_defecto = {
@@ -1542,9 +1886,13 @@ class SicossProcessor:
             "IMPORTE_ADICI": 0.0,
         }
 
-        for campo, valor_defecto in campos_por_defecto.items():
-            if campo not in df_legajos.columns:
-                df_legajos[campo] = valor_defecto
+        faltantes = {
+            campo: valor_defecto
+            for campo, valor_defecto in campos_por_defecto.items()
+            if campo not in df_legajos.columns
+        }
+        if faltantes:
+            df_legajos = df_legajos.assign(**faltantes)
 
         logger.info("✅ Ajustes finales aplicados")
         return df_legajos
@@ -1556,124 +1904,65 @@ class SicossProcessor:
 
         Asegura que todos los campos necesarios para el archivo TXT estén presentes
         """
-        logger.info("🔧 Completando campos SICOSS...")
+        # Frame que ya tiene todos los campos con su dtype y sin nulos: no hace
+        # falta repetir rellenos ni conversiones
+        if _campos_sicoss_completos(df_legajos):
+            logger.info("ℹ️ Campos SICOSS ya completados")
+            return df_legajos
 
-        # 📋 LISTA COMPLETA DE CAMPOS SICOSS (basada en grabar_en_txt del PHP)
-        campos_requeridos = {
-            # Campos básicos
-            "cuit": "",
-            "apyno": "",
-            "conyugue": 0,
-            "hijos": 0,
-            "codigosituacion": 1,
-            "codigocondicion": 1,
-            "TipoDeActividad": 0,
-            "codigozona": 0,
-            "aporteadicional": 0.0,
-            "codigocontratacion": 0,
-            "codigo_os": "000000",
-            "adherentes": 0,
-            "regimen": "1",
-            "provincialocalidad": "",
-            # Importes principales
-            "IMPORTE_BRUTO": 0.0,
-            "IMPORTE_IMPON": 0.0,
-            "AsignacionesFliaresPagadas": 0.0,
-            "IMPORTE_VOLUN": 0.0,
-            "IMPORTE_ADICI": 0.0,
-            "ImporteSICOSSDec56119": 0.0,
-            "ImporteImponiblePatronal": 0.0,
-            "ImporteImponible_4": 0.0,
-            "AporteAdicionalObraSocial": 0.0,
-            # Revistas y días
-            "codigorevista1": 1,
-            "fecharevista1": 1,
-            "codigorevista2": 0,
-            "fecharevista2": 0,
-            "codigorevista3": 0,
-            "fecharevista3": 0,
-            "dias_trabajados": 30,
-            # Importes detallados
-            "ImporteSueldoMasAdicionales": 0.0,
-            "ImporteSAC": 0.0,
-            "ImporteHorasExtras": 0.0,
-            "ImporteZonaDesfavorable": 0.0,
-            "ImporteVacaciones": 0.0,
-            "ImporteAdicionales": 0.0,
-            "ImportePremios": 0.0,
-            "ImporteImponible_6": 0.0,
-            "TipoDeOperacion": 1,
-            "CantidadHorasExtras": 0.0,
-            "ImporteNoRemun": 0.0,
-            "ImporteMaternidad": 0.0,
-            "ImporteRectificacionRemun": 0.0,
-            "importeimponible_9": 0.0,
-            "ContribTareaDif": 0.0,
-            "SeguroVidaObligatorio": 0,
-            "ImporteSICOSS27430": 0.0,
-            "IncrementoSolidario": 0.0,
-            "trabajadorconvencionado": "S",
-        }
+        logger.info("🔧 Completando campos SICOSS...")
 
         # 🚀 COMPLETAR CAMPOS FALTANTES CON VALORES POR DEFECTO
-        for campo, valor_defecto in campos_requeridos.items():
-            if campo not in df_legajos.columns:
-                df_legajos[campo] = valor_defecto
-            else:
-                # Rellenar NaN con valor por defecto
-                df_legajos[campo] = df_legajos[campo].fillna(valor_defecto)
+        # Los ausentes se agregan en un solo assign y los NaN de todos los
+        # campos se rellenan con un único fillna por diccionario
+        campos_faltantes = {
+            campo: valor_defecto
+            for campo, valor_defecto in CAMPOS_REQUERIDOS.items()
+            if campo not in df_legajos.columns
+        }
+        df_legajos = df_legajos.assign(**campos_faltantes).fillna(CAMPOS_REQUERIDOS)
 
         # 🎯 VALIDACIONES FINALES
 
-        # Asegurar que los importes sean numéricos
-        campos_numericos = [
+        # Asegurar que los importes sean numéricos. Los que ya lo son quedan sin
+        # NaN tras el fillna de valores por defecto: solo las columnas no
+        # numéricas pasan por to_numeric
+        campos_no_numericos = [
             campo
-            for campo, valor in campos_requeridos.items()
-            if isinstance(valor, (int, float))
+            for campo in CAMPOS_NUMERICOS
+            if not pd.api.types.is_numeric_dtype(df_legajos[campo].dtype)
         ]
+        if campos_no_numericos:
+            df_legajos = df_legajos.assign(
+                **{
+                    campo: pd.to_numeric(df_legajos[campo], errors="coerce").fillna(0.0)
+                    for campo in campos_no_numericos
+                }
+            )
 
-        for campo in campos_numericos:
-            df_legajos[campo] = pd.to_numeric(
-                df_legajos[campo], errors="coerce"
-            ).fillna(0.0)
-
-        # Asegurar que los códigos sean enteros
-        campos_enteros = [
-            "codigosituacion",
-            "codigocondicion",
-            "TipoDeActividad",
-            "codigozona",
-            "codigocontratacion",
-            "adherentes",
-            "hijos",
-            "codigorevista1",
-            "codigorevista2",
-            "codigorevista3",
-            "fecharevista1",
-            "fecharevista2",
-            "fecharevista3",
-            "dias_trabajados",
-            "TipoDeOperacion",
-            "SeguroVidaObligatorio",
-        ]
-
-        for campo in campos_enteros:
-            df_legajos[campo] = df_legajos[campo].astype(int)
-
-        # Asegurar que los textos sean strings
-        campos_texto = [
-            "cuit",
-            "apyno",
-            "codigo_os",
-            "regimen",
-            "provincialocalidad",
-            "trabajadorconvencionado",
-        ]
-
-        for campo in campos_texto:
-            df_legajos[campo] = df_legajos[campo].astype(str).fillna("")
-
-        logger.info(f"✅ Campos SICOSS completados: {len(campos_requeridos)} campos")
+        # Asegurar que los códigos sean enteros. Los que se comparan en la
+        # validación (== 14, isin([5, 11])) y TipoDeOperacion (0/1/2) quedan en
+        # int8; el resto en int32 (las columnas destino en la base son INTEGER).
+        # Un solo astype para todos
+        df_legajos = df_legajos.astype(TIPOS_ENTEROS)
+
+        # Asegurar que los textos sean strings: las columnas que ya son de
+        # texto sólo rellenan nulos; el resto (cuit numérico, categóricos,
+        # object mixto) se convierte con astype(str)
+        for campo in CAMPOS_TEXTO:
+            serie = df_legajos[campo]
+            if not pd.api.types.is_string_dtype(serie) or isinstance(
+                serie.dtype, pd.CategoricalDtype
+            ):
+                serie = serie.astype(str)
+            df_legajos[campo] = serie.fillna("")
+
+        # Textos con pocos valores distintos ('S'/'N', régimen, obra social,
+        # provincia): categóricos (un código por legajo en lugar de un str).
+        # cuit y apyno son prácticamente únicos y quedan como str
+        df_legajos = df_legajos.astype(CAMPOS_CATEGORICOS)
+
+        logger.info(f"✅ Campos SICOSS completados: {len(CAMPOS_REQUERIDOS)} campos")
         return df_legajos
 
 
@@ -1744,6 +2033,8 @@ if __name__ == "__main__":
 
     # Ejecutar prueba
     print("🧪 Ejecutando prueba del SicossProcessor refactorizado...")
-    tester = SicossProcessorTester.SicossProcessorTester()
+    from SicossProcessorTester import SicossProcessorTester
+
+    tester = SicossProcessorTester()
     resultado = tester.ejecutar_todas_las_pruebas()
     print("✅ Prueba completada!")
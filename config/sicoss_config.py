@@ -1,7 +1,7 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Optional
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class SicossConfig:
     """Configuración para el procesamiento de SICOSS"""
     tope_jubilatorio_patronal: float
@@ -13,15 +13,13 @@ class SicossConfig:
     check_sin_activo: bool = False
     asignacion_familiar: bool = False
     trabajador_convencionado: str = "S"
-    
-    @property
-    def tope_sac_jubilatorio_pers(self) -> float:
-        return self.tope_jubilatorio_personal / 2
-    
-    @property 
-    def tope_sac_jubilatorio_patr(self) -> float:
-        return self.tope_jubilatorio_patronal / 2
-    
-    @property
-    def tope_sac_jubilatorio_otro_ap(self) -> float:
-        return self.tope_otros_aportes_personales / 2
+
+    # Topes de SAC (mitad del tope): se calculan una vez al crear la configuración
+    tope_sac_jubilatorio_pers: float = field(init=False, repr=False)
+    tope_sac_jubilatorio_patr: float = field(init=False, repr=False)
+    tope_sac_jubilatorio_otro_ap: float = field(init=False, repr=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, 'tope_sac_jubilatorio_pers', self.tope_jubilatorio_personal / 2)
+        object.__setattr__(self, 'tope_sac_jubilatorio_patr', self.tope_jubilatorio_patronal / 2)
+        object.__setattr__(self, 'tope_sac_jubilatorio_otro_ap', self.tope_otros_aportes_personales / 2)
@@ -0,0 +1,176 @@
+"""
+ejemplo_sicoss.py
+
+Ejemplo de uso de SicossBackEnd.procesar_sicoss_completo con datos simulados
+
+Uso:
+    python examples/ejemplo_sicoss.py
+"""
+
+import os
+import sys
+import logging
+
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from SicossBackEnd import procesar_sicoss_completo
+
+logger = logging.getLogger(__name__)
+
+COLUMNAS_IMPORTES = ['IMPORTE_BRUTO', 'IMPORTE_IMPON', 'ImporteSAC', 'importeimponible_9']
+COLUMNAS_RESULTADO = ['nro_legaj', 'apyno', 'codigosituacion'] + COLUMNAS_IMPORTES
+
+
+# 🧪 **EJEMPLO DE USO COMPLETO**
+
+def ejemplo_uso_completo():
+    """
+    🧪 EJEMPLO COMPLETO - Demuestra cómo usar toda la implementación
+    """
+    logger.info("🧪 === EJECUTANDO EJEMPLO COMPLETO ===")
+
+    # 📊 DATOS DE CONFIGURACIÓN
+    datos_config = {
+        'TopeJubilatorioPatronal': 800000.0,
+        'TopeJubilatorioPersonal': 600000.0,
+        'TopeOtrosAportesPersonal': 700000.0,
+        'truncaTope': 1,
+        'check_lic': False,
+        'check_retro': False,
+        'seguro_vida_patronal': 0,
+        'ARTconTope': '1',
+        'ConceptosNoRemuEnART': '0',
+        'PorcAporteAdicionalJubilacion': 100.0,
+        'TrabajadorConvencionado': 'S',
+        'AsignacionFamiliar': False
+    }
+
+    # 📊 DATOS DE LEGAJOS (simulados)
+    legajos_data = [
+        {
+            'nro_legaj': 12345,
+            'cuit': '20123456789',
+            'apyno': 'PEREZ JUAN CARLOS',
+            'codigosituacion': 1,
+            'codigocondicion': 1,
+            'codigozona': 0,
+            'TipoDeActividad': 0,
+            'codigocontratacion': 0,
+            'regimen': '1',
+            'conyugue': 1,
+            'hijos': 2,
+            'adherentes': 0,
+            'licencia': 0,
+            'provincialocalidad': 'BUENOS AIRES'
+        },
+        {
+            'nro_legaj': 67890,
+            'cuit': '27987654321',
+            'apyno': 'GARCIA MARIA ELENA',
+            'codigosituacion': 5,  # Maternidad
+            'codigocondicion': 1,
+            'codigozona': 0,
+            'TipoDeActividad': 0,
+            'codigocontratacion': 0,
+            'regimen': '1',
+            'conyugue': 0,
+            'hijos': 1,
+            'adherentes': 0,
+            'licencia': 0,
+            'provincialocalidad': 'CORDOBA'
+        },
+        {
+            'nro_legaj': 11111,
+            'cuit': '23111111119',
+            'apyno': 'RODRIGUEZ CARLOS ALBERTO',
+            'codigosituacion': 1,
+            'codigocondicion': 1,
+            'codigozona': 0,
+            'TipoDeActividad': 0,
+            'codigocontratacion': 0,
+            'regimen': '1',
+            'conyugue': 1,
+            'hijos': 0,
+            'adherentes': 0,
+            'licencia': 0,
+            'provincialocalidad': 'MENDOZA'
+        }
+    ]
+
+    # 📊 DATOS DE CONCEPTOS LIQUIDADOS (simulados)
+    conceptos_data = [
+        # Legajo 12345
+        {'nro_legaj': 12345, 'codn_conce': 100, 'impp_conce': 150000.0, 'tipos_grupos': [1], 'tipo_conce': 'C',
+         'nro_orimp': 1},
+        {'nro_legaj': 12345, 'codn_conce': 200, 'impp_conce': 25000.0, 'tipos_grupos': [2], 'tipo_conce': 'C',
+         'nro_orimp': 1},
+        {'nro_legaj': 12345, 'codn_conce': 300, 'impp_conce': 8000.0, 'tipos_grupos': [3], 'tipo_conce': 'F',
+         'nro_orimp': 0},
+
+        # Legajo 67890 (maternidad)
+        {'nro_legaj': 67890, 'codn_conce': 100, 'impp_conce': 120000.0, 'tipos_grupos': [1], 'tipo_conce': 'C',
+         'nro_orimp': 1},
+        {'nro_legaj': 67890, 'codn_conce': 500, 'impp_conce': 15000.0, 'tipos_grupos': [5], 'tipo_conce': 'C',
+         'nro_orimp': 1},
+
+        # Legajo 11111
+        {'nro_legaj': 11111, 'codn_conce': 100, 'impp_conce': 200000.0, 'tipos_grupos': [1], 'tipo_conce': 'C',
+         'nro_orimp': 1},
+        {'nro_legaj': 11111, 'codn_conce': 400, 'impp_conce': 30000.0, 'tipos_grupos': [4], 'tipo_conce': 'C',
+         'nro_orimp': 1},
+        {'nro_legaj': 11111, 'codn_conce': 600, 'impp_conce': 12000.0, 'tipos_grupos': [6], 'tipo_conce': 'C',
+         'nro_orimp': 1}
+    ]
+
+    # 📊 DATOS DE OTRA ACTIVIDAD (simulados)
+    otra_actividad_data = [
+        {'nro_legaj': 11111, 'importebrutootraactividad': 50000.0, 'importesacotraactividad': 8000.0}
+        # Solo el legajo 11111 tiene otra actividad
+    ]
+
+    try:
+        # 🚀 EJECUTAR PROCESAMIENTO COMPLETO
+        resultado = procesar_sicoss_completo(
+            datos_config=datos_config,
+            legajos_data=legajos_data,
+            conceptos_data=conceptos_data,
+            otra_actividad_data=otra_actividad_data,
+            per_anoct=2024,
+            per_mesct=12,
+            nombre_arch="ejemplo_sicoss_2024_12",
+            retornar_datos=True
+        )
+
+        # 📊 MOSTRAR RESULTADOS
+        if isinstance(resultado, list):
+            logger.info("🎉 === RESULTADOS DEL PROCESAMIENTO ===")
+            logger.info("📊 Legajos procesados: %s", len(resultado))
+
+            # Una sola tabla formateada por pandas en lugar de varias líneas por legajo
+            if resultado and logger.isEnabledFor(logging.INFO):
+                df_resultado = pd.DataFrame(resultado)
+                logger.info("\n%s", df_resultado[COLUMNAS_RESULTADO].to_string(
+                    index=False, formatters={campo: "${:,.2f}".format for campo in COLUMNAS_IMPORTES}
+                ))
+        else:
+            logger.info("📊 === TOTALES DEL PROCESAMIENTO ===")
+            if logger.isEnabledFor(logging.INFO):
+                for concepto, valor in resultado.items():
+                    logger.info(f"   {concepto}: ${valor:,.2f}")
+
+        logger.info("✅ === EJEMPLO COMPLETADO EXITOSAMENTE ===")
+        return resultado
+
+    except Exception as e:
+        logger.error("❌ Error en ejemplo: %s", e)
+        raise
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+    ejemplo_uso_completo()
@@ -1,7 +1,7 @@
 from .base_extractor import BaseExtractor
 import pandas as pd
 import logging
-from typing import List
+from typing import Any, Dict, List, Optional
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
@@ -17,15 +17,16 @@ class ConceptosExtractor(BaseExtractor):
         self.queries = SicossSQLQueries()
     
     def extract(self, per_anoct: int, per_mesct: int, 
-                where_legajo: str = "true", **kwargs) -> pd.DataFrame:
-        """Extrae conceptos liquidados"""
+                where_legajo: str = "true", params: Optional[Dict[str, Any]] = None,
+                **kwargs) -> pd.DataFrame:
+        """Extrae conceptos liquidados (params: parámetros ligados de where_legajo)"""
         self._validate_params(['per_anoct', 'per_mesct'], 
                             per_anoct=per_anoct, per_mesct=per_mesct)
         
         logger.info(f"Extrayendo conceptos para período {per_anoct}/{per_mesct}")
         
         query = self.queries.get_conceptos_liquidados_query(per_anoct, per_mesct, where_legajo)
-        return self.db.execute_query(query)
+        return self.db.execute_query(query, params=params)
     
     def extract_for_legajos(self, per_anoct: int, per_mesct: int, 
                            legajos: List[int]) -> pd.DataFrame:
@@ -33,6 +34,5 @@ class ConceptosExtractor(BaseExtractor):
         if not legajos:
             return pd.DataFrame()
         
-        legajos_str = ','.join(map(str, legajos))
-        where_clause = f"dh21.nro_legaj IN ({legajos_str})"
-        return self.extract(per_anoct, per_mesct, where_clause) 
\ No newline at end of file
+        where_clause = "dh21.nro_legaj = ANY(CAST(:legajos AS integer[]))"
+        return self.extract(per_anoct, per_mesct, where_clause, params={'legajos': legajos})
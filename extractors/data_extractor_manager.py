@@ -62,16 +62,16 @@ class DataExtractorManager:
         if not legajos:
             return pd.DataFrame(columns=['nro_legaj', 'ImporteBrutoOtraActividad', 'ImporteSACOtraActividad']) #type: ignore
         
-        query = self.queries.get_otra_actividad_query(legajos)
-        return self.db.execute_query(query)
+        query = self.queries.get_otra_actividad_query()
+        return self.db.execute_query(query, params={'legajos': legajos})
     
     def _extraer_codigos_obra_social(self, legajos: List[int]) -> pd.DataFrame:
-        """Extrae códigos de obra social"""
-        if not legajos:
-            return pd.DataFrame(columns=['nro_legaj', 'codigo_os']) #type: ignore
+        """
+        Códigos de obra social: hoy siempre '000000', sin consulta a la BD
         
-        query = self.queries.get_codigos_obra_social_query(legajos)
-        return self.db.execute_query(query)
+        Se devuelve vacío y los procesadores completan codigo_os con el valor por defecto.
+        """
+        return pd.DataFrame(columns=['nro_legaj', 'codigo_os']) #type: ignore
     
     def _crear_dataframes_vacios(self) -> Dict[str, pd.DataFrame]:
         """Crea DataFrames vacíos con las columnas correctas"""
@@ -33,7 +33,7 @@ class SicossSQLQueries:
         
         return f"""
         SELECT
-            DISTINCT(dh01.nro_legaj),
+            dh01.nro_legaj,
             (dh01.nro_cuil1::char(2)||LPAD(dh01.nro_cuil::char(8),8,'0')||dh01.nro_cuil2::char(1))::float8 AS cuit,
             dh01.desc_appat||' '||dh01.desc_nombr AS apyno,
             dh01.tipo_estad AS estado,
@@ -72,8 +72,28 @@ class SicossSQLQueries:
         ) familiares ON familiares.nro_legaj = mapuche.dh01.nro_legaj
 
         LEFT OUTER JOIN mapuche.dha8 ON dha8.nro_legajo = mapuche.dh01.nro_legaj
-        LEFT OUTER JOIN mapuche.dh09 ON dh09.nro_legaj = mapuche.dh01.nro_legaj
-        LEFT OUTER JOIN mapuche.dhe9 ON dhe9.nro_legaj = mapuche.dh01.nro_legaj
+
+        -- Una sola fila de dh09 por legajo: el JOIN no multiplica filas y no hace
+        -- falta un DISTINCT sobre el resultado completo. dhe9 (otra actividad) no
+        -- aporta columnas aquí: se consulta aparte en get_otra_actividad_query.
+        -- LATERAL busca sólo las filas de cada legajo seleccionado (sin ordenar
+        -- toda dh09). Si un legajo tiene varias, gana la que lo informa en reparto
+        -- (regimen 1), después la de más cargos (adherentes); codc_bprev desempata
+        -- el resto, así que la fila elegida no cambia entre ejecuciones
+        LEFT JOIN LATERAL (
+            SELECT
+                codc_bprev,
+                fuerza_reparto,
+                cant_cargo
+            FROM mapuche.dh09
+            WHERE dh09.nro_legaj = mapuche.dh01.nro_legaj
+            ORDER BY
+                ((codc_bprev = {codc_reparto}) OR fuerza_reparto OR (({codc_reparto} = '') AND (codc_bprev IS NULL))) DESC NULLS LAST,
+                cant_cargo DESC NULLS LAST,
+                codc_bprev NULLS LAST,
+                fuerza_reparto NULLS LAST
+            LIMIT 1
+        ) dh09 ON true
         
         WHERE {where_legajo}
         ORDER BY dh01.nro_legaj
@@ -130,59 +150,26 @@ class SicossSQLQueries:
         """
     
     @staticmethod
-    def get_otra_actividad_query(legajos: List[int]) -> str:
+    def get_otra_actividad_query() -> str:
         """
         Consulta para otra actividad (basada en otra_actividad())
+        Una fila por legajo: la declaración más reciente (vig_ano, vig_mes)
         
-        Args:
-            legajos: Lista de números de legajo
-            
         Returns:
-            str: Query SQL para otra actividad
-        """
-        if not legajos:
-            return "SELECT NULL::integer AS nro_legaj, NULL::numeric AS ImporteBrutoOtraActividad, NULL::numeric AS ImporteSACOtraActividad WHERE FALSE"
-        
-        legajos_str = ','.join(map(str, legajos))
-        logger.debug(f"Generando query otra actividad para {len(legajos)} legajos")
-        
-        return f"""
-        SELECT
-			nro_legaj,
-			importe AS ImporteBrutoOtraActividad,
-			importe_sac AS ImporteSACOtraActividad
-		FROM
-			mapuche.dhe9
-		WHERE
-			nro_legaj IN ({legajos_str})
-		ORDER BY
-			vig_ano, vig_mes DESC
-		LIMIT 1
+            str: Query SQL para otra actividad (legajos en el parámetro :legajos;
+            el llamador no la ejecuta con una lista vacía)
         """
-    
-    @staticmethod
-    def get_codigos_obra_social_query(legajos: List[int]) -> str:
-        """
-        Consulta para códigos de obra social (basada en codigo_os())
-        Siempre retorna '000000' para todos los legajos
-        
-        Args:
-            legajos: Lista de números de legajo
-            
-        Returns:
-            str: Query SQL para códigos de obra social
-        """
-        if not legajos:
-            return "SELECT NULL::integer AS nro_legaj, NULL::text AS codigo_os WHERE FALSE"
-        
-        legajos_str = ','.join(map(str, legajos))
-        logger.debug(f"Generando query obra social para {len(legajos)} legajos")
-        
-        return f"""
-        SELECT 
+        return """
+        SELECT DISTINCT ON (nro_legaj)
             nro_legaj,
-            '000000' AS codigo_os
-        FROM UNNEST(ARRAY[{legajos_str}]) AS nro_legaj
+            importe AS ImporteBrutoOtraActividad,
+            importe_sac AS ImporteSACOtraActividad
+        FROM
+            mapuche.dhe9
+        WHERE
+            nro_legaj = ANY(CAST(:legajos AS integer[]))
+        ORDER BY
+            nro_legaj, vig_ano DESC, vig_mes DESC
         """
     
     @staticmethod
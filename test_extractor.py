@@ -5,10 +5,50 @@ Script de prueba para validar el SicossDataExtractor
 """
 
 from SicossDataExtractor import *
+from SicossDataExtractor import _leer_csv_copy, _parsear_array_pg
 import configparser
+import io
 from mapuche_config import create_mapuche_config
 import time
 
+def test_parsear_array_pg():
+    """Arrays enteros de Postgres en texto ('{1,2}') a listas"""
+    assert _parsear_array_pg('{1,2,45}') == [1, 2, 45]
+    assert _parsear_array_pg('{7}') == [7]
+    assert _parsear_array_pg('{}') == []
+    assert _parsear_array_pg(float('nan')) == []
+    assert _parsear_array_pg(None) == []
+
+def test_leer_csv_copy_tipos_y_nulos():
+    """El CSV de COPY conserva '' frente a NULL y respeta los tipos de TIPOS_LEGAJOS"""
+    csv = (
+        'nro_legaj,cuit,apyno,estado,provincialocalidad,trabajadorconvencionado,regimen,'
+        'conyugue,hijos,licencia,aporteadicional\n'
+        '10,20123456789,NA,A,NULL,,1,0,2,0,1.5\n'
+        f'11,{NULO_COPY},None,A,{NULO_COPY},{NULO_COPY},0,1,0,0,{NULO_COPY}\n'
+    ).encode('latin1')
+    df = _leer_csv_copy(io.BytesIO(csv), dtype=TIPOS_LEGAJOS)
+
+    assert df['nro_legaj'].dtype == 'int32'
+    assert df['cuit'].dtype == 'float64'
+    assert df['conyugue'].dtype == 'int8'
+    assert df['aporteadicional'].dtype == 'float64'
+    # regimen '1'/'0' sigue siendo texto
+    assert df['regimen'].tolist() == ['1', '0']
+    # Texto vacío y textos como 'NA'/'None'/'NULL' no son nulos; NULL sí
+    assert df['trabajadorconvencionado'].iloc[0] == ''
+    assert pd.isna(df['trabajadorconvencionado'].iloc[1])
+    assert df['apyno'].tolist() == ['NA', 'None']
+    assert df['provincialocalidad'].iloc[0] == 'NULL'
+    assert pd.isna(df['provincialocalidad'].iloc[1])
+    assert pd.isna(df['cuit'].iloc[1]) and pd.isna(df['aporteadicional'].iloc[1])
+
+def test_leer_csv_copy_columnas_array():
+    """tipos_grupos llega como texto y se convierte a list[int]"""
+    csv = b'codn_conce,tipos_grupos\n100,"{1,2}"\n200,{}\n'
+    df = _leer_csv_copy(io.BytesIO(csv), dtype={'tipos_grupos': str}, columnas_array=('tipos_grupos',))
+    assert df['tipos_grupos'].tolist() == [[1, 2], []]
+
 def test_extractor_legajo_unico():
     """Prueba el extractor con un legajo específico"""
     print("=== TEST: EXTRACTOR CON LEGAJO ÚNICO ===")
@@ -233,15 +273,9 @@ def test_consultas_sql():
             
             # Test otra actividad
             print("🏢 Probando consulta otra actividad...")
-            query_otra = SicossSQLQueries.get_otra_actividad_query([legajo_test])
-            df_otra = db.execute_query(query_otra)
+            query_otra = SicossSQLQueries.get_otra_actividad_query()
+            df_otra = db.execute_query(query_otra, params={'legajos': [int(legajo_test)]})
             print(f"   Resultado: {len(df_otra)} registros de otra actividad")
-            
-            # Test obra social
-            print("🏥 Probando consulta obra social...")
-            query_os = SicossSQLQueries.get_codigos_obra_social_query([legajo_test])
-            df_os = db.execute_query(query_os)
-            print(f"   Resultado: {len(df_os)} códigos de obra social")
         
         return True
         
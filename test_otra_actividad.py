@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+test_otra_actividad.py
+
+Pruebas de SicossProcessor._procesar_otra_actividad_pandas con DataFrames de
+otra actividad armados por el llamador
+"""
+
+import os
+import sys
+
+import pandas as pd
+
+sys.path.append(os.path.dirname(__file__))
+
+from SicossProcessor import SicossProcessor
+
+CONFIG = {
+    "tope_sac_jubilatorio_pers": 1_000_000.0,
+    "tope_jubilatorio_patronal": 2_000_000.0,
+}
+
+
+def _legajos() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "nro_legaj": [1, 2, 3],
+            "IMPORTE_IMPON": [100.0, 200.0, 300.0],
+            "ImporteImponibleSinSAC": [100.0, 200.0, 300.0],
+            "ImporteSACPatronal": [0.0, 0.0, 0.0],
+        }
+    ).set_index("nro_legaj", drop=False)
+
+
+def test_otra_actividad_legajo_repetido_conserva_la_primera_fila():
+    """Un legajo repetido no rompe el reindex: queda la primera fila"""
+    df_otra_actividad = pd.DataFrame(
+        {
+            "nro_legaj": [2, 2, 3],
+            "importebrutootraactividad": [10.0, 99.0, 30.0],
+            "importesacotraactividad": [1.0, 9.0, 3.0],
+        }
+    )
+
+    resultado = SicossProcessor()._procesar_otra_actividad_pandas(
+        _legajos(), df_otra_actividad, CONFIG
+    )
+
+    assert len(resultado) == 3
+    assert resultado["ImporteBrutoOtraActividad"].tolist() == [0.0, 10.0, 30.0]
+    assert resultado["ImporteSACOtraActividad"].tolist() == [0.0, 1.0, 3.0]
+
+
+def test_otra_actividad_legajo_repetido_conserva_la_vigencia_mas_reciente():
+    """Con vig_ano/vig_mes queda la declaración más reciente, como en SQL"""
+    df_otra_actividad = pd.DataFrame(
+        {
+            "nro_legaj": [2, 2, 2],
+            "vig_ano": [2024, 2025, 2025],
+            "vig_mes": [12, 3, 1],
+            "importebrutootraactividad": [10.0, 20.0, 15.0],
+            "importesacotraactividad": [1.0, 2.0, 1.5],
+        }
+    )
+
+    resultado = SicossProcessor()._procesar_otra_actividad_pandas(
+        _legajos(), df_otra_actividad, CONFIG
+    )
+
+    assert resultado["ImporteBrutoOtraActividad"].tolist() == [0.0, 20.0, 0.0]
+    assert resultado["ImporteSACOtraActividad"].tolist() == [0.0, 2.0, 0.0]
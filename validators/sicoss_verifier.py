@@ -161,6 +161,10 @@ class SicossVerifier:
         df_py = self._normalizar_tipos(df_py)
         df_php = self._normalizar_tipos(df_php)
         
+        # _comparar_campo busca por búsqueda binaria: PHP debe quedar ordenado
+        # también después de normalizar nro_legaj a int
+        df_php = df_php.sort_values('nro_legaj', kind='stable')
+        
         return df_py, df_php
     
     def _normalizar_tipos(self, df: pd.DataFrame) -> pd.DataFrame:
@@ -219,16 +223,22 @@ class SicossVerifier:
         """Compara un campo específico entre ambos DataFrames"""
         resultados = []
         
-        for idx, row_py in df_python.iterrows():
-            nro_legaj = int(row_py['nro_legaj'])
-            row_php = df_php[df_php['nro_legaj'] == nro_legaj]
+        # df_php viene ordenado por nro_legaj: búsqueda binaria en lugar de un filtro por legajo
+        legajos_php = df_php['nro_legaj'].to_numpy()
+        valores_php = df_php[campo].to_numpy() if campo in df_php.columns else None
+        
+        # Sólo se leen dos columnas: iterarlas como listas en lugar de armar una Series por fila
+        valores_py = df_python[campo].tolist() if campo in df_python.columns else [None] * len(df_python)
+        
+        for legajo_py, valor_python in zip(df_python['nro_legaj'].tolist(), valores_py):
+            nro_legaj = int(legajo_py)
+            posicion = legajos_php.searchsorted(nro_legaj)
             
-            if row_php.empty:
+            if posicion == len(legajos_php) or legajos_php[posicion] != nro_legaj:
                 logger.warning(f"Legajo {nro_legaj} no encontrado en PHP")
                 continue
                 
-            valor_python = row_py[campo] if campo in row_py else None
-            valor_php = row_php[campo].values[0] if campo in row_php.columns else None # type: ignore
+            valor_php = valores_php[posicion] if valores_php is not None else None
             
             resultado = self._comparar_valores(campo, nro_legaj, valor_python, valor_php)
             resultados.append(resultado)